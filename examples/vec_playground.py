@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+
+from spg.agent import HeadAgent
+from spg.element import Ball
+from spg.playground import Room, VecPlayground
+
+
+def make_playground(seed):
+
+    playground = Room(size=(500, 200), seed=seed)
+
+    playground.add(Ball(), ((200, 0), 0))
+    playground.add(Ball(color=(23, 184, 13)), ((-200, 40), 0))
+
+    playground.add(HeadAgent())
+
+    return playground
+
+
+if __name__ == "__main__":
+
+    N_PLAYGROUNDS = 8
+    N_STEPS = 1000
+
+    rng = np.random.default_rng()
+
+    with VecPlayground(make_playground, N_PLAYGROUNDS, seed=0) as vec:
+
+        observations = vec.reset()
+        shape_commands = (vec.n_playgrounds, vec.n_agents, vec.n_controls)
+
+        t = time.time()
+        for _ in range(N_STEPS):
+            commands = rng.uniform(0, 1, size=shape_commands)
+            observations, rewards, dones = vec.step(commands)
+
+        print(f"{N_PLAYGROUNDS * N_STEPS / (time.time() - t)} steps per second")
+        print({name: obs.shape for name, obs in observations.items()})
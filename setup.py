@@ -22,6 +22,7 @@ setup(
     package_dir={"": "src"},
     include_package_data=True,
     install_requires=requirements,
+    python_requires=">=3.8",
     long_description=long_description,
     long_description_content_type="text/markdown",
 )
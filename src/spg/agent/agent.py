@@ -15,6 +15,7 @@ from typing import Dict, List
 
 from ..entity import EmbodiedEntity, Entity
 from ..utils.position import Coordinate
+from ..utils.sequence import ReadOnlyList
 from .communicator import Communicator
 from .controller import Command, Controller
 from .part import PhysicalPart
@@ -56,6 +57,16 @@ class Agent(Entity):
         # Body parts
         self._parts: List[PhysicalPart] = []
 
+        # Devices of all parts, indexed by type
+        self._sensors: ReadOnlyList[Sensor] = ReadOnlyList()
+        self._external_sensors: ReadOnlyList[ExternalSensor] = ReadOnlyList()
+        self._controllers: ReadOnlyList[Controller] = ReadOnlyList()
+        self._communicators: ReadOnlyList[Communicator] = ReadOnlyList()
+
+        # Controllers by name, built on first command.
+        # Names are only known once the agent is in a playground.
+        self._name_to_controller: Dict[str, Controller] = {}
+
         # Reward
         self._reward: float = 0
 
@@ -70,6 +81,28 @@ class Agent(Entity):
             device.teams = self._teams
 
         self._parts.append(part)
+        self.update_devices()
+
+    def update_devices(self):
+        """Index the devices of all parts. Called when a device is attached."""
+
+        devices = [device for part in self._parts for device in part.devices]
+
+        self._sensors = ReadOnlyList(dev for dev in devices if isinstance(dev, Sensor))
+        self._external_sensors = ReadOnlyList(
+            sensor for sensor in self._sensors if isinstance(sensor, ExternalSensor)
+        )
+        self._controllers = ReadOnlyList(
+            dev for dev in devices if isinstance(dev, Controller)
+        )
+        self._communicators = ReadOnlyList(
+            dev for dev in devices if isinstance(dev, Communicator)
+        )
+
+        self._name_to_controller = {}
+
+        if self._playground:
+            self._playground.notify_devices_changed()
 
     ################
     # Properties
@@ -111,52 +144,30 @@ class Agent(Entity):
 
     @property
     def observations(self):
-        return {
-            sens: sens.sensor_values
-            for part in self._parts
-            for sens in part.devices
-            if isinstance(sens, Sensor)
-        }
+        return {sens: sens.sensor_values for sens in self._sensors}
 
     @property
     def controllers(self):
-        return [
-            contr
-            for part in self._parts
-            for contr in part.devices
-            if isinstance(contr, Controller)
-        ]
-
-    @property
-    def _name_to_controller(self):
-        return {contr.name: contr for contr in self.controllers}
+        return self._controllers
 
     @property
     def communicators(self):
-        return [
-            comm
-            for part in self._parts
-            for comm in part.devices
-            if isinstance(comm, Communicator)
-        ]
+        return self._communicators
 
     @property
     def sensors(self):
-        return [
-            sensor
-            for part in self._parts
-            for sensor in part.devices
-            if isinstance(sensor, Sensor)
-        ]
+        return self._sensors
 
     @property
     def external_sensors(self):
-        return [sensor for sensor in self.sensors if isinstance(sensor, ExternalSensor)]
+        return self._external_sensors
 
     def compute_observations(self):
-        for sensor in self.sensors:
+        for sensor in self._sensors:
             sensor.update()
 
+        return {sensor: sensor.observation for sensor in self._sensors}
+
     ################
     # Commands
     ################
@@ -167,22 +178,31 @@ class Agent(Entity):
 
     @property
     def default_commands(self) -> Commands:
-        return {controller: controller.default for controller in self.controllers}
+        return {controller: controller.default for controller in self._controllers}
 
     def receive_commands(self, commands: Commands):
 
         for controller, command in commands.items():
-            controller = self._name_to_controller[controller]
+            controller = self._get_controller(controller)
             assert controller.agent is self
             controller.command = command
 
+    def _get_controller(self, name: str) -> Controller:
+
+        if name not in self._name_to_controller:
+            self._name_to_controller = {
+                contr.name: contr for contr in self._controllers
+            }
+
+        return self._name_to_controller[name]
+
     def apply_commands(self):
         # Apply command to playground physics
         for part in self._parts:
             part.apply_commands()
 
     def get_random_commands(self):
-        return {contr.name: contr.get_random_commands() for contr in self.controllers}
+        return {contr.name: contr.get_random_commands() for contr in self._controllers}
 
     ################
     # Rewards
@@ -1,3 +1,15 @@
-from .communicator import Communicator, LimitedCommunicator, Message
+from .communicator import (
+    Communicator,
+    LimitedCommunicator,
+    Message,
+    deliver_messages,
+)
+from .index import CommunicationIndex
 
-__all__ = ["Communicator", "Message", "LimitedCommunicator"]
+__all__ = [
+    "Communicator",
+    "Message",
+    "LimitedCommunicator",
+    "CommunicationIndex",
+    "deliver_messages",
+]
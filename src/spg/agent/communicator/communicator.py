@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..device import PocketDevice
 
@@ -50,15 +52,7 @@ class Communicator(PocketDevice):
 
         assert self._playground
 
-        comms = []
-        for agent in self._playground.agents:
-            comms += agent.communicators
-
-        valid_comms = [com for com in comms if com is not self]
-
-        for comm in valid_comms:
-            if self.in_transmission_range(comm):
-                self._comms_in_range.append(comm)
+        self._comms_in_range = self._playground.communication_index.in_range(self)
 
     @property
     def comms_in_range(self):
@@ -111,6 +105,15 @@ class Communicator(PocketDevice):
 
         return None
 
+    def _receive_batch(
+        self,
+        senders: List[Communicator],
+        msgs: List[Message],
+        distances: np.ndarray,
+    ):
+        """Receive messages from senders in range, in the order they were sent."""
+        self._received_messages.extend(zip(senders, msgs))
+
 
 class LimitedCommunicator(Communicator):
     def __init__(self, capacity: Optional[int] = None, **kwargs):
@@ -133,3 +136,106 @@ class LimitedCommunicator(Communicator):
             self._received_messages = self._received_messages[: self._capacity]
 
         return msg
+
+    def _receive_batch(self, senders, msgs, distances):
+
+        if not self._capacity:
+            super()._receive_batch(senders, msgs, distances)
+            return
+
+        received = self._received_messages + list(zip(senders, msgs))
+        distances = np.concatenate(
+            [
+                [
+                    self.position.get_distance(sender.anchor.position)
+                    for sender, _ in self._received_messages
+                ],
+                distances,
+            ]
+        )
+
+        # Keep the closest senders. For equal distances, first received are kept
+        selected = np.arange(len(received))
+
+        if len(received) > self._capacity:
+            kth = self._capacity - 1
+            max_dist = distances[np.argpartition(distances, kth)[kth]]
+
+            closer = np.flatnonzero(distances < max_dist)
+            ties = np.flatnonzero(distances == max_dist)[: self._capacity - len(closer)]
+            selected = np.sort(np.concatenate([closer, ties]))
+
+        selected = selected[np.argsort(distances[selected], kind="stable")]
+        self._received_messages = [received[index] for index in selected]
+
+
+_BATCH_RECEIVERS = (Communicator.receive, LimitedCommunicator.receive)
+
+
+def deliver_messages(
+    senders: Sequence[Communicator],
+    msgs: Sequence[Message],
+    receivers: Sequence[Communicator],
+) -> List[Optional[Message]]:
+    """Deliver each message to its receiver, in one batch.
+
+    Receivers end up in the same state as if each message was received
+    one after the other with Communicator.receive.
+    Distances between senders and receivers, range and disabled masks
+    are computed on all messages at once.
+    Communicators that override receive still receive messages one by one.
+
+    Returns:
+        For each message, the message received, or None if not received.
+    """
+
+    n_msgs = len(receivers)
+    received: List[Optional[Message]] = [None] * n_msgs
+
+    if not n_msgs:
+        return received
+
+    comms = list(dict.fromkeys([*senders, *receivers]))
+    index = {comm: ind for ind, comm in enumerate(comms)}
+
+    positions = np.array([tuple(comm.position) for comm in comms], dtype=np.float64)
+    ranges = np.array(
+        [comm.transmission_range or np.inf for comm in comms], dtype=np.float64
+    )
+    disabled = np.array(
+        [comm._disabled for comm in comms]  # pylint: disable=protected-access
+    )
+
+    ind_senders = np.array([index[comm] for comm in senders])
+    ind_receivers = np.array([index[comm] for comm in receivers])
+
+    # Same operations as pymunk Vec2d.get_distance, for identical results
+    delta = positions[ind_senders] - positions[ind_receivers]
+    distances = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+
+    valid = (
+        ~disabled[ind_receivers]
+        & (ind_senders != ind_receivers)
+        & (distances < np.minimum(ranges[ind_senders], ranges[ind_receivers]))
+    )
+
+    # Messages in range, grouped by receiver in order of sending
+    batches: Dict[Communicator, List[int]] = {}
+
+    for ind_msg, (receiver, is_valid) in enumerate(zip(receivers, valid.tolist())):
+
+        if type(receiver).receive not in _BATCH_RECEIVERS:
+            received[ind_msg] = receiver.receive(senders[ind_msg], msgs[ind_msg])
+
+        elif is_valid:
+            batches.setdefault(receiver, []).append(ind_msg)
+            received[ind_msg] = msgs[ind_msg]
+
+    for receiver, indices in batches.items():
+        receiver._receive_batch(  # pylint: disable=protected-access
+            [senders[ind] for ind in indices],
+            [msgs[ind] for ind in indices],
+            distances[indices],
+        )
+
+    return received
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ...playground import Playground
+    from .communicator import Communicator
+
+
+class CommunicationIndex:
+    """Communicators in transmission range of each other.
+
+    The index is built lazily, at most once per step, from the positions
+    of the communicators of all agents in the playground.
+    Communicators are hashed on a uniform grid whose cells are as large
+    as the largest finite transmission range, so that range queries of
+    all communicators are answered together by comparing neighboring cells.
+    Communicators with infinite range are in range of each other.
+
+    Communicators in range are listed in the order of agents and devices,
+    as if all communicators were tested one by one.
+    """
+
+    def __init__(self, playground: Playground):
+
+        self._playground = playground
+
+        self._communicators: Tuple[Communicator, ...] = ()
+        self._in_range: Dict[Communicator, List[Communicator]] = {}
+        self._outdated = True
+
+    def outdate(self):
+        """Communicators moved, or were added or removed."""
+        self._outdated = True
+
+    @property
+    def communicators(self):
+        self._update()
+        return self._communicators
+
+    def in_range(self, comm: Communicator) -> List[Communicator]:
+        """Communicators in transmission range of comm."""
+
+        self._update()
+
+        if comm not in self._in_range:
+            # Communicators that are not in the playground are not indexed
+            return [
+                other
+                for other in self._communicators
+                if other is not comm and comm.in_transmission_range(other)
+            ]
+
+        return list(self._in_range[comm])
+
+    def _update(self):
+
+        if not self._outdated:
+            return
+
+        self._communicators = tuple(
+            comm for agent in self._playground.agents for comm in agent.communicators
+        )
+
+        n_comms = len(self._communicators)
+
+        positions = np.array(
+            [tuple(comm.position) for comm in self._communicators], dtype=np.float64
+        ).reshape(n_comms, 2)
+
+        ranges = np.array(
+            [comm.transmission_range or np.inf for comm in self._communicators],
+            dtype=np.float64,
+        )
+
+        senders, receivers = self._pairs_in_range(positions, ranges)
+
+        # Group receivers by sender, in order of communicators
+        order = np.lexsort((receivers, senders))
+        senders, receivers = senders[order], receivers[order]
+        bounds = np.searchsorted(senders, np.arange(n_comms + 1))
+
+        self._in_range = {
+            comm: [self._communicators[j] for j in receivers[start:end]]
+            for comm, start, end in zip(self._communicators, bounds[:-1], bounds[1:])
+        }
+
+        self._outdated = False
+
+    @staticmethod
+    def _pairs_in_range(
+        positions: np.ndarray, ranges: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+
+        finite = np.isfinite(ranges)
+        pairs: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+        n_comms = len(ranges)
+
+        # Infinite ranges only: all pairs
+        infinite = np.flatnonzero(~finite)
+        if len(infinite) > 1:
+            grid_i, grid_j = np.meshgrid(infinite, infinite, indexing="ij")
+            pairs.append((grid_i * n_comms + grid_j)[grid_i != grid_j])
+
+        # At least one finite range: pairs are within the smallest range,
+        # so within neighboring cells of the grid
+        if finite.any():
+
+            cell_size = ranges[finite].max()
+            cells = np.floor(positions / cell_size).astype(np.int64)
+
+            grid: Dict[Tuple[int, int], List[int]] = {}
+            for index, cell in enumerate(map(tuple, cells.tolist())):
+                grid.setdefault(cell, []).append(index)
+
+            for (cell_x, cell_y), indices in grid.items():
+
+                members = np.array(indices)
+                members = members[finite[members]]
+
+                if not len(members):
+                    continue
+
+                candidates = np.array(
+                    [
+                        index
+                        for d_x in (-1, 0, 1)
+                        for d_y in (-1, 0, 1)
+                        for index in grid.get((cell_x + d_x, cell_y + d_y), ())
+                    ]
+                )
+
+                dist = np.linalg.norm(
+                    positions[members, None] - positions[None, candidates], axis=-1
+                )
+                max_dist = np.minimum(ranges[members, None], ranges[None, candidates])
+
+                valid = (dist < max_dist) & (members[:, None] != candidates[None, :])
+                i, j = np.nonzero(valid)
+
+                # Pairs are symmetric
+                pairs.append(members[i] * n_comms + candidates[j])
+                pairs.append(candidates[j] * n_comms + members[i])
+
+        keys = np.unique(np.concatenate(pairs))
+
+        return keys // max(n_comms, 1), keys % max(n_comms, 1)
@@ -8,11 +8,13 @@ from .controller import (
     GrasperController,
     RangeController,
 )
+from .space import CommandSpace
 
 __all__ = [
     "BoolController",
     "CenteredContinuousController",
     "Command",
+    "CommandSpace",
     "ContinuousController",
     "Controller",
     "DiscreteController",
@@ -61,6 +61,27 @@ class Controller(PocketDevice):
 
         self._command = command
 
+    def set_valid_command(self, command):
+        """Set a command that is already checked, for example by a CommandSpace."""
+
+        if self._currently_disabled:
+            command = self.default
+
+        self._command = command
+
+    @property
+    def hard_check(self):
+        return self._hard_check
+
+    @property
+    def currently_disabled(self):
+        """Whether the controller was disabled at the previous step."""
+        return self._currently_disabled
+
+    @currently_disabled.setter
+    def currently_disabled(self, disabled: bool):
+        self._currently_disabled = disabled
+
     def pre_step(self):
         super().pre_step()
         self._command = self.default
@@ -0,0 +1,145 @@
+"""
+Command space of agents, for batched control with a single array.
+
+Commands of all agents are an array of shape (n_agents, n_controls),
+where controls follow the order of agent.controllers.
+Agents with fewer controllers have padded controls, which are ignored.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+import numpy as np
+
+from .controller import ContinuousController, DiscreteController
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+
+class CommandSpace:
+    """Bounds and valid values of the controllers of agents.
+
+    The space only holds numpy arrays and names, so that it can be sent
+    to other processes.
+
+    Attributes:
+        names: names of the controllers, per agent.
+        low, high: bounds of each control.
+            For discrete controllers, lowest and highest valid values.
+        continuous: mask of continuous controls.
+        discrete: mask of discrete controls.
+        valid_values: valid values of discrete controls, padded with nan.
+        default: default command of each control.
+        hard_check: mask of controls raising errors on invalid commands.
+    """
+
+    def __init__(self, agents: Sequence[Agent]):
+
+        controllers = [list(agent.controllers) for agent in agents]
+
+        n_agents = len(controllers)
+        n_controls = max((len(contrs) for contrs in controllers), default=0)
+        n_values = max(
+            (
+                len(contr.valid_commands)
+                for contrs in controllers
+                for contr in contrs
+                if isinstance(contr, DiscreteController)
+            ),
+            default=0,
+        )
+
+        shape = (n_agents, n_controls)
+
+        self.names: List[List[str]] = [
+            [contr.name for contr in contrs] for contrs in controllers
+        ]
+        self.low = np.zeros(shape)
+        self.high = np.zeros(shape)
+        self.continuous = np.zeros(shape, dtype=bool)
+        self.discrete = np.zeros(shape, dtype=bool)
+        self.valid_values = np.full(shape + (n_values,), np.nan)
+        self.default = np.zeros(shape)
+        self.hard_check = np.zeros(shape, dtype=bool)
+
+        for ind_agent, contrs in enumerate(controllers):
+            for ind_contr, contr in enumerate(contrs):
+
+                index = ind_agent, ind_contr
+                self.default[index] = contr.default
+                self.hard_check[index] = contr.hard_check
+
+                if isinstance(contr, ContinuousController):
+                    self.continuous[index] = True
+                    self.low[index], self.high[index] = contr.min, contr.max
+
+                elif isinstance(contr, DiscreteController):
+                    values = contr.valid_commands
+                    self.discrete[index] = True
+                    self.low[index], self.high[index] = min(values), max(values)
+                    self.valid_values[index][: len(values)] = values
+
+                else:
+                    raise ValueError(f"Controller {contr} can not be in a space")
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.default.shape  # type: ignore
+
+    def __eq__(self, other):
+
+        if not isinstance(other, CommandSpace):
+            return NotImplemented
+
+        return (
+            self.shape == other.shape
+            and np.array_equal(self.low, other.low)
+            and np.array_equal(self.high, other.high)
+            and np.array_equal(self.continuous, other.continuous)
+            and np.array_equal(self.discrete, other.discrete)
+            and np.array_equal(self.valid_values, other.valid_values, equal_nan=True)
+        )
+
+    def validate(self, commands: np.ndarray) -> np.ndarray:
+        """Valid commands, with the behavior of Controller.command.
+
+        Continuous commands are clipped within bounds.
+        Discrete commands are rounded, and must be valid values.
+        Invalid commands raise a ValueError if the controller has a hard check,
+        and are replaced by the default command otherwise.
+        """
+
+        commands = np.asarray(commands, dtype=np.float64)
+
+        if commands.shape != self.shape:
+            raise ValueError(f"Commands of shape {commands.shape}, not {self.shape}")
+
+        commands = np.where(
+            self.continuous,
+            np.clip(commands, self.low, self.high),
+            np.round(commands),
+        )
+
+        is_valid = self.continuous & ~np.isnan(commands)
+        is_valid |= (commands[..., None] == self.valid_values).any(axis=-1)
+        is_valid |= ~(self.continuous | self.discrete)
+
+        if (~is_valid & self.hard_check).any():
+            raise ValueError(commands[~is_valid & self.hard_check])
+
+        return np.where(is_valid, commands, self.default)
+
+    def apply(self, agents: Sequence[Agent], commands: np.ndarray):
+        """Set commands of the controllers of agents."""
+
+        commands = self.validate(commands).tolist()
+
+        for agent, agent_commands, discrete in zip(
+            agents, commands, self.discrete.tolist()
+        ):
+            for contr, command, is_discrete in zip(
+                agent.controllers, agent_commands, discrete
+            ):
+                contr.set_valid_command(int(command) if is_discrete else command)
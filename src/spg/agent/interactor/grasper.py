@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import pymunk
 
@@ -14,6 +14,8 @@ if TYPE_CHECKING:
     from ...entity import Graspable
     from ..part import PhysicalPart
 
+GraspState = Tuple[Tuple[EmbodiedEntity, ...], bool, bool]
+
 
 class Grasper(ActiveInteractor, ABC):
     def __init__(
@@ -28,6 +30,7 @@ class Grasper(ActiveInteractor, ABC):
         self._grasp_joints: Dict[EmbodiedEntity, List[pymunk.PinJoint]] = {}
 
         self._can_grasp = False
+        self._is_grasping = False
 
         self._max_grasped = max_grasped
 
@@ -51,13 +54,37 @@ class Grasper(ActiveInteractor, ABC):
             if self._max_grasped and self._max_grasped <= len(self._grasped_entities):
                 return
 
-            self._grasped_entities.append(entity)
-            self._add_joints(entity)
-            entity.grasped_by.append(self)
+            self._grasp(entity)
+
+    def _grasp(self, entity: EmbodiedEntity):
+
+        assert self._anchor
+
+        self._grasped_entities.append(entity)
+        self._add_joints(entity)
+        entity.grasped_by.append(self)
 
-            for sensor in self._anchor.agent.external_sensors:
-                if sensor.invisible_grasped:
-                    sensor.add_to_temporary_invisible(entity)
+        for sensor in self._anchor.agent.external_sensors:
+            if sensor.invisible_grasped:
+                sensor.add_to_temporary_invisible(entity)
+
+    @property
+    def grasp_state(self) -> GraspState:
+        """Entities grasped, and whether the grasper can and is grasping."""
+        return tuple(self._grasped_entities), self._can_grasp, self._is_grasping
+
+    def restore_grasp_state(self, state: GraspState):
+        """Release or grasp entities to match a state, e.g. from a snapshot."""
+
+        grasped_entities, self._can_grasp, self._is_grasping = state
+
+        for entity in list(self._grasped_entities):
+            if entity not in grasped_entities:
+                self.release(entity)
+
+        for entity in grasped_entities:
+            if entity not in self._grasped_entities:
+                self._grasp(entity)
 
     @property
     def _collision_type(self):
@@ -106,12 +133,6 @@ class Grasper(ActiveInteractor, ABC):
 
 
 class GraspHold(Grasper):
-    def __init__(self, anchor, **kwargs):
-
-        super().__init__(anchor, **kwargs)
-
-        self._is_grasping = False
-
     def apply_commands(self, **kwargs):
         command_value = self.grasp_controller.command_value
 
@@ -105,6 +105,9 @@ class PhysicalPart(PhysicalEntity, ABC):
             assert self._agent
             self._agent.add(elem)
 
+        elif self._agent:
+            self._agent.update_devices()
+
     def move_to(  # pylint: disable=arguments-differ
         self,
         coordinates: Coordinate,
@@ -207,6 +210,10 @@ class AnchoredPart(PhysicalPart, ABC):
     def anchor_coordinates(self, coord: Coordinate):
         self._anchor_coordinates = coord
 
+    @property
+    def pivot_position(self) -> pymunk.Vec2d:
+        return self._pivot_position
+
     @property
     def relative_position(self):
         assert self._anchor
@@ -1,3 +1,4 @@
+from .layout import ObservationBuffer, ObservationLayout, SensorSlot
 from .ray import DistanceSensor, RayCompute, RaySensor, RGBSensor, SemanticSensor
 from .sensor import ExternalSensor, Sensor, SensorValue
 
@@ -10,4 +11,7 @@ __all__ = [
     "RaySensor",
     "DistanceSensor",
     "SemanticSensor",
+    "ObservationBuffer",
+    "ObservationLayout",
+    "SensorSlot",
 ]
@@ -0,0 +1,216 @@
+"""
+Layout of the observations of agents in a flat block of memory.
+
+Observations are sent across processes as a single contiguous block,
+in which each sensor owns a fixed slot, so that they never need pickling.
+"""
+
+from __future__ import annotations
+
+import math
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+# Slots are aligned on 8 bytes, so that views of any dtype are aligned
+_ALIGNMENT = 8
+
+
+class SensorSlot(NamedTuple):
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    offset: int
+    low: float = -math.inf
+    high: float = math.inf
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+
+class ObservationLayout:
+    """Slots of the sensors of agents, in order of agents and sensors.
+
+    Slots are named after the index of the agent and the index and type
+    of the sensor, so that layouts of identical playgrounds are equal,
+    even if entities have different names.
+    """
+
+    def __init__(self, slots: Sequence[SensorSlot]):
+        self._slots = tuple(slots)
+
+        self._nbytes = 0
+        if self._slots:
+            last = self._slots[-1]
+            self._nbytes = _align(last.offset + last.nbytes)
+
+    @classmethod
+    def from_agents(cls, agents: Sequence[Agent]) -> ObservationLayout:
+
+        slots: List[SensorSlot] = []
+        offset = 0
+
+        for ind_agent, agent in enumerate(agents):
+            for ind_sensor, sensor in enumerate(agent.sensors):
+
+                slot = SensorSlot(
+                    name=f"agent_{ind_agent}/{type(sensor).__name__}_{ind_sensor}",
+                    shape=tuple(int(dim) for dim in sensor.shape),
+                    dtype=np.dtype(sensor.dtype).str,
+                    offset=offset,
+                    low=float(sensor.bounds[0]),
+                    high=float(sensor.bounds[1]),
+                )
+                slots.append(slot)
+                offset = _align(offset + slot.nbytes)
+
+        return cls(slots)
+
+    @property
+    def slots(self):
+        return self._slots
+
+    @property
+    def nbytes(self):
+        """Size of the observations of one playground, in bytes."""
+        return self._nbytes
+
+    def __eq__(self, other):
+        if not isinstance(other, ObservationLayout):
+            return NotImplemented
+        return self._slots == other._slots
+
+    def __hash__(self):
+        return hash(self._slots)
+
+    def views(self, buffer, n_rows: int = 1, offset: int = 0) -> Dict[str, np.ndarray]:
+        """Arrays of shape (n_rows, *shape) of each slot, viewing into buffer.
+
+        Rows are consecutive copies of the layout, for different playgrounds.
+        """
+
+        views = {}
+
+        for slot in self._slots:
+            dtype = np.dtype(slot.dtype)
+            strides = (self._nbytes,) + _contiguous_strides(slot.shape, dtype.itemsize)
+
+            views[slot.name] = np.ndarray(
+                shape=(n_rows, *slot.shape),
+                dtype=dtype,
+                buffer=buffer,
+                offset=offset + slot.offset,
+                strides=strides,
+            )
+
+        return views
+
+
+class ObservationBuffer:
+    """Flat block of memory holding observations, laid out by an ObservationLayout.
+
+    The block has n_rows copies of the layout, one per playground.
+    If shared, the block is allocated in shared memory, and other processes
+    can view it by creating an ObservationBuffer with the same name.
+    Sensors bound to the buffer write their values directly in their slot.
+    """
+
+    def __init__(
+        self,
+        layout: ObservationLayout,
+        n_rows: int = 1,
+        shared: bool = False,
+        name: Optional[str] = None,
+    ):
+
+        self._layout = layout
+        self._n_rows = n_rows
+        self._memory: Optional[SharedMemory] = None
+        self._owner = False
+
+        size = max(1, n_rows * layout.nbytes)
+
+        if name:
+            self._memory = SharedMemory(name=name)
+            buffer = self._memory.buf
+
+        elif shared:
+            self._memory = SharedMemory(create=True, size=size)
+            self._owner = True
+            buffer = self._memory.buf
+
+        else:
+            buffer = bytearray(size)
+
+        self._views: Optional[Dict[str, np.ndarray]] = layout.views(buffer, n_rows)
+
+    @property
+    def layout(self):
+        return self._layout
+
+    @property
+    def n_rows(self):
+        return self._n_rows
+
+    @property
+    def name(self) -> Optional[str]:
+        """Name of the shared memory, if shared."""
+        if self._memory:
+            return self._memory.name
+        return None
+
+    @property
+    def views(self) -> Dict[str, np.ndarray]:
+        """Arrays of shape (n_rows, *shape) for each slot."""
+        assert self._views is not None
+        return self._views
+
+    def row(self, row: int = 0) -> Dict[str, np.ndarray]:
+        """Arrays of shape sensor.shape for each slot, for one row."""
+        return {name: view[row] for name, view in self.views.items()}
+
+    def bind(self, agents: Sequence[Agent], row: int = 0):
+        """Bind the sensors of agents to their slot of a row."""
+
+        sensors = [sensor for agent in agents for sensor in agent.sensors]
+
+        if len(sensors) != len(self._layout.slots):
+            raise ValueError("Sensors of agents do not match the layout")
+
+        for slot, sensor in zip(self._layout.slots, sensors):
+            sensor.slot = self.views[slot.name][row]
+
+    def close(self):
+        """Release the memory. Views of the buffer must not be used afterwards."""
+
+        self._views = None
+
+        if self._memory:
+            try:
+                self._memory.close()
+            except BufferError:
+                # Memory is still viewed outside, and is freed with the views
+                pass
+
+            if self._owner:
+                self._memory.unlink()
+
+            self._memory = None
+
+
+def _align(n_bytes: int) -> int:
+    return -(-n_bytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def _contiguous_strides(shape, itemsize):
+    strides = []
+    stride = itemsize
+    for dim in reversed(shape):
+        strides.append(stride)
+        stride *= dim
+    return tuple(reversed(strides))
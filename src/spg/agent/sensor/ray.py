@@ -1,62 +1,108 @@
 from __future__ import annotations
 
+import math
 from abc import ABC
 from array import array
 from os import path
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 import arcade
 import numpy as np
+import pymunk
+from arcade.gl.compute_shader import ComputeShader
+from PIL import Image
 
+from ...entity import PhysicalEntity
+from ...utils.sprite import TextureKey, texture_key
 from ...utils.uid import id_to_pixel
-from ...view import TopDownView
+from ...view import ColorUidView
 from .sensor import ExternalSensor
 
 if TYPE_CHECKING:
     from ...playground import Playground
 
 
+RAY_BACKENDS = ("shader", "cpu", "march", "analytic")
+
+# Group of the shapes that analytic rays go through.
+# Segment queries with the same group ignore them.
+_RAY_EXCLUDED_GROUP = 1
+
+
 class RayCompute:
-    def __init__(self, playground: Playground, size, center, zoom, use_shader=True):
+    """Computes the hitpoints of all the ray sensors of a playground.
+
+    Rays are cast on a top-down view of the playground where entities are
+    colored by their id. Backends:
+        - shader: compute shaders on the GPU.
+        - cpu: samples all points of all rays at once with numpy.
+        - march: advances rays by chunks with numpy and stops them at their
+            first hit, so that the cost depends on the distance to the hit.
+
+    These backends sample the same points and return the same hitpoints.
+
+    The analytic backend doesn't render anything: rays are cast against
+    the shapes of the pymunk space, and colors are read from the textures
+    of the entities. Distances are exact instead of sampled,
+    and no OpenGL context is required.
+    """
+
+    # Number of points sampled per ray at the first step of the march.
+    # It doubles at each step, up to the maximum.
+    _march_chunk = 8
+    _max_march_chunk = 64
+
+    def __init__(self, playground: Playground, size, center, zoom, backend="shader"):
+
+        if backend not in RAY_BACKENDS:
+            raise ValueError(f"Ray backend {backend} not in {RAY_BACKENDS}")
 
         self._playground = playground
-        self.ctx = playground.window.ctx
 
-        self._use_shader = use_shader
+        self._backend = backend
+        self._use_shader = backend == "shader"
 
-        self._id_view = TopDownView(
-            playground,
-            size,
-            center,
-            zoom,
-            display_uid=True,
-            draw_interactive=False,
-            draw_transparent=False,
-            draw_zone=False,
-        )
-        self._color_view = TopDownView(
+        self._sensors: List[RaySensor] = []
+
+        if backend == "analytic":
+            self.ctx = None
+
+            self._size = size
+            self._center = center
+            self._zoom = zoom
+
+            # RGBA arrays of the textures of entities, with the images they come from
+            self._texture_images: Dict[TextureKey, Tuple[Image.Image, np.ndarray]] = {}
+
+            # Traversable shapes, and shapes that rays go through.
+            # Outdated when entities are added or removed.
+            self._analytic_shapes: Optional[
+                Tuple[List[Tuple[pymunk.Shape, PhysicalEntity]], List[pymunk.Shape]]
+            ] = None
+            return
+
+        self.ctx = playground.window.ctx
+
+        # Colors and ids are rendered in a single pass
+        self._view = ColorUidView(
             playground,
             size,
             center,
             zoom,
-            draw_interactive=False,
             draw_transparent=False,
-            draw_zone=False,
         )
 
-        self._sensors: List[RaySensor] = []
-
         if self._use_shader:
 
             self._view_params_buffer = self.ctx.buffer(
                 data=array(
                     "f",
                     [
-                        self._id_view.center[0],
-                        self._id_view.center[1],
-                        self._id_view.width,
-                        self._id_view.height,
-                        self._id_view.zoom,
+                        self._view.center[0],
+                        self._view.center[1],
+                        self._view.width,
+                        self._view.height,
+                        self._view.zoom,
                     ],
                 )
             )
@@ -68,6 +114,17 @@ class RayCompute:
             self._output_rays_buffer = None
             self._inv_buffer = None
 
+            # Buffers are allocated with a fixed capacity and written in place.
+            # They are only reallocated when the number of sensors,
+            # of rays or of invisible ids exceeds the current capacity.
+            self._sensors_capacity = 0
+            self._rays_capacity = 0
+            self._invisible_capacity = 0
+
+            self._position_data = np.zeros((0, 3), dtype=np.float32)
+            self._param_data = np.zeros((0, 4), dtype=np.float32)
+            self._inv_data = np.zeros((0, 0), dtype=np.uint32)
+
             shader_dir = path.abspath(path.join(__file__, "../shaders"))
 
             with open(shader_dir + "/id_compute.glsl", "rt", encoding="utf-8") as f_id:
@@ -78,6 +135,11 @@ class RayCompute:
             ) as f_col:
                 self._source_compute_colors = f_col.read()
 
+            # Compiled shaders, indexed by (N_SENSORS, MAX_N_RAYS, MAX_N_INVISIBLE)
+            self._shaders: Dict[
+                Tuple[int, int, int], Tuple[ComputeShader, ComputeShader]
+            ] = {}
+
             self._id_shader = None
             self._color_shader = None
 
@@ -93,124 +155,133 @@ class RayCompute:
     def _max_invisible(self):
         return 1 + max(len(sensor.invisible_ids) for sensor in self._sensors)
 
-    def _generate_buffers(self):
+    def _reserve_buffers(self) -> bool:
+        """Grows buffers and shaders if the sensors don't fit in current capacity.
 
-        position_buffer = self.ctx.buffer(
-            data=array("f", self._generate_position_buffer())
-        )
-        param_buffer = self.ctx.buffer(
-            data=array("f", self._generate_parameter_buffer())
-        )
-        output_rays_buffer = self.ctx.buffer(
-            data=array("f", self._generate_output_buffer())
-        )
-        inv_buffer = self.ctx.buffer(data=array("I", self._generate_invisible_buffer()))
+        Returns True if buffers were reallocated, and must be written again.
+        """
 
-        param_buffer.bind_to_storage_buffer(binding=2)
-        position_buffer.bind_to_storage_buffer(binding=3)
-        output_rays_buffer.bind_to_storage_buffer(binding=4)
-        inv_buffer.bind_to_storage_buffer(binding=5)
+        n_sensors = self._n_sensors
+        n_rays = self._max_n_rays
+        n_invisible = self._max_invisible
 
-        return position_buffer, param_buffer, output_rays_buffer, inv_buffer
+        if (
+            n_sensors <= self._sensors_capacity
+            and n_rays <= self._rays_capacity
+            and n_invisible <= self._invisible_capacity
+        ):
+            return False
 
-    def _generate_parameter_buffer(self):
+        # Sensors and invisible ids grow geometrically.
+        # Number of rays is the size of the workgroups, so it is kept tight.
+        if n_sensors > self._sensors_capacity:
+            self._sensors_capacity = max(n_sensors, 2 * self._sensors_capacity)
 
-        for sensor in self._sensors:
-            yield sensor.max_range
-            yield sensor.fov
-            yield sensor.resolution
-            yield sensor.n_points
+        if n_invisible > self._invisible_capacity:
+            self._invisible_capacity = max(n_invisible, 2 * self._invisible_capacity)
 
-    def _generate_position_buffer(self):
+        self._rays_capacity = max(n_rays, self._rays_capacity)
 
-        for sensor in self._sensors:
-            yield sensor.position[0]
-            yield sensor.position[1]
-            yield sensor.angle
+        self._position_data = np.zeros((self._sensors_capacity, 3), dtype=np.float32)
+        self._param_data = np.zeros((self._sensors_capacity, 4), dtype=np.float32)
+        self._inv_data = np.zeros(
+            (self._sensors_capacity, self._invisible_capacity), dtype=np.uint32
+        )
 
-    def _generate_output_buffer(self):
+        self._position_buffer = self.ctx.buffer(reserve=self._position_data.nbytes)
+        self._param_buffer = self.ctx.buffer(reserve=self._param_data.nbytes)
+        self._output_rays_buffer = self.ctx.buffer(
+            reserve=self._sensors_capacity * self._rays_capacity * 13 * 4
+        )
+        self._inv_buffer = self.ctx.buffer(reserve=self._inv_data.nbytes)
 
-        for _ in range(self._n_sensors):
-            for _ in range(self._max_n_rays):
+        self._id_shader, self._color_shader = self._get_shaders(
+            self._sensors_capacity, self._rays_capacity, self._invisible_capacity
+        )
 
-                # View Position
-                yield 0.0
-                yield 0.0
+        return True
 
-                # Abs Env Position
-                yield 0.0
-                yield 0.0
+    def _write_parameter_buffer(self):
 
-                # Rel Position
-                yield 0.0
-                yield 0.0
+        for index, sensor in enumerate(self._sensors):
+            self._param_data[index] = (
+                sensor.max_range,
+                sensor.fov,
+                sensor.resolution,
+                sensor.n_points,
+            )
 
-                # Sensor center on view
-                yield 0.0
-                yield 0.0
+        self._param_buffer.write(self._param_data)
 
-                # ID
-                yield 0.0
+    def _write_position_buffer(self):
 
-                # Distance
-                yield 0.0
+        for index, sensor in enumerate(self._sensors):
+            self._position_data[index] = (
+                sensor.position[0],
+                sensor.position[1],
+                sensor.angle,
+            )
 
-                # Color
-                yield 0.0
-                yield 0.0
-                yield 0.0
+        self._position_buffer.write(self._position_data[: self._n_sensors])
 
-    def _generate_invisible_buffer(self):
+    def _write_invisible_buffer(self):
 
-        for sensor in self._sensors:
+        self._inv_data[:] = 0
+
+        for index, sensor in enumerate(self._sensors):
+            invisible_ids = [sensor.anchor.uid] + sensor.invisible_ids
+            self._inv_data[index, : len(invisible_ids)] = invisible_ids
 
-            count = 1
-            yield sensor.anchor.uid
+        self._inv_buffer.write(self._inv_data)
 
-            for inv in sensor.invisible_ids:
-                yield inv
-                count += 1
+    def _get_shaders(self, n_sensors, n_rays, n_invisible):
 
-            while count < self._max_invisible:
-                yield 0
-                count += 1
+        key = n_sensors, n_rays, n_invisible
 
-    def _generate_shaders(self):
-        new_source = self._source_compute_ids
-        new_source = new_source.replace("N_SENSORS", str(len(self._sensors)))
-        new_source = new_source.replace("MAX_N_RAYS", str(self._max_n_rays))
-        new_source = new_source.replace("MAX_N_INVISIBLE", str(self._max_invisible))
-        id_shader = self.ctx.compute_shader(source=new_source)
+        if key not in self._shaders:
 
-        new_source = self._source_compute_colors
-        new_source = new_source.replace("MAX_N_RAYS", str(self._max_n_rays))
-        color_shader = self.ctx.compute_shader(source=new_source)
+            new_source = self._source_compute_ids
+            new_source = new_source.replace("N_SENSORS", str(n_sensors))
+            new_source = new_source.replace("MAX_N_RAYS", str(n_rays))
+            new_source = new_source.replace("MAX_N_INVISIBLE", str(n_invisible))
+            id_shader = self.ctx.compute_shader(source=new_source)
 
-        return id_shader, color_shader
+            new_source = self._source_compute_colors
+            new_source = new_source.replace("MAX_N_RAYS", str(n_rays))
+            color_shader = self.ctx.compute_shader(source=new_source)
+
+            self._shaders[key] = id_shader, color_shader
+
+        return self._shaders[key]
 
     def add(self, sensor):
         self._sensors.append(sensor)
 
         if self._use_shader:
-            self._update_buffers_and_shaders()
+            self._reserve_buffers()
+            self._write_parameter_buffer()
+            self._write_invisible_buffer()
 
-    def _update_buffers_and_shaders(self):
-        (
-            self._position_buffer,
-            self._param_buffer,
-            self._output_rays_buffer,
-            self._inv_buffer,
-        ) = self._generate_buffers()
+        else:
+            self._update_cpu_parameters()
+            self._update_cpu_invisible()
 
-        self._id_shader, self._color_shader = self._generate_shaders()
+    def updates_view(self, view) -> bool:
+        """Whether view is updated when sensors are updated."""
+        return (
+            bool(self._sensors) and self._backend != "analytic" and view is self._view
+        )
 
     def update_sensors(self):
 
         if not self._sensors:
             return
 
-        self._id_view.update(force=True)
-        self._color_view.update(force=True)
+        if self._backend == "analytic":
+            self._update_sensors_analytic()
+            return
+
+        self._view.update()
 
         if self._use_shader:
             self._update_sensors_shaders()
@@ -226,129 +297,445 @@ class RayCompute:
                 update_inv = True
 
         if update_inv:
-            self._update_buffers_and_shaders()
+            # Reallocated buffers are empty, including the parameters of sensors
+            if self._reserve_buffers():
+                self._write_parameter_buffer()
+            self._write_invisible_buffer()
 
-        self._position_buffer = self.ctx.buffer(
-            data=array("f", self._generate_position_buffer())
-        )
+        self._write_position_buffer()
+
+        # Storage bindings are shared by all the playgrounds of the context
+        self._param_buffer.bind_to_storage_buffer(binding=2)
         self._position_buffer.bind_to_storage_buffer(binding=3)
+        self._output_rays_buffer.bind_to_storage_buffer(binding=4)
+        self._inv_buffer.bind_to_storage_buffer(binding=5)
+        self._view_params_buffer.bind_to_storage_buffer(binding=6)
 
-        self._id_view.texture.use()
+        self._view.uid_texture.use()
         self._id_shader.run(group_x=self._n_sensors)
 
-        self._color_view.texture.use()
+        self._view.texture.use()
         self._color_shader.run(group_x=self._n_sensors)
 
         hitpoints = np.frombuffer(
-            self._output_rays_buffer.read(), dtype=np.float32
-        ).reshape(self._n_sensors, self._max_n_rays, 13)
+            self._output_rays_buffer.read(
+                size=self._n_sensors * self._rays_capacity * 13 * 4
+            ),
+            dtype=np.float32,
+        ).reshape(self._n_sensors, self._rays_capacity, 13)
 
         for index, sensor in enumerate(self._sensors):
             sensor.update_hitpoints(hitpoints[index, : sensor.resolution, :])
 
+    def _update_cpu_parameters(self):
+        """Precomputes the ray directions and sampling ratios of all the sensors."""
+
+        max_n_rays = self._max_n_rays
+        max_n_points = max(sensor.n_points for sensor in self._sensors)
+
+        self._ray_offsets = np.zeros((self._n_sensors, max_n_rays), dtype=np.float32)
+        self._ratios = np.zeros((self._n_sensors, max_n_points), dtype=np.float32)
+        self._valid_points = np.zeros((self._n_sensors, max_n_points), dtype=bool)
+        self._valid_rays = np.zeros((self._n_sensors, max_n_rays), dtype=bool)
+
+        for index, sensor in enumerate(self._sensors):
+            i_ray = np.arange(sensor.resolution, dtype=np.float32)
+            self._ray_offsets[
+                index, : sensor.resolution
+            ] = -sensor.fov / 2 + i_ray * sensor.fov / max(sensor.resolution - 1, 1)
+            self._valid_rays[index, : sensor.resolution] = True
+
+            i_point = np.arange(sensor.n_points, dtype=np.float32)
+            self._ratios[index, : sensor.n_points] = i_point / sensor.n_points
+            self._valid_points[index, : sensor.n_points] = True
+
+        self._ranges = np.array(
+            [sensor.max_range for sensor in self._sensors], dtype=np.float32
+        )
+        self._n_points = np.array(
+            [sensor.n_points for sensor in self._sensors], dtype=np.int64
+        )
+
+    def _update_cpu_invisible(self):
+
+        # Invisible ids are keyed by sensor, so that they are masked in one pass.
+        self._invisible_keys = np.array(
+            [
+                index * 2**24 + uid
+                for index, sensor in enumerate(self._sensors)
+                for uid in [sensor.anchor.uid] + sensor.invisible_ids
+            ],
+            dtype=np.int64,
+        )
+
     def _update_sensors_cpu(self):
 
-        img_color = self._color_view.get_np_img()
-        img_id = self._id_view.get_np_img()
+        if any(sensor.require_invisible_update for sensor in self._sensors):
+            self._update_cpu_invisible()
 
-        for sensor in self._sensors:
+        img_id = self._view.get_np_uid_img().astype(np.int64)
+        ids = img_id[..., 0] + 256 * img_id[..., 1] + 256 * 256 * img_id[..., 2]
 
-            end_positions = sensor.end_positions
+        # Points outside the view fall on an extra empty pixel
+        ids = np.append(ids.reshape(-1), 0)
 
-            ray_start_x = (
-                sensor.position[0] - self._id_view.center[0]
-            ) * self._id_view.zoom + self._id_view.width / 2
-            ray_start_y = (
-                sensor.position[1] - self._id_view.center[1]
-            ) * self._id_view.zoom + self._id_view.height / 2
+        center, end = self._ray_geometry()
 
-            center_on_view = np.asarray((ray_start_x, ray_start_y)).reshape(2, 1)
+        if self._backend == "march":
+            index_hit, hit = self._march_rays(center, end, ids)
+        else:
+            index_hit, hit = self._sample_rays(center, end, ids)
 
-            rays_end = center_on_view + end_positions * self._id_view.zoom
+        hitpoints = self._compute_hitpoints_cpu(center, end, index_hit, hit, ids)
 
-            points = np.linspace(center_on_view, rays_end, num=sensor.n_points)
+        for index, sensor in enumerate(self._sensors):
+            sensor.update_hitpoints(hitpoints[index, : sensor.resolution, :])
 
-            points[:, 0, :] = (points[:, 0, :] > 0) * points[:, 0, :]
-            points[:, 0, :] = (points[:, 0, :] < self._id_view.width) * points[
-                :, 0, :
-            ] + (points[:, 0, :] >= self._id_view.width) * (self._id_view.width - 1)
+    def _ray_geometry(self):
+        """Position of the sensors and of the end of their rays on the view."""
 
-            points[:, 1, :] = (points[:, 1, :] > 0) * points[:, 1, :]
-            points[:, 1, :] = (points[:, 1, :] < self._id_view.height) * points[
-                :, 1, :
-            ] + (points[:, 1, :] >= self._id_view.height) * (self._id_view.height - 1)
+        view = self._view
+        view_size = np.array((view.width, view.height), dtype=np.float32)
+        view_center = np.array(view.center, dtype=np.float32)
 
-            points = points.swapaxes(1, 2).reshape(-1, 2)
+        coordinates = np.array(
+            [(*sensor.position, sensor.angle) for sensor in self._sensors],
+            dtype=np.float32,
+        )
 
-            rr, cc = points[:, 1].astype(np.int), points[:, 0].astype(np.int)
+        center = (coordinates[:, :2] - view_center) * view.zoom + view_size / 2
+        angles = coordinates[:, 2:3] + self._ray_offsets
+        end = center[:, np.newaxis, :] + (
+            self._ranges[:, np.newaxis, np.newaxis]
+            * view.zoom
+            * np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+        )
 
-            # Get Ids
-            pts = img_id[rr, cc]
+        return center, end
 
-            ids = 256 * 256 * pts[:, 2] + 256 * pts[:, 1] + pts[:, 0]
+    def _pixel_index(self, center, end, ratios):
+        """Index of the pixels sampled along rays, truncated as texelFetch does."""
 
-            #  remove invisible
-            for inv in sensor.invisible_ids:
-                ids = (ids != inv) * ids
+        view = self._view
 
-            ids = ids.reshape(-1, sensor.resolution).transpose()
+        ratios = ratios[..., np.newaxis]
+        points = (center * (1 - ratios) + end * ratios).astype(np.int32)
 
-            # take index and value of first non-zero
-            index_first_non_zero = np.argmax((ids != 0), axis=1)
+        x, y = points[..., 0], points[..., 1]
+        in_view = (x >= 0) & (x < view.width) & (y >= 0) & (y < view.height)
 
-            # Calculate hitpoints
-            id_first_non_zero = ids[
-                np.arange(len(index_first_non_zero)), index_first_non_zero
-            ]
+        return points, np.where(in_view, y * view.width + x, view.width * view.height)
 
-            points = points.reshape((-1, sensor.resolution, 2))
-            view_position = points[
-                index_first_non_zero, np.arange(len(index_first_non_zero)), :
-            ]
+    def _visible(self, ids, sensor_index):
 
-            color = img_color[
-                view_position[:, 1].astype(np.int), view_position[:, 0].astype(np.int)
-            ]
-            color[id_first_non_zero == 0] = (0, 0, 0)
+        visible = ids != 0
+        index_visible = np.nonzero(visible)
+        sensor_index = np.broadcast_to(sensor_index, ids.shape)
+        keys = sensor_index[index_visible] * 2**24 + ids[index_visible]
+        visible[index_visible] = ~np.isin(keys, self._invisible_keys)
+
+        return visible
+
+    def _sample_rays(self, center, end, ids):
+        """Samples all the points of all rays, and finds the first visible one."""
+
+        _, pixel_index = self._pixel_index(
+            center[:, np.newaxis, np.newaxis, :],
+            end[:, :, np.newaxis, :],
+            self._ratios[:, np.newaxis, :],
+        )
+
+        sensor_index = np.arange(self._n_sensors)[:, np.newaxis, np.newaxis]
+        visible = self._visible(ids[pixel_index], sensor_index)
+        visible &= self._valid_points[:, np.newaxis, :]
+
+        # First visible point, or last point of the ray if nothing is hit
+        hit = visible.any(axis=2)
+        index_hit = np.where(hit, visible.argmax(axis=2), self._n_points[:, None] - 1)
+
+        return index_hit, hit
+
+    def _march_rays(self, center, end, ids):
+        """Marches along the rays, and stops each ray at its first visible point.
+
+        Rays are advanced together by chunks of points of growing size,
+        and removed from the batch as soon as they hit.
+        The cost is proportional to the distance to the hit rather than to the range.
+        Points are the same as the ones sampled in _sample_rays.
+        """
+
+        n_sensors, n_rays = end.shape[:2]
+
+        sensor_index = np.repeat(np.arange(n_sensors), n_rays)
+        ray_center = center[sensor_index]
+        ray_end = end.reshape(-1, 2)
+        n_points = self._n_points[sensor_index]
 
-            # Relative pos and distance
-            rel_pos = center_on_view.transpose() - view_position
-            distance = np.sqrt(rel_pos[:, 0] ** 2 + rel_pos[:, 1] ** 2)
-            distance[id_first_non_zero == 0] = sensor.max_range
-            distance = np.expand_dims(distance, -1)
+        index_hit = n_points - 1
+        hit = np.zeros(n_sensors * n_rays, dtype=bool)
 
-            x_abs = (
-                view_position[:, 0] - self._id_view.width / 2
-            ) / self._id_view.zoom + self._id_view.center[0]
+        active = np.flatnonzero(self._valid_rays)
+        start = 0
+        chunk = self._march_chunk
 
-            y_abs = (
-                view_position[:, 1] - self._id_view.height / 2
-            ) / self._id_view.zoom + self._id_view.center[1]
+        while active.size:
 
-            view_position[id_first_non_zero == 0, :] = rays_end[
-                :, id_first_non_zero == 0
-            ].transpose()
-            abs_env_position = np.vstack((x_abs, y_abs)).transpose()
+            i_point = start + np.arange(chunk)
+            ratios = i_point.astype(np.float32) / n_points[active, np.newaxis].astype(
+                np.float32
+            )
 
-            center_on_view = np.broadcast_to(
-                center_on_view.transpose(), (sensor.resolution, 2)
+            _, pixel_index = self._pixel_index(
+                ray_center[active, np.newaxis, :],
+                ray_end[active, np.newaxis, :],
+                ratios,
             )
 
-            id_first_non_zero = np.expand_dims(id_first_non_zero, -1)
+            visible = self._visible(ids[pixel_index], sensor_index[active, np.newaxis])
+            visible &= i_point < n_points[active, np.newaxis]
 
-            hitpoints = np.hstack(
-                (
-                    view_position,
-                    abs_env_position,
-                    np.zeros((sensor.resolution, 2)),
-                    center_on_view,
-                    id_first_non_zero,
-                    distance,
-                    color,
-                )
+            active_hit = visible.any(axis=1)
+            hit[active[active_hit]] = True
+            index_hit[active[active_hit]] = start + visible[active_hit].argmax(axis=1)
+
+            done = active_hit | (start + chunk >= n_points[active])
+            active = active[~done]
+
+            start += chunk
+            chunk = min(2 * chunk, self._max_march_chunk)
+
+        return index_hit.reshape(n_sensors, n_rays), hit.reshape(n_sensors, n_rays)
+
+    def _compute_hitpoints_cpu(self, center, end, index_hit, hit, ids):
+        """Computes the hitpoints of all the rays from the index of their hit.
+
+        Returns:
+            Array of hitpoints of shape (n_sensors, max_n_rays, 13),
+            with the same layout as the output of the compute shaders.
+        """
+
+        view = self._view
+        view_size = np.array((view.width, view.height), dtype=np.float32)
+        view_center = np.array(view.center, dtype=np.float32)
+
+        ratios = np.take_along_axis(self._ratios, index_hit, axis=1)
+        points, pixel_index = self._pixel_index(center[:, np.newaxis, :], end, ratios)
+
+        view_position = points.astype(np.float32)
+        id_hit = np.where(hit, ids[pixel_index], 0)
+
+        rel_pos = view_position - center[:, np.newaxis, :]
+        distance = np.sqrt(rel_pos[..., 0] ** 2 + rel_pos[..., 1] ** 2) / view.zoom
+        distance = np.where(hit, distance, self._ranges[:, np.newaxis])
+
+        img_color = self._view.get_np_img()
+        color = np.append(img_color.reshape(-1, 3), np.zeros((1, 3), np.uint8), 0)
+        color = color[pixel_index]
+        color[~hit] = 0
+
+        abs_env_position = (view_position - view_size / 2) / view.zoom + view_center
+
+        hitpoints = np.zeros((*hit.shape, 13), dtype=np.float32)
+        hitpoints[..., 0:2] = view_position
+        hitpoints[..., 2:4] = abs_env_position
+        hitpoints[..., 6:8] = center[:, np.newaxis, :]
+        hitpoints[..., 8] = id_hit
+        hitpoints[..., 9] = distance
+        hitpoints[..., 10:13] = color
+
+        return hitpoints
+
+    def outdate_shapes(self):
+        """Called when entities are added to or removed from the playground."""
+        if self._backend == "analytic":
+            self._analytic_shapes = None
+
+    @property
+    def _shapes_analytic(self):
+
+        if self._analytic_shapes is None:
+
+            space = self._playground.space
+
+            traversable = []
+            excluded = []
+
+            for shape, entity in self._playground.shapes_to_entities.items():
+
+                if shape.space is not space:
+                    continue
+
+                if not isinstance(entity, PhysicalEntity) or entity.transparent:
+                    excluded.append(shape)
+
+                # Traversable shapes don't collide with anything, not even queries
+                elif entity.traversable:
+                    traversable.append((shape, entity))
+
+            self._analytic_shapes = traversable, excluded
+
+        return self._analytic_shapes
+
+    def _update_sensors_analytic(self):
+
+        traversable, excluded = self._shapes_analytic
+        excluded_filters = _exclude_from_queries(excluded)
+
+        try:
+            for sensor in self._sensors:
+
+                invisible = [
+                    shape
+                    for entity in [sensor.anchor] + sensor.invisible_entities
+                    for shape in entity.pm_shapes
+                ]
+                invisible_filters = _exclude_from_queries(invisible)
+
+                try:
+                    hitpoints = self._cast_rays_analytic(sensor, traversable)
+                finally:
+                    _restore_filters(invisible, invisible_filters)
+
+                sensor.update_hitpoints(hitpoints)
+
+        finally:
+            _restore_filters(excluded, excluded_filters)
+
+    def _cast_rays_analytic(self, sensor, traversable):
+        """Casts the rays of a sensor against the shapes of the pymunk space.
+
+        Shapes of invisible, transparent and interactive entities
+        are in the excluded group of the query filter.
+        Traversable shapes are queried one by one,
+        when their bounding box is on the ray.
+
+        Returns:
+            Array of hitpoints of shape (resolution, 13),
+            with the same layout as the output of the compute shaders.
+        """
+
+        playground = self._playground
+        space = playground.space
+        shapes_to_entities = playground.shapes_to_entities
+
+        invisible_ids = set([sensor.anchor.uid] + sensor.invisible_ids)
+
+        position = np.array(sensor.position, dtype=np.float64)
+        i_ray = np.arange(sensor.resolution)
+        angles = (
+            sensor.angle
+            - sensor.fov / 2
+            + i_ray * sensor.fov / max(sensor.resolution - 1, 1)
+        )
+        directions = np.stack((np.cos(angles), np.sin(angles)), axis=-1)
+        ends = position + sensor.max_range * directions
+
+        hitpoints = np.zeros((sensor.resolution, 13), dtype=np.float32)
+        hitpoints[:, 2:4] = ends
+        hitpoints[:, 9] = sensor.max_range
+
+        query_filter = pymunk.ShapeFilter(group=_RAY_EXCLUDED_GROUP)
+
+        sensor_bb = pymunk.BB.newForCircle(tuple(position), sensor.max_range)
+        traversable = [
+            shape
+            for shape, entity in traversable
+            if entity.uid not in invisible_ids and shape.bb.intersects(sensor_bb)
+        ]
+
+        for index, end in enumerate(ends):
+
+            start, end = tuple(position), tuple(end)
+
+            closest = space.segment_query_first(start, end, 0, query_filter)
+
+            for shape in traversable:
+
+                if not shape.bb.intersects_segment(start, end):
+                    continue
+
+                query = shape.segment_query(start, end)
+                if query.shape and (not closest or query.alpha < closest.alpha):
+                    closest = query
+
+            if not closest:
+                continue
+
+            query, entity = closest, shapes_to_entities[closest.shape]
+
+            hitpoints[index, 2:4] = query.point
+            hitpoints[index, 8] = entity.uid
+            hitpoints[index, 9] = query.alpha * sensor.max_range
+            hitpoints[index, 10:13] = self._entity_color(
+                entity, query.point, directions[index]
+            )
+
+        center = (position - self._center) * self._zoom + np.array(self._size) / 2
+        hitpoints[:, 0:2] = (hitpoints[:, 2:4] - self._center) * self._zoom + (
+            np.array(self._size) / 2
+        )
+        hitpoints[:, 6:8] = center
+
+        return hitpoints
+
+    def _entity_color(self, entity, point, direction):
+        """Color of the texture of an entity at a point of its boundary."""
+
+        texture = entity.texture
+        key = texture_key(texture)
+
+        if key not in self._texture_images:
+            self._texture_images[key] = texture.image, np.asarray(
+                texture.image.convert("RGBA"), dtype=np.float32
             )
 
-            sensor.update_hitpoints(hitpoints)
+        image = self._texture_images[key][1]
+        height, width = image.shape[:2]
+
+        # Look slightly inside the entity, in the local frame of its texture
+        local = (
+            pymunk.Vec2d(*point) + 0.5 * pymunk.Vec2d(*direction)
+        ) - entity.position
+        local = local.rotated(-entity.pm_body.angle) / entity.scale
+
+        pixel_x = min(max(int(local.x + width / 2), 0), width - 1)
+        pixel_y = min(max(int(height / 2 - local.y), 0), height - 1)
+
+        color = image[pixel_y, pixel_x]
+
+        # Fall back on the average color of the texture on transparent pixels
+        if color[3] == 0:
+            opaque = image[image[..., 3] > 0]
+            color = opaque.mean(axis=0) if opaque.size else color
+
+        color = color[:3]
+
+        if entity.color:
+            color = color * np.array(entity.color[:3]) / 255
+
+        return color
+
+
+def _exclude_from_queries(shapes: Sequence[pymunk.Shape]) -> List[pymunk.ShapeFilter]:
+    """Put shapes in the excluded group of ray queries.
+
+    Returns their filters, to restore them before the next physics step.
+    """
+
+    filters = [shape.filter for shape in shapes]
+
+    for shape, shape_filter in zip(shapes, filters):
+        shape.filter = shape_filter._replace(group=_RAY_EXCLUDED_GROUP)
+
+    return filters
+
+
+def _restore_filters(
+    shapes: Sequence[pymunk.Shape], filters: Sequence[pymunk.ShapeFilter]
+):
+
+    for shape, shape_filter in zip(shapes, filters):
+        shape.filter = shape_filter
 
 
 class RaySensor(ExternalSensor, ABC):
@@ -432,6 +819,12 @@ class DistanceSensor(RaySensor):
     def _apply_normalization(self):
         self._values = self._values / self._range
 
+    @property
+    def bounds(self):
+        if self._normalize:
+            return 0.0, 1.0
+        return 0.0, float(self._range)
+
 
 class RGBSensor(RaySensor):
     def _compute_raw_sensor(self):
@@ -468,6 +861,12 @@ class RGBSensor(RaySensor):
     def _apply_normalization(self):
         self._values = self._values / 255.0
 
+    @property
+    def bounds(self):
+        if self._normalize:
+            return 0.0, 1.0
+        return 0.0, 255.0
+
 
 class SemanticSensor(RaySensor):
     def _compute_raw_sensor(self):
@@ -506,3 +905,8 @@ class SemanticSensor(RaySensor):
 
     def _apply_normalization(self):
         self._values = self._values / (1, self._range)
+
+    @property
+    def bounds(self):
+        # Ids of detected entities are not normalized
+        return 0.0, math.inf
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import math
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -62,6 +62,9 @@ class Sensor(PocketDevice):
 
         self._values = None
 
+        # Slot of an ObservationBuffer where values are copied, if any
+        self._slot: Optional[np.ndarray] = None
+
         self._normalize = normalize
 
         self._noise = False
@@ -80,6 +83,28 @@ class Sensor(PocketDevice):
             if self._normalize:
                 self._apply_normalization()
 
+        if self._slot is not None:
+            self._slot[...] = np.reshape(self._values, self._slot.shape)
+
+    @property
+    def sensor_values(self) -> SensorValue:
+        return self._values
+
+    @property
+    def slot(self) -> Optional[np.ndarray]:
+        return self._slot
+
+    @slot.setter
+    def slot(self, slot: Optional[np.ndarray]):
+        self._slot = slot
+
+    @property
+    def observation(self) -> SensorValue:
+        """Values of the sensor, viewed in its slot if bound to an ObservationBuffer."""
+        if self._slot is not None:
+            return self._slot
+        return self._values
+
     @abstractmethod
     def _compute_raw_sensor(self):
         ...
@@ -103,6 +128,16 @@ class Sensor(PocketDevice):
     def shape(self) -> tuple:
         """Returns the shape of the numpy array, if applicable."""
 
+    @property
+    def dtype(self) -> np.dtype:
+        """Returns the type of the values when sent as observations."""
+        return np.dtype(np.float32)
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        """Returns the lowest and highest values of the sensor, if known."""
+        return -math.inf, math.inf
+
     @abstractmethod
     def draw(self):
         ...
@@ -175,9 +210,13 @@ class ExternalSensor(Sensor, ABC):
     def resolution(self):
         return self._resolution
 
+    @property
+    def invisible_entities(self):
+        return self._temporary_invisible + self._invisible_elements
+
     @property
     def invisible_ids(self):
-        return [ent.uid for ent in self._temporary_invisible + self._invisible_elements]
+        return [ent.uid for ent in self.invisible_entities]
 
     @property
     def invisible_grasped(self):
@@ -127,7 +127,8 @@
                     sample_point = ivec2(mix(center, end_pos, ratio));
                     id_color_out = texelFetch(id_texture, sample_point, 0);
 
-                    id_out = int(256*256*id_color_out.z*255 + 256*id_color_out.y*255 + id_color_out.x*255);
+                    ivec4 id_bytes = ivec4(round(id_color_out*255));
+                    id_out = 256*256*id_bytes.z + 256*id_bytes.y + id_bytes.x;
 
                     if (id_out != 0)
                     {
@@ -180,7 +181,7 @@
                 out_pt.sensor_y_on_view = sensor_y_on_view ;
 
                 out_pt.id = float(id_out);
-                out_pt.dist = dist/zoom;
+                out_pt.dist = dist;
 
                 //out_pt.r = color_out.z*255;
                 //out_pt.g = color_out.y*255;
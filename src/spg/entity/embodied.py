@@ -2,20 +2,24 @@
 
 from __future__ import annotations
 
+import itertools
 import math
 from abc import ABC, abstractmethod
 from typing import List, Optional, Tuple, Union
 
 import pymunk
 from arcade import Sprite, Texture
-from PIL import Image
 
 from ..utils.definitions import ELASTICITY_ENTITY, FRICTION_ENTITY
 from ..utils.position import Coordinate, CoordinateSampler, InitCoord
+from ..utils.sprite import get_shape_vertices, get_uid_texture
 from .entity import Entity
 
 Teams = Union[str, List[str]]
 
+# Candidate coordinates tested at once when sampling a valid coordinate
+SAMPLES_PER_QUERY = 16
+
 
 class EmbodiedEntity(Entity, ABC):
 
@@ -90,10 +94,19 @@ class EmbodiedEntity(Entity, ABC):
     def pm_body(self):
         return self._pm_body
 
+    @property
+    def base_sprite(self):
+        """Sprite holding the texture and hit box, shared with copies of the entity."""
+        return self._base_sprite
+
     @property
     def texture(self):
         return self._base_sprite.texture
 
+    @property
+    def color(self):
+        return self._color
+
     @property
     def radius(self):
         return self._radius
@@ -205,27 +218,45 @@ class EmbodiedEntity(Entity, ABC):
 
     def _get_pm_shapes_from_sprite(self, shape_approximation):
 
+        if shape_approximation == "circle":
+            pm_shapes = [pymunk.Circle(self._pm_body, self._radius)]
+
+        else:
+            list_vertices = get_shape_vertices(
+                self._base_sprite.texture,
+                self._scale,
+                shape_approximation,
+                lambda: self._compute_shape_vertices(shape_approximation),
+            )
+
+            pm_shapes = [
+                pymunk.Poly(body=self._pm_body, vertices=vertices)
+                for vertices in list_vertices
+            ]
+
+        for pm_shape in pm_shapes:
+            pm_shape.friction = FRICTION_ENTITY
+            pm_shape.elasticity = ELASTICITY_ENTITY
+
+        return pm_shapes
+
+    def _compute_shape_vertices(self, shape_approximation):
+
         vertices = self._base_sprite.get_hit_box()
 
         vertices = [(x * self._scale, y * self._scale) for x, y in vertices]
 
-        if shape_approximation == "circle":
-            pm_shapes = [pymunk.Circle(self._pm_body, self._radius)]
-
-        elif shape_approximation == "box":
+        if shape_approximation == "box":
             top = max(vert[0] for vert in vertices)
             bottom = min(vert[0] for vert in vertices)
             left = min(vert[1] for vert in vertices)
             right = max(vert[1] for vert in vertices)
 
-            box_vertices = ((top, left), (top, right), (bottom, right), (bottom, left))
-
-            pm_shapes = [pymunk.Poly(self._pm_body, box_vertices)]
+            box_vertices = [(top, left), (top, right), (bottom, right), (bottom, left)]
 
-        elif shape_approximation == "hull":
-            pm_shapes = [pymunk.Poly(self._pm_body, vertices)]
+            return [box_vertices]
 
-        elif shape_approximation == "decomposition":
+        if shape_approximation == "decomposition":
 
             if not pymunk.autogeometry.is_closed(vertices):
                 vertices += [vertices[0]]
@@ -233,23 +264,9 @@ class EmbodiedEntity(Entity, ABC):
             if pymunk.area_for_poly(vertices) < 0:
                 vertices = list(reversed(vertices))
 
-            list_vertices = pymunk.autogeometry.convex_decomposition(
-                vertices, tolerance=0.5
-            )
-
-            pm_shapes = []
-            for vertices in list_vertices:
-                pm_shape = pymunk.Poly(body=self._pm_body, vertices=vertices)
-                pm_shapes.append(pm_shape)
+            return pymunk.autogeometry.convex_decomposition(vertices, tolerance=0.5)
 
-        else:
-            pm_shapes = [pymunk.Poly(body=self._pm_body, vertices=vertices)]
-
-        for pm_shape in pm_shapes:
-            pm_shape.friction = FRICTION_ENTITY
-            pm_shape.elasticity = ELASTICITY_ENTITY
-
-        return pm_shapes
+        return [vertices]
 
     ##############
     # Sprites
@@ -276,31 +293,7 @@ class EmbodiedEntity(Entity, ABC):
         return sprite
 
     def color_with_id(self, texture) -> Texture:
-
-        img_uid = Image.new("RGBA", texture.size)
-        pixels = img_uid.load()
-        pixels_texture = texture.image.load()
-
-        for i in range(img_uid.size[0]):
-            for j in range(img_uid.size[1]):
-
-                if pixels_texture[i, j][3] == 0:
-                    pixels[i, j] = (0, 0, 0, 0)
-
-                elif pixels_texture[i, j][:3] != (0, 0, 0):  # type: ignore
-                    pixels[i, j] = self.color_uid  # type: ignore
-
-                else:
-                    pixels[i, j] = (0, 0, 0, 0)
-
-        texture = Texture(
-            name=str(self._uid),
-            image=img_uid,
-            hit_box_algorithm="Detailed",
-            hit_box_detail=1,
-        )
-
-        return texture
+        return get_uid_texture(texture, self._uid, self.color_uid)
 
     @property
     def needs_sprite_update(self):
@@ -392,6 +385,7 @@ class EmbodiedEntity(Entity, ABC):
             self._pm_body.space.reindex_shapes_for_body(self._pm_body)
 
         self._moved = True
+        self._playground.notify_moved(self)
 
     def _sample_valid_coordinate(self) -> Coordinate:
 
@@ -400,8 +394,17 @@ class EmbodiedEntity(Entity, ABC):
         sampler = self._initial_coordinates
         assert isinstance(sampler, CoordinateSampler)
 
-        for coordinate in sampler.sample():
-            if not self._playground.overlaps(self, coordinate):
+        # Candidates are tested in batches, with a single query of the space
+        samples = sampler.sample()
+
+        while True:
+
+            candidates = list(itertools.islice(samples, SAMPLES_PER_QUERY))
+            if not candidates:
+                break
+
+            coordinate = self._playground.first_free_coordinate(self, candidates)
+            if coordinate:
                 return coordinate
 
         raise ValueError("Entity could not be placed without overlapping")
@@ -113,7 +113,7 @@ class Spawner:
             self.total_produced += 1
             self.produced_entities.append(obj)
 
-            initial_position = self.location_sampler.sample()
+            initial_position = next(self.location_sampler.sample())
 
             return (obj, initial_position)
 
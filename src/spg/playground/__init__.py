@@ -2,5 +2,14 @@
 from .collision_handlers import get_colliding_entities
 from .playground import Playground
 from .room import ConnectedRooms, Room
+from .snapshot import Snapshot
+from .vec import VecPlayground
 
-__all__ = ["get_colliding_entities", "Playground", "Room", "ConnectedRooms"]
+__all__ = [
+    "get_colliding_entities",
+    "Playground",
+    "Room",
+    "ConnectedRooms",
+    "Snapshot",
+    "VecPlayground",
+]
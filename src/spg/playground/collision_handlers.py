@@ -1,20 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from ..agent.device import Device
 from ..agent.interactor import Grasper
 from ..agent.part import PhysicalPart
 from ..element import Disabler
+from ..utils.definitions import CollisionTypes
 
 if TYPE_CHECKING:
     from .playground import Playground
 
 
-def get_colliding_entities(playground: Playground, arbiter):
+def get_colliding_entities(
+    playground: Playground,
+    arbiter,
+    first_type: Optional[CollisionTypes] = None,
+):
 
-    entity_1 = playground.get_entity_from_shape(arbiter.shapes[0])
-    entity_2 = playground.get_entity_from_shape(arbiter.shapes[1])
+    shape_1, shape_2 = arbiter.shapes
+
+    # Copied spaces register their handlers with sorted collision types,
+    # so shapes are not always in the order of the interaction
+    if first_type is not None and shape_1.collision_type != first_type:
+        shape_1, shape_2 = shape_2, shape_1
+
+    entity_1 = playground.get_entity_from_shape(shape_1)
+    entity_2 = playground.get_entity_from_shape(shape_2)
 
     agent_1 = None
     agent_2 = None
@@ -34,7 +46,9 @@ def get_colliding_entities(playground: Playground, arbiter):
 def grasper_grasps_graspable(arbiter, _, data):
 
     playground: Playground = data["playground"]
-    (grasper, _), (entity, _) = get_colliding_entities(playground, arbiter)
+    (grasper, _), (entity, _) = get_colliding_entities(
+        playground, arbiter, CollisionTypes.GRASPER
+    )
 
     assert isinstance(grasper, Grasper)
 
@@ -47,7 +61,9 @@ def grasper_grasps_graspable(arbiter, _, data):
 def disabler_disables_device(arbiter, _, data):
 
     playground: Playground = data["playground"]
-    (disabler, _), (device, _) = get_colliding_entities(playground, arbiter)
+    (disabler, _), (device, _) = get_colliding_entities(
+        playground, arbiter, CollisionTypes.DISABLER
+    )
 
     assert isinstance(device, Device)
     assert isinstance(disabler, Disabler)
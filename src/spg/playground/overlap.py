@@ -0,0 +1,271 @@
+"""
+Overlap tests of entities at candidate coordinates, without changing the space.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+import pymunk
+
+from ..agent.part import PhysicalPart
+
+if TYPE_CHECKING:
+    from ..entity import EmbodiedEntity
+    from ..utils.position import Coordinate
+    from .playground import Playground
+
+
+# Candidates share a query if its area is at most this ratio of their own areas
+_MAX_QUERY_RATIO = 4
+
+
+class _Template(NamedTuple):
+    body: pymunk.Body
+    shapes: List[pymunk.Shape]
+    radius: float
+
+
+class OverlapTester:
+    """Tests whether entities would overlap with shapes of the space.
+
+    Entities are never added to the space.
+    Each entity has template shapes, copies of its shapes on a body
+    outside of the space, cached until the entity is forgotten.
+    Shapes close to candidate coordinates are found with bounding-box
+    queries, shared by candidates that are close to each other,
+    and overlaps are confirmed with pymunk shape-to-shape collisions.
+
+    Sensor shapes, shapes of the entity and shapes of other parts
+    of the same agent are not considered as overlapping.
+    """
+
+    def __init__(self, playground: Playground):
+        self._playground = playground
+        self._templates: Dict[EmbodiedEntity, _Template] = {}
+
+    def forget(self, entity: EmbodiedEntity):
+        """Drop the template shapes of an entity."""
+        self._templates.pop(entity, None)
+
+    def bounding_radius(self, entity: EmbodiedEntity) -> float:
+        """Radius of a circle around the entity center containing its shapes."""
+        return self._get_template(entity).radius
+
+    def overlaps(self, entity: EmbodiedEntity, coordinates: Coordinate) -> bool:
+        return bool(self.overlaps_many(entity, [coordinates])[0])
+
+    def overlaps_many(
+        self, entity: EmbodiedEntity, coordinates: Sequence[Coordinate]
+    ) -> np.ndarray:
+        """Whether entity would overlap, for each coordinate."""
+
+        overlapping = np.zeros(len(coordinates), dtype=bool)
+
+        for index, overlaps in self._test(entity, coordinates):
+            overlapping[index] = overlaps
+
+        return overlapping
+
+    def overlaps_entity(
+        self,
+        entity: EmbodiedEntity,
+        coordinates: Coordinate,
+        other: EmbodiedEntity,
+        other_coordinates: Coordinate,
+    ) -> bool:
+        """Whether two entities would overlap, none of them being in the space."""
+
+        template = self._posed_template(entity, coordinates)
+        other_template = self._posed_template(other, other_coordinates)
+
+        return any(
+            _filters_collide(shape.filter, other_shape.filter)
+            and shape.bb.intersects(other_shape.bb)
+            and shape.shapes_collide(other_shape).points
+            for shape in template.shapes
+            for other_shape in other_template.shapes
+        )
+
+    def first_free(
+        self, entity: EmbodiedEntity, coordinates: Sequence[Coordinate]
+    ) -> Optional[Coordinate]:
+        """First coordinate where entity would not overlap, if any."""
+
+        for index, overlaps in self._test(entity, coordinates):
+            if not overlaps:
+                return coordinates[index]
+
+        return None
+
+    def _test(self, entity: EmbodiedEntity, coordinates: Sequence[Coordinate]):
+        """Yields index and overlap of each coordinate, in order."""
+
+        if not coordinates:
+            return
+
+        template = self._get_template(entity)
+        excluded = self._excluded_shapes(entity)
+
+        for template_shape, pm_shape in zip(template.shapes, entity.pm_shapes):
+            template_shape.filter = pm_shape.filter
+
+        poses = np.array(
+            [(pos[0], pos[1], angle) for pos, angle in coordinates], dtype=np.float64
+        )
+        lows = poses[:, :2] - template.radius
+        highs = poses[:, :2] + template.radius
+
+        low, high = lows.min(axis=0), highs.max(axis=0)
+        query_area = np.prod(high - low)
+        poses_area = len(poses) * (2 * template.radius) ** 2
+
+        # Close candidates share a single query of the space.
+        # Scattered candidates are queried one by one,
+        # so that shapes far from all of them are not listed.
+        if query_area <= _MAX_QUERY_RATIO * poses_area:
+            pairs = self._query(template, excluded, pymunk.BB(*low, *high))
+            bbs = np.array(
+                [
+                    (bb.left, bb.bottom, bb.right, bb.top)
+                    for bb in (s.bb for _, s in pairs)
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 4)
+
+            close = (
+                (bbs[None, :, 0] <= highs[:, None, 0])
+                & (bbs[None, :, 2] >= lows[:, None, 0])
+                & (bbs[None, :, 1] <= highs[:, None, 1])
+                & (bbs[None, :, 3] >= lows[:, None, 1])
+            )
+
+            close_pairs = (
+                [pairs[i] for i in np.flatnonzero(close_to_pose).tolist()]
+                for close_to_pose in close
+            )
+
+        else:
+            close_pairs = (
+                self._query(template, excluded, pymunk.BB(*pose_low, *pose_high))
+                for pose_low, pose_high in zip(lows.tolist(), highs.tolist())
+            )
+
+        for index, (pose, pose_pairs) in enumerate(zip(poses.tolist(), close_pairs)):
+
+            if not pose_pairs:
+                yield index, False
+                continue
+
+            template.body.position = pose[0], pose[1]
+            template.body.angle = pose[2]
+            for template_shape in template.shapes:
+                template_shape.cache_bb()
+
+            yield index, any(
+                template_shape.bb.intersects(shape.bb)
+                and template_shape.shapes_collide(shape).points
+                for template_shape, shape in pose_pairs
+            )
+
+    def _query(
+        self, template: _Template, excluded: Set[pymunk.Shape], query_bb: pymunk.BB
+    ) -> List[Tuple[pymunk.Shape, pymunk.Shape]]:
+        """Pairs of template shapes and shapes of the space they can collide with."""
+
+        return [
+            (template_shape, shape)
+            for template_shape in template.shapes
+            for shape in self._playground.space.bb_query(
+                query_bb, template_shape.filter
+            )
+            if not shape.sensor and shape not in excluded
+        ]
+
+    def _posed_template(
+        self, entity: EmbodiedEntity, coordinates: Coordinate
+    ) -> _Template:
+
+        template = self._get_template(entity)
+
+        for template_shape, pm_shape in zip(template.shapes, entity.pm_shapes):
+            template_shape.filter = pm_shape.filter
+
+        (pos_x, pos_y), angle = coordinates
+        template.body.position = pos_x, pos_y
+        template.body.angle = angle
+        for template_shape in template.shapes:
+            template_shape.cache_bb()
+
+        return template
+
+    def _get_template(self, entity: EmbodiedEntity) -> _Template:
+
+        if entity not in self._templates:
+
+            body = pymunk.Body(body_type=pymunk.Body.STATIC)
+            shapes = [_copy_shape(shape, body) for shape in entity.pm_shapes]
+            radius = max((_bounding_radius(shape) for shape in shapes), default=0)
+
+            self._templates[entity] = _Template(body, shapes, radius)
+
+        return self._templates[entity]
+
+    @staticmethod
+    def _excluded_shapes(entity: EmbodiedEntity) -> Set[pymunk.Shape]:
+
+        excluded = set(entity.pm_shapes)
+
+        if isinstance(entity, PhysicalPart) and entity.agent:
+            for part in entity.agent.parts:
+                excluded.update(part.pm_shapes)
+
+        return excluded
+
+
+def _filters_collide(filter_a: pymunk.ShapeFilter, filter_b: pymunk.ShapeFilter):
+    """Whether shapes with these filters can collide, as decided by pymunk."""
+
+    if filter_a.group and filter_a.group == filter_b.group:
+        return False
+
+    return bool(
+        filter_a.categories & filter_b.mask and filter_b.categories & filter_a.mask
+    )
+
+
+def _copy_shape(shape: pymunk.Shape, body: pymunk.Body) -> pymunk.Shape:
+
+    if isinstance(shape, pymunk.Circle):
+        return pymunk.Circle(body, shape.radius, shape.offset)
+
+    if isinstance(shape, pymunk.Poly):
+        return pymunk.Poly(body, shape.get_vertices(), radius=shape.radius)
+
+    if isinstance(shape, pymunk.Segment):
+        return pymunk.Segment(body, shape.a, shape.b, shape.radius)
+
+    raise ValueError(f"Shape {shape} is not supported")
+
+
+def _bounding_radius(shape: pymunk.Shape) -> float:
+    """Radius of a circle around the body center containing the shape."""
+
+    if isinstance(shape, pymunk.Circle):
+        return shape.offset.length + shape.radius
+
+    if isinstance(shape, pymunk.Poly):
+        return max(vert.length for vert in shape.get_vertices()) + shape.radius
+
+    assert isinstance(shape, pymunk.Segment)
+    return max(shape.a.length, shape.b.length) + shape.radius
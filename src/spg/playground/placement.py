@@ -0,0 +1,210 @@
+"""
+Placement of many entities at once, without overlapping.
+
+Placements are planned before any entity is added to the space.
+Candidates are tested against shapes already in the space
+with an overlap tester, and against entities already planned
+with an occupancy grid of the bounding circles of their parts.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import pymunk
+
+from ..agent import Agent
+from ..agent.part import AnchoredPart, PhysicalPart
+from ..entity import EmbodiedEntity
+from ..entity.embodied import SAMPLES_PER_QUERY
+from ..utils.position import Coordinate, CoordinateSampler
+
+if TYPE_CHECKING:
+    from ..element import SceneElement
+    from .overlap import OverlapTester
+
+PlacedEntity = Union["SceneElement", Agent]
+
+
+class _RelativePart(NamedTuple):
+    """Embodied part of an entity, with its coordinates relative to the entity."""
+
+    part: EmbodiedEntity
+    position: pymunk.Vec2d
+    angle: float
+    radius: float
+
+
+class _PlacedPart(NamedTuple):
+    part: EmbodiedEntity
+    coordinates: Coordinate
+    radius: float
+
+
+class OccupancyGrid:
+    """Planned parts, hashed on a uniform grid by their bounding circle.
+
+    Cells are as large as the largest diameter, so that parts
+    whose bounding circles intersect are in neighboring cells.
+    Parts with intersecting bounding circles are then tested exactly.
+    """
+
+    def __init__(self, tester: OverlapTester, max_radius: float):
+        self._tester = tester
+        self._cell_size = max(2 * max_radius, 1)
+        self._cells: Dict[Tuple[int, int], List[_PlacedPart]] = {}
+
+    def _cell(self, position) -> Tuple[int, int]:
+        return (
+            math.floor(position[0] / self._cell_size),
+            math.floor(position[1] / self._cell_size),
+        )
+
+    def overlaps(self, placed: _PlacedPart) -> bool:
+
+        (x, y), _ = placed.coordinates
+        cell_x, cell_y = self._cell((x, y))
+
+        for d_x, d_y in itertools.product((-1, 0, 1), repeat=2):
+            for other in self._cells.get((cell_x + d_x, cell_y + d_y), ()):
+
+                (other_x, other_y), _ = other.coordinates
+                dist = placed.radius + other.radius
+
+                if (x - other_x) ** 2 + (
+                    y - other_y
+                ) ** 2 < dist**2 and self._tester.overlaps_entity(
+                    placed.part, placed.coordinates, other.part, other.coordinates
+                ):
+                    return True
+
+        return False
+
+    def add(self, placed: _PlacedPart):
+        self._cells.setdefault(self._cell(placed.coordinates[0]), []).append(placed)
+
+
+def plan_placements(
+    tester: OverlapTester,
+    entities: Sequence[PlacedEntity],
+    sampler: CoordinateSampler,
+    allow_overlapping: bool = False,
+) -> List[Coordinate]:
+    """Coordinates of entities drawn from sampler, so that they do not overlap.
+
+    Entities are placed in order, each at the first valid coordinate drawn.
+    Raises ValueError if the sampler runs out of candidates for an entity.
+    """
+
+    if allow_overlapping:
+        return [next(sampler.sample()) for _ in entities]
+
+    all_parts = [_relative_parts(tester, entity) for entity in entities]
+    max_radius = max((part.radius for parts in all_parts for part in parts), default=0)
+
+    grid = OccupancyGrid(tester, max_radius)
+    coordinates = []
+
+    for parts in all_parts:
+
+        coordinate = _first_free(tester, grid, parts, sampler)
+        coordinates.append(coordinate)
+
+        for placed in _place(parts, coordinate):
+            grid.add(placed)
+
+    return coordinates
+
+
+def _first_free(
+    tester: OverlapTester,
+    grid: OccupancyGrid,
+    parts: List[_RelativePart],
+    sampler: CoordinateSampler,
+) -> Coordinate:
+
+    samples = sampler.sample()
+
+    while True:
+
+        candidates = list(itertools.islice(samples, SAMPLES_PER_QUERY))
+        if not candidates:
+            break
+
+        # Planned entities are not in the space, only in the grid
+        placements = [(coord, _place(parts, coord)) for coord in candidates]
+        placements = [
+            (coord, placed)
+            for coord, placed in placements
+            if not any(grid.overlaps(placed_part) for placed_part in placed)
+        ]
+        candidates = [coord for coord, _ in placements]
+
+        overlapping = np.zeros(len(candidates), dtype=bool)
+
+        for index, part in enumerate(parts):
+            part_coordinates = [placed[index].coordinates for _, placed in placements]
+            overlapping |= tester.overlaps_many(part.part, part_coordinates)
+
+        free = np.flatnonzero(~overlapping)
+        if len(free):
+            return candidates[free[0]]
+
+    raise ValueError("Entity could not be placed without overlapping")
+
+
+def _place(parts: List[_RelativePart], coordinate: Coordinate) -> List[_PlacedPart]:
+    """Parts of an entity placed at coordinate."""
+
+    pos, ang = coordinate
+    pos = pymunk.Vec2d(*pos)
+
+    return [
+        _PlacedPart(
+            part.part,
+            (pos + part.position.rotated(ang), ang + part.angle),
+            part.radius,
+        )
+        for part in parts
+    ]
+
+
+def _relative_parts(tester: OverlapTester, entity: PlacedEntity) -> List[_RelativePart]:
+    """Embodied parts of an entity, with their coordinates relative to it.
+
+    Parts of agents are posed as when added, following their anchors.
+    """
+
+    if not isinstance(entity, Agent):
+        assert isinstance(entity, EmbodiedEntity)
+        return [
+            _RelativePart(entity, pymunk.Vec2d(0, 0), 0, tester.bounding_radius(entity))
+        ]
+
+    parts: List[_RelativePart] = []
+
+    def add_part(part: PhysicalPart, position: pymunk.Vec2d, angle: float):
+
+        parts.append(_RelativePart(part, position, angle, tester.bounding_radius(part)))
+
+        for anchored in part.anchored:
+            assert isinstance(anchored, AnchoredPart)
+
+            pos_anchor = pymunk.Vec2d(*anchored.anchor_coordinates[0])
+            pos_pivot = pymunk.Vec2d(*anchored.pivot_position)
+            angle_offset = anchored.anchor_coordinates[1]
+
+            add_part(
+                anchored,
+                position
+                + pos_anchor.rotated(angle)
+                - pos_pivot.rotated(angle + angle_offset),
+                angle + angle_offset,
+            )
+
+    add_part(entity.base, pymunk.Vec2d(0, 0), 0)
+
+    return parts
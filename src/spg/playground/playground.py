@@ -13,8 +13,10 @@ Examples can be found in :
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple, Type, Union
+import copy
+from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
 
+import arcade
 import matplotlib.pyplot as plt
 import numpy as np
 import pymunk
@@ -24,10 +26,27 @@ from arcade import Window
 from spg.element.element import PhysicalElement, SceneElement
 
 from ..agent import Agent
-from ..agent.communicator import Communicator, Message
-from ..agent.controller import Command, Controller
+from ..agent.communicator import (
+    CommunicationIndex,
+    Communicator,
+    Message,
+    deliver_messages,
+)
+from ..agent.controller import (
+    Command,
+    CommandSpace,
+    Controller,
+    DiscreteController,
+)
 from ..agent.part import AnchoredPart, PhysicalPart
-from ..agent.sensor import RayCompute, RaySensor, Sensor, SensorValue
+from ..agent.sensor import (
+    ObservationBuffer,
+    ObservationLayout,
+    RayCompute,
+    RaySensor,
+    Sensor,
+    SensorValue,
+)
 from ..entity import EmbodiedEntity, Entity, InteractiveAnchored
 from ..utils.definitions import (
     PYMUNK_STEPS,
@@ -35,8 +54,13 @@ from ..utils.definitions import (
     CollisionTypes,
     PymunkCollisionCategories,
 )
-from ..utils.position import Coordinate
+from ..utils.position import Coordinate, CoordinateSampler
+from ..utils.sequence import ReadOnlyList
+from ..utils.uid import UidAllocator
 from .collision_handlers import disabler_disables_device, grasper_grasps_graspable
+from .overlap import OverlapTester
+from .placement import plan_placements
+from .snapshot import Snapshot, SnapshotEntities, get_body_states, set_body_states
 
 # pylint: disable=unused-argument
 # pylint: disable=line-too-long
@@ -82,10 +106,13 @@ class Playground:
             Union[Tuple[int, int, int], List[int], Tuple[int, int, int, int]]
         ] = None,
         use_shaders=True,
+        ray_backend: Optional[str] = None,
     ):
 
         # Random number generator for replication, rewind, etc.
-        self._rng = np.random.default_rng(seed)
+        # Its seed sequence spawns the streams of clones.
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seed_sequence)
 
         # By default, size is infinite and center is at (0,0)
         self._center = (0, 0)
@@ -112,6 +139,31 @@ class Playground:
         self._agents: List[Agent] = []
         self._teams = {}
 
+        # Cached agents and elements that are not removed
+        self._active_agents: Optional[ReadOnlyList[Agent]] = None
+        self._active_elements: Optional[ReadOnlyList[SceneElement]] = None
+
+        # Communicators in range of each other, updated when agents move
+        self._communication_index = CommunicationIndex(self)
+
+        # Command space of the agents, computed when needed
+        self._command_space: Optional[CommandSpace] = None
+
+        # Template shapes of entities, to test overlaps without changing the space
+        self._overlap_tester = OverlapTester(self)
+
+        # Entities captured by snapshots, computed when needed
+        self._snapshot_entities: Optional[SnapshotEntities] = None
+
+        # State captured at reset, restored by the next resets,
+        # and entities placed again with their sampler at each reset
+        self._baseline: Optional[Snapshot] = None
+        self._resampled: List[Union[SceneElement, Agent]] = []
+
+        # Flat block of memory where sensors write observations, if any
+        self._observation_buffer: Optional[ObservationBuffer] = None
+        self._bound_sensors: List[Sensor] = []
+
         # Private attributes for managing interactions in playground
         self._done: bool = False
         self._timestep: int = 0
@@ -119,17 +171,29 @@ class Playground:
         # Mappings
         self._shapes_to_entities: Dict[pymunk.Shape, EmbodiedEntity] = {}
         self._name_to_agents: Dict[str, Agent] = {}
+        self._name_to_entities: Dict[str, Union[SceneElement, Agent]] = {}
         self._uids_to_entities: Dict[int, Entity] = {}
 
+        # Uid 0 means no entity, and background color must not be a uid
+        background_uid = (
+            self._background[0]
+            + self._background[1] * 256
+            + self._background[2] * 256 * 256
+        )
+        self._uid_allocator = UidAllocator(self._rng, reserved=(0, background_uid))
+
         self._handle_interactions()
         self._views = []
 
-        # Arcade window necessary to create contexts, views, sensors and gui
-        self._window = Window(1, 1, visible=False, antialiasing=True)  # type: ignore
-        self._window.ctx.blend_func = self._window.ctx.ONE, self._window.ctx.ZERO
+        # Arcade window necessary to create contexts, views, sensors and gui.
+        # Created on first use, so that playgrounds without rendering run headless.
+        self._window: Optional[Window] = None
 
         self._ray_compute = None
-        self._use_shaders = use_shaders
+
+        if not ray_backend:
+            ray_backend = "shader" if use_shaders else "cpu"
+        self._ray_backend = ray_backend
 
     def debug_draw(self, plt_width=10, center=None, size=None):
 
@@ -163,15 +227,34 @@ class Playground:
 
     @property
     def window(self):
+
+        if not self._window:
+            window = Window(1, 1, visible=False, antialiasing=True)  # type: ignore
+            window.ctx.blend_func = window.ctx.ONE, window.ctx.ZERO
+            self._window = window
+
+        self._activate_window()
+
         return self._window
 
+    def _activate_window(self):
+        """Make the OpenGL context of the playground current.
+
+        Each playground has its own context, and several playgrounds
+        can be used alternately in the same process.
+        """
+
+        if self._window and arcade.get_window() is not self._window:
+            self._window.switch_to()
+            arcade.set_window(self._window)
+
     @property
     def ray_compute(self):
 
         if not self._ray_compute:
             assert self._size
             self._ray_compute = RayCompute(
-                self, self._size, self._center, zoom=1, use_shader=self._use_shaders
+                self, self._size, self._center, zoom=1, backend=self._ray_backend
             )
 
         return self._ray_compute
@@ -231,25 +314,19 @@ class Playground:
 
     def _get_identifier(self, entity: Entity):
 
-        uid = None
-        background = (
-            self._background[0]
-            + self._background[1] * 256
-            + self._background[2] * 256 * 256
-        )
+        is_named = isinstance(entity, (SceneElement, Agent))
 
-        while True:
-            a = self._rng.integers(0, 2**24)
+        if is_named and entity.name in self._name_to_entities:
+            raise ValueError("Entity with this name already in Playground")
 
-            if a not in self._uids_to_entities and a != background:
-                uid = a
-                break
+        uid = self._uid_allocator.allocate()
 
         name = entity.name
         if not name:
             name = type(entity).__name__ + "_" + str(uid)
 
-        if name in [ent.name for ent in self.elements]:
+        if is_named and name in self._name_to_entities:
+            self._uid_allocator.release(uid)
             raise ValueError("Entity with this name already in Playground")
 
         return uid, name
@@ -258,13 +335,40 @@ class Playground:
 
         return self._uids_to_entities[uid]
 
+    def get_entity_from_name(self, name):
+
+        return self._name_to_entities[name]
+
     @property
-    def agents(self):
-        return [agent for agent in self._agents if not agent.removed]
+    def agents(self) -> ReadOnlyList[Agent]:
+        """Agents currently in the playground, rebuilt only after add or remove."""
+        if self._active_agents is None:
+            self._active_agents = ReadOnlyList(
+                agent for agent in self._agents if not agent.removed
+            )
+        return self._active_agents
 
     @property
-    def elements(self):
-        return [elem for elem in self._elements if not elem.removed]
+    def elements(self) -> ReadOnlyList[SceneElement]:
+        """Elements currently in the playground, rebuilt only after add or remove."""
+        if self._active_elements is None:
+            self._active_elements = ReadOnlyList(
+                elem for elem in self._elements if not elem.removed
+            )
+        return self._active_elements
+
+    def _update_active_entities(self, entity):
+
+        if self._ray_compute:
+            self._ray_compute.outdate_shapes()
+
+        if isinstance(entity, Agent):
+            self._active_agents = None
+            self._command_space = None
+            self._communication_index.outdate()
+
+        elif isinstance(entity, SceneElement):
+            self._active_elements = None
 
     ###########
     # TEAMS
@@ -293,7 +397,7 @@ class Playground:
 
     def step(
         self,
-        commands: Optional[CommandsDict] = None,
+        commands: Optional[Union[CommandsDict, np.ndarray]] = None,
         messages: Optional[SentMessagesDict] = None,
         pymunk_steps: int = PYMUNK_STEPS,
     ):
@@ -303,6 +407,10 @@ class Playground:
         Time moves by one unit of time.
 
         Args:
+            commands: Commands of agents, either as dicts of controller names
+                to values, or as a single array of shape (n_agents, n_controls),
+                following the order of agents and of their controllers.
+                See command_space.
             pymunk_steps: Number of steps for the pymunk physics engine to run.
 
         Notes:
@@ -317,6 +425,7 @@ class Playground:
 
         obs, mess, rew = None, None, None
 
+        self._activate_window()
         self._pre_step()
 
         if not self._done:
@@ -326,6 +435,8 @@ class Playground:
             for _ in range(pymunk_steps):
                 self.space.step(1.0 / pymunk_steps)
 
+            self._communication_index.outdate()
+
             self._post_step()
             self._done = self._has_terminated()
 
@@ -356,11 +467,15 @@ class Playground:
 
     def _apply_commands(self, commands):
 
-        if not commands:
+        if isinstance(commands, np.ndarray):
+            self.command_space.apply(self.agents, commands)
+
+        elif not commands:
             return
 
-        for agent, command_dict in commands.items():
-            agent.receive_commands(command_dict)
+        else:
+            for agent, command_dict in commands.items():
+                agent.receive_commands(command_dict)
 
         for agent in self._agents:
             agent.apply_commands()
@@ -369,46 +484,43 @@ class Playground:
 
         msgs = {agent: {} for agent in self.agents}
 
-        all_sent_messages = [
-            (agent, comm_source, target)
-            for agent, comms_dict in messages.items()
-            for comm_source, target in comms_dict.items()
-        ]
+        # Messages sent, and communicators they are sent to, in order of sending
+        senders, sent_msgs, receivers = [], [], []
 
-        for agent, comm_source, target in all_sent_messages:
+        for agent, comms_dict in messages.items():
+            for comm_source, target in comms_dict.items():
 
-            assert comm_source.agent is agent
+                assert comm_source.agent is agent
 
-            comm_target, message = target
-            msg = comm_source.send(message)
+                comm_target, message = target
+                msg = comm_source.send(message)
 
-            if not msg:
-                continue
+                if not msg:
+                    continue
 
-            if isinstance(comm_target, list):
+                if isinstance(comm_target, list):
+                    for targ in comm_target:
+                        assert isinstance(targ, Communicator)
+                    targets = comm_target
 
-                for targ in comm_target:
-                    assert isinstance(targ, Communicator)
-                    received_msg = targ.receive(comm_source, msg)
+                elif isinstance(comm_target, Communicator):
+                    targets = [comm_target]
 
-                    if received_msg:
-                        msgs[targ.agent][targ] = (comm_source, received_msg)
+                elif comm_target is None:
+                    targets = self._communication_index.in_range(comm_source)
 
-            elif isinstance(comm_target, Communicator):
-                received_msg = comm_target.receive(comm_source, msg)
+                else:
+                    raise ValueError
 
-                if received_msg:
-                    msgs[comm_target.agent][comm_target] = (comm_source, received_msg)
+                senders += [comm_source] * len(targets)
+                sent_msgs += [msg] * len(targets)
+                receivers += targets
 
-            elif comm_target is None:
-                for agent in self.agents:
-                    for comm in agent.communicators:
-                        received_msg = comm.receive(comm_source, msg)
-                        if received_msg:
-                            msgs[comm.agent][comm] = (comm_source, received_msg)
+        received_msgs = deliver_messages(senders, sent_msgs, receivers)
 
-            else:
-                raise ValueError
+        for comm_source, comm, received_msg in zip(senders, receivers, received_msgs):
+            if received_msg:
+                msgs[comm.agent][comm] = (comm_source, received_msg)
 
         return msgs
 
@@ -429,7 +541,40 @@ class Playground:
     def reset(self):
         """
         Reset the Playground to its initial state.
+
+        The state of the playground after the first reset is kept as a baseline.
+        Next resets restore it in bulk, and only place again the entities
+        whose initial coordinates are a CoordinateSampler.
+        The baseline is captured again after entities are added
+        or removed definitively, or devices are attached to agents.
         """
+        self._activate_window()
+
+        full_reset = self._baseline is None
+
+        if full_reset:
+            self._reset_entities()
+            self._capture_baseline()
+        else:
+            self._reset_from_baseline()
+
+        # After a restore, views only update the sprites of bodies that moved,
+        # and the view of ray sensors is updated with the observations
+        for view in self._views:
+            if full_reset or not (
+                self._ray_compute and self._ray_compute.updates_view(view)
+            ):
+                view.update(force=full_reset)
+
+        self._timestep = 0
+        self._done = False
+
+        obs = self._compute_observations()
+
+        return obs, None, None, self._done
+
+    def _reset_entities(self):
+
         # reset elements that are still in playground
         for element in self._elements:
 
@@ -463,15 +608,251 @@ class Playground:
                     move_anchors=True,
                 )
 
-        for view in self._views:
-            view.update(force=True)
+    def _capture_baseline(self):
 
-        self._timestep = 0
-        self._done = False
+        self._baseline = self.snapshot()
 
-        obs = self._compute_observations()
+        self._resampled = [
+            entity
+            for entity in self._elements + self._agents  # type: ignore
+            if isinstance(entity.initial_coordinates, CoordinateSampler)
+            and (
+                isinstance(entity, Agent)
+                or isinstance(entity, PhysicalElement)
+                and entity.movable
+            )
+        ]
 
-        return obs, None, None, self._done
+    def _reset_from_baseline(self):
+
+        assert self._baseline is not None
+
+        # Temporary entities are not in the baseline, and are removed definitively
+        self._restore_state(self._baseline)
+
+        for element in self._elements:
+            element.reset()
+
+        for agent in self._agents:
+            agent.reset()
+
+        for entity in self._resampled:
+            if isinstance(entity, Agent):
+                entity.base.move_to(
+                    entity.initial_coordinates,
+                    allow_overlapping=entity.allow_overlapping,
+                    move_anchors=True,
+                )
+            else:
+                entity.move_to(entity.initial_coordinates, entity.allow_overlapping)
+
+    ###############
+    # SNAPSHOTS
+    ###############
+
+    def snapshot(self) -> Snapshot:
+        """Capture the mutable state of the playground.
+
+        The snapshot holds the state of bodies, grasps, removed flags,
+        rewards, commands, random generator and timestep in numpy arrays,
+        and references to the entities of the playground.
+        Entities themselves are not copied.
+        """
+
+        if self._snapshot_entities is None:
+            self._snapshot_entities = SnapshotEntities.from_entities(
+                self._elements + self._agents,  # type: ignore
+                list(self._uids_to_entities.values()),
+            )
+
+        entities = self._snapshot_entities
+
+        return Snapshot(
+            entities=entities,
+            timestep=self._timestep,
+            done=self._done,
+            rng_state=self._rng.bit_generator.state,
+            removed=np.array([ent.removed for ent in entities.scene], dtype=bool),
+            bodies=get_body_states(entities.bodies),
+            rewards=np.array([agent.reward for agent in entities.agents]),
+            commands=np.array(
+                [contr.command for contr in entities.controllers], dtype=np.float64
+            ),
+            disabled=np.array(
+                [contr.currently_disabled for contr in entities.controllers],
+                dtype=bool,
+            ),
+            grasps=tuple(grasper.grasp_state for grasper in entities.graspers),
+        )
+
+    def restore(self, snapshot: Snapshot):
+        """Restore the mutable state of the playground from a snapshot.
+
+        Entities added since the snapshot are removed definitively,
+        and entities removed definitively are added back.
+        Observations are computed again at the next step.
+
+        Notes:
+            Contacts cached by pymunk are not part of the snapshot,
+            so steps after a restore may differ slightly when bodies collide.
+            Timers are not part of the snapshot either.
+        """
+
+        self._activate_window()
+        self._restore_state(snapshot)
+
+        self._rng.bit_generator.state = snapshot.rng_state
+        self._timestep = snapshot.timestep
+        self._done = snapshot.done
+
+    def _restore_state(self, snapshot: Snapshot):
+        """Restore the entities of a snapshot and their state."""
+
+        entities = snapshot.entities
+
+        if entities is not self._snapshot_entities:
+            self._restore_entities(entities)
+
+        for entity, removed in zip(entities.scene, snapshot.removed.tolist()):
+            if removed and not entity.removed:
+                self.remove(entity)
+            elif entity.removed and not removed:
+                self._add_restored(entity, definitive=False)
+
+        moved = set_body_states(entities.bodies, snapshot.bodies)
+
+        for agent, reward in zip(entities.agents, snapshot.rewards.tolist()):
+            agent.reward = reward
+
+        for contr, command, disabled, is_discrete in zip(
+            entities.controllers,
+            snapshot.commands.tolist(),
+            snapshot.disabled.tolist(),
+            (isinstance(contr, DiscreteController) for contr in entities.controllers),
+        ):
+            contr.currently_disabled = disabled
+            contr.set_valid_command(int(command) if is_discrete else command)
+
+        for grasper, grasp_state in zip(entities.graspers, snapshot.grasps):
+            grasper.restore_grasp_state(grasp_state)
+
+        self._communication_index.outdate()
+
+        for entity in moved:
+            self.notify_moved(entity)
+
+    def _restore_entities(self, entities: SnapshotEntities):
+        """Add and remove scene entities to match the ones of a snapshot."""
+
+        in_snapshot = set(entities.scene)
+
+        for entity in self._elements + self._agents:  # type: ignore
+            if entity not in in_snapshot:
+                self.remove(entity, definitive=True)
+
+        for entity in entities.scene:
+            if entity.playground is not self:
+                self._add_restored(entity, definitive=True)
+
+    def _add_restored(self, entity, definitive: bool):
+        """Add back an entity removed since a snapshot, without placing it.
+
+        Bodies keep their pose until the states of the snapshot are set,
+        and entities removed definitively get their uid back.
+        """
+
+        entity.playground = self
+        entity.removed = False
+
+        if isinstance(entity, InteractiveAnchored):
+            self._space.add(*entity.pm_shapes)
+
+        elif not isinstance(entity, Agent):
+            self._space.add(*entity.pm_elements)
+
+            if isinstance(entity, AnchoredPart):
+                self._space.add(*entity.pm_joints)
+
+        if definitive:
+            self._add_to_mappings(entity, restored=True)
+
+        self._update_active_entities(entity)
+        self._add_to_views(entity)
+
+        if isinstance(entity, Agent):
+            self._add_restored(entity.base, definitive)
+
+        if isinstance(entity, PhysicalPart):
+            for part in entity.anchored:
+                self._add_restored(part, definitive)
+
+            for device in entity.devices:
+                self._add_restored(device, definitive)
+
+        elif isinstance(entity, PhysicalElement):
+            for interactive in entity.interactives:
+                self._add_restored(interactive, definitive)
+
+        self._update_teams(entity)
+
+    ###############
+    # CLONES
+    ###############
+
+    def clone(self, seed: Optional[int] = None) -> Playground:
+        """Copy of the playground in its current state, for independent rollouts.
+
+        Entities and the pymunk space are copied with their current state,
+        while textures and hit boxes of entities are shared.
+        The copy has no views, and its own window, created on first use.
+
+        Args:
+            seed: Seed of the random generator of the copy.
+                If None, an independent stream is spawned from the generator
+                of the playground.
+        """
+
+        if seed is None:
+            return self._clone(self._seed_sequence.spawn(1)[0])
+
+        return self._clone(np.random.SeedSequence(seed))
+
+    def fork(self, n_copies: int) -> List[Playground]:
+        """Copies of the playground, with independent random streams."""
+        return [self._clone(seq) for seq in self._seed_sequence.spawn(n_copies)]
+
+    def _clone(self, seed_sequence: np.random.SeedSequence) -> Playground:
+
+        # Objects replaced in the copy, and objects shared with it
+        memo: Dict[int, object] = {
+            id(self._seed_sequence): seed_sequence,
+            id(self._rng): np.random.default_rng(seed_sequence),
+            id(self._window): None,
+            id(self._ray_compute): None,
+            id(self._views): [],
+            id(self._observation_buffer): None,
+            id(self._bound_sensors): [],
+        }
+
+        for entity in self._uids_to_entities.values():
+            if isinstance(entity, EmbodiedEntity):
+                memo[id(entity.base_sprite)] = entity.base_sprite
+
+        playground = copy.deepcopy(self, memo)
+
+        # Copied collision handlers lose their data, which refers to the playground
+        playground._handle_interactions()
+
+        for sensor in self._bound_sensors:
+            memo[id(sensor)].slot = None
+
+        if self._ray_compute:
+            for agent in playground._agents:
+                for sensor in agent.sensors:
+                    if isinstance(sensor, RaySensor):
+                        playground.ray_compute.add(sensor)
+
+        return playground
 
     # ADD REMOVE ENTITIES
 
@@ -531,9 +912,34 @@ class Playground:
 
         self._update_teams(entity)
 
+    def add_many(
+        self,
+        entities: Sequence[Union[SceneElement, Agent]],
+        sampler: CoordinateSampler,
+        allow_overlapping: bool = False,
+    ):
+        """Add entities at coordinates drawn from the same sampler.
+
+        All placements are planned before any entity is added to the space:
+        candidates are tested against the entities already in the playground,
+        and against those planned before them with an occupancy grid.
+        As with add, entities are placed again with the sampler when reset.
+        """
+
+        coordinates = plan_placements(
+            self._overlap_tester, entities, sampler, allow_overlapping
+        )
+
+        for entity, coordinate in zip(entities, coordinates):
+            self.add(entity, coordinate, allow_overlapping=True)
+
+            entity.initial_coordinates = sampler
+            entity.allow_overlapping = allow_overlapping
+
     def _add_to_space(self, entity, initial_coordinates, allow_overlapping):
 
         entity.removed = False
+        self._update_active_entities(entity)
 
         if isinstance(entity, InteractiveAnchored):
             self._space.add(*entity.pm_shapes)
@@ -569,28 +975,46 @@ class Playground:
             entity.attach_to_anchor()
             self._space.add(*entity.pm_joints)
 
-    def _add_to_mappings(self, entity):
+    def _add_to_mappings(self, entity, restored=False):
 
-        entity.uid, entity.name = self._get_identifier(entity)
+        if restored:
+            self._uid_allocator.reclaim(entity.uid)
+        else:
+            entity.uid, entity.name = self._get_identifier(entity)
 
         self._uids_to_entities[entity.uid] = entity
+        self._snapshot_entities = None
+        self._outdate_baseline(entity)
 
         if isinstance(entity, Agent):
             self._agents.append(entity)
             self._name_to_agents[entity.name] = entity
+            self._name_to_entities[entity.name] = entity
+            self.detach_observation_buffer()
 
         elif isinstance(entity, SceneElement):
             self._elements.append(entity)
+            self._name_to_entities[entity.name] = entity
+
+        self._update_active_entities(entity)
 
         if isinstance(entity, EmbodiedEntity):
             for pm_shape in entity.pm_shapes:
                 self._shapes_to_entities[pm_shape] = entity
 
+    def _outdate_baseline(self, entity):
+
+        # Temporary entities are not restored at reset, and do not change the baseline
+        if isinstance(entity, (SceneElement, Agent)) and not entity.temporary:
+            self._baseline = None
+
     def _add_to_views(self, entity):
 
         if isinstance(entity, Agent):
             return
 
+        self._activate_window()
+
         for view in self._views:
             view.add(entity)
 
@@ -637,6 +1061,7 @@ class Playground:
                 grasper.release(entity)
 
         entity.removed = True
+        self._update_active_entities(entity)
 
     def _remove_from_space(self, entity):
 
@@ -653,15 +1078,24 @@ class Playground:
         assert entity.uid
 
         self._uids_to_entities.pop(entity.uid)
+        self._snapshot_entities = None
+        self._outdate_baseline(entity)
+        self._overlap_tester.forget(entity)
+        self._uid_allocator.release(entity.uid)
 
         if isinstance(entity, Agent):
             self._agents.remove(entity)
 
             assert entity.name
             self._name_to_agents.pop(entity.name)
+            self._name_to_entities.pop(entity.name)
+            self.detach_observation_buffer()
 
         elif isinstance(entity, SceneElement):
             self._elements.remove(entity)
+            self._name_to_entities.pop(entity.name)
+
+        self._update_active_entities(entity)
 
         if not isinstance(entity, Agent):
             for pm_shape in entity.pm_shapes:
@@ -673,9 +1107,18 @@ class Playground:
 
         if isinstance(entity, Agent):
             return
+
+        self._activate_window()
         for view in self._views:
             view.remove(entity)
 
+    def notify_moved(self, entity: EmbodiedEntity):
+        """Called when an entity is moved outside of the physical simulation."""
+        self._communication_index.outdate()
+
+        for view in self._views:
+            view.mark_moved(entity)
+
     def add_view(self, view):
 
         for entity in self.elements:
@@ -723,50 +1166,111 @@ class Playground:
 
         return True
 
-    def overlaps(self, entity: EmbodiedEntity, coordinates):
+    def overlaps(self, entity: EmbodiedEntity, coordinates: Coordinate) -> bool:
         """Tests whether new coordinate would lead to physical collision"""
+        return self._overlap_tester.overlaps(entity, coordinates)
 
-        dummy_body = pymunk.Body(body_type=pymunk.Body.STATIC)
-        dummy_shapes = []
-        for pm_shape in entity.pm_shapes:
-            dummy_shape = pm_shape.copy()
-            dummy_shape.body = dummy_body
-            dummy_shape.sensor = True
-            dummy_shapes.append(dummy_shape)
-
-        self.space.add(dummy_body, *dummy_shapes)
-
-        dummy_body.position, dummy_body.angle = coordinates
-        self.space.reindex_static()
-
-        overlaps = []
-        for dummy_shape in dummy_shapes:
-            overlaps += self.space.shape_query(dummy_shape)
-        self.space.remove(dummy_body, *dummy_shapes)
-
-        # remove sensor shapes
-        overlaps = [
-            elem
-            for elem in overlaps
-            if elem.shape
-            and not elem.shape.sensor
-            and elem.shape not in entity.pm_shapes
+    def overlaps_many(
+        self, entity: EmbodiedEntity, coordinates: Sequence[Coordinate]
+    ) -> np.ndarray:
+        """Tests whether each coordinate would lead to physical collision."""
+        return self._overlap_tester.overlaps_many(entity, coordinates)
+
+    def first_free_coordinate(
+        self, entity: EmbodiedEntity, coordinates: Sequence[Coordinate]
+    ) -> Optional[Coordinate]:
+        """First coordinate that would not lead to physical collision, if any."""
+        return self._overlap_tester.first_free(entity, coordinates)
+
+    @property
+    def communication_index(self):
+        return self._communication_index
+
+    def notify_devices_changed(self):
+        """Called when devices are attached to an agent in the playground."""
+        self._command_space = None
+        self._snapshot_entities = None
+        self._baseline = None
+        self._communication_index.outdate()
+        self.detach_observation_buffer()
+
+    @property
+    def command_space(self) -> CommandSpace:
+        """Bounds and valid values of the controllers of agents."""
+
+        if self._command_space is None:
+            self._command_space = CommandSpace(self.agents)
+
+        return self._command_space
+
+    ###############
+    # Observations
+    ###############
+
+    @property
+    def observation_layout(self) -> ObservationLayout:
+        """Slots of the sensors of all agents, in a flat block of memory."""
+        return ObservationLayout.from_agents(self._agents)
+
+    @property
+    def observation_buffer(self) -> Optional[ObservationBuffer]:
+        return self._observation_buffer
+
+    def attach_observation_buffer(
+        self,
+        buffer: Optional[ObservationBuffer] = None,
+        row: int = 0,
+        shared: bool = False,
+    ) -> ObservationBuffer:
+        """Sensors of all agents write their values in a flat block of memory.
+
+        Observations returned by step and reset are then views into the buffer,
+        with the shape declared by each sensor.
+        If shared, other processes can read observations by name of the buffer.
+        The buffer is detached when agents or sensors are added or removed.
+
+        Args:
+            buffer: Buffer to write into. If None, a new one is allocated.
+            row: Row of the buffer used by this playground.
+            shared: If a new buffer is allocated, allocate it in shared memory.
+        """
+
+        layout = self.observation_layout
+
+        if buffer is None:
+            buffer = ObservationBuffer(layout, shared=shared)
+
+        elif buffer.layout != layout:
+            raise ValueError("Buffer does not match the sensors of the agents")
+
+        self.detach_observation_buffer()
+
+        buffer.bind(self._agents, row)
+        self._observation_buffer = buffer
+        self._bound_sensors = [
+            sensor for agent in self._agents for sensor in agent.sensors
         ]
 
-        if isinstance(entity, PhysicalPart):
-            agent_shapes = []
-            for part in entity.agent.parts:
-                agent_shapes += part.pm_shapes
+        return buffer
+
+    def detach_observation_buffer(self):
 
-            overlaps = [elem for elem in overlaps if elem.shape not in agent_shapes]
+        if not self._observation_buffer:
+            return
 
-        self.space.reindex_static()
+        for sensor in self._bound_sensors:
+            sensor.slot = None
 
-        return bool(overlaps)
+        self._observation_buffer = None
+        self._bound_sensors = []
 
     def get_closest_agent(self, entity: EmbodiedEntity) -> Agent:
         return min(self.agents, key=lambda a: entity.position.get_dist_sqrd(a.position))
 
+    @property
+    def shapes_to_entities(self):
+        return self._shapes_to_entities
+
     def get_entity_from_shape(self, shape: pymunk.Shape):
         assert shape in self._shapes_to_entities
 
@@ -0,0 +1,148 @@
+"""
+Snapshots of the mutable state of a playground.
+
+A snapshot holds references to the entities of the playground,
+and their state in numpy arrays.
+Textures, pymunk shapes, windows and views are never copied,
+so that snapshots are cheap to take and to restore.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pymunk
+
+from ..agent import Agent
+from ..agent.interactor import Grasper
+from ..entity import EmbodiedEntity, Entity, InteractiveAnchored
+
+if TYPE_CHECKING:
+    from ..agent.controller import Controller
+    from ..agent.interactor.grasper import GraspState
+    from ..element import SceneElement
+
+
+class SnapshotEntities(NamedTuple):
+    """Entities whose state is captured, in the order of the arrays of a snapshot.
+
+    Attributes:
+        scene: scene elements and agents, added or removed as a whole.
+        embodied: all embodied entities, including devices and interactives.
+        bodies: embodied entities owning their pymunk body.
+        agents: agents, with their reward.
+        controllers: controllers of all agents.
+        graspers: graspers of all agents.
+    """
+
+    scene: Tuple[Union[SceneElement, Agent], ...]
+    embodied: Tuple[EmbodiedEntity, ...]
+    bodies: Tuple[EmbodiedEntity, ...]
+    agents: Tuple[Agent, ...]
+    controllers: Tuple[Controller, ...]
+    graspers: Tuple[Grasper, ...]
+
+    @classmethod
+    def from_entities(
+        cls,
+        scene: Sequence[Union[SceneElement, Agent]],
+        entities: Sequence[Entity],
+    ) -> SnapshotEntities:
+
+        embodied = tuple(ent for ent in entities if isinstance(ent, EmbodiedEntity))
+        agents = tuple(ent for ent in scene if isinstance(ent, Agent))
+
+        return cls(
+            scene=tuple(scene),
+            embodied=embodied,
+            bodies=tuple(
+                ent for ent in embodied if not isinstance(ent, InteractiveAnchored)
+            ),
+            agents=agents,
+            controllers=tuple(contr for agent in agents for contr in agent.controllers),
+            graspers=tuple(ent for ent in embodied if isinstance(ent, Grasper)),
+        )
+
+
+class Snapshot(NamedTuple):
+    """Mutable state of a playground, taken by Playground.snapshot.
+
+    Attributes:
+        entities: entities of the playground when the snapshot was taken.
+        timestep: timestep of the playground.
+        done: whether the playground was done.
+        rng_state: state of the random generator of the playground.
+        removed: removed flags of the scene entities.
+        bodies: position x, y, angle, velocity x, y and angular velocity
+            of each body, as an array of shape (n_bodies, 6).
+        rewards: rewards of the agents.
+        commands: commands of the controllers.
+        disabled: whether controllers were disabled at the last step.
+        grasps: entities grasped by each grasper, and their grasping flags.
+    """
+
+    entities: SnapshotEntities
+    timestep: int
+    done: bool
+    rng_state: Dict[str, Any]
+    removed: np.ndarray
+    bodies: np.ndarray
+    rewards: np.ndarray
+    commands: np.ndarray
+    disabled: np.ndarray
+    grasps: Tuple[GraspState, ...]
+
+
+def get_body_states(entities: Sequence[EmbodiedEntity]) -> np.ndarray:
+    """Position, angle and velocities of the bodies of entities."""
+
+    states = [
+        (*body.position, body.angle, *body.velocity, body.angular_velocity)
+        for body in (entity.pm_body for entity in entities)
+    ]
+
+    return np.array(states, dtype=np.float64).reshape(len(entities), 6)
+
+
+def set_body_states(
+    entities: Sequence[EmbodiedEntity], states: np.ndarray
+) -> List[EmbodiedEntity]:
+    """Set position, angle and velocities of the bodies of entities.
+
+    Returns the entities whose position or angle changed.
+    """
+
+    moved_entities = []
+
+    for entity, (pos_x, pos_y, angle, vel_x, vel_y, ang_vel) in zip(
+        entities, states.tolist()
+    ):
+        body = entity.pm_body
+
+        moved = body.position != (pos_x, pos_y) or body.angle != angle
+
+        body.position = pos_x, pos_y
+        body.angle = angle
+        body.velocity = vel_x, vel_y
+        body.angular_velocity = ang_vel
+
+        if not moved:
+            continue
+
+        # Shapes of static bodies are only reindexed if they moved
+        if body.space and body.body_type != pymunk.Body.DYNAMIC:
+            body.space.reindex_shapes_for_body(body)
+
+        moved_entities.append(entity)
+
+    return moved_entities
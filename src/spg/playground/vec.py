@@ -0,0 +1,394 @@
+"""
+Vectorized playgrounds, running in worker processes.
+
+Each worker owns several playgrounds, built by a user-provided function,
+and steps them when the main process sends a command.
+Commands, observations, rewards and dones are exchanged through
+shared memory, so that only short control messages are pickled.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..agent.controller import CommandSpace
+from ..agent.sensor import ObservationBuffer, ObservationLayout
+
+if TYPE_CHECKING:
+    from .playground import Playground
+
+PlaygroundFunction = Callable[[int], "Playground"]
+
+
+class VecPlayground:
+    """Steps several playgrounds in lockstep, in worker processes.
+
+    Playgrounds are created in the workers by calling playground_fn with a seed.
+    playground_fn must be picklable, for example a module-level function.
+    All playgrounds must have the same agents, with the same sensors
+    and controllers.
+
+    Commands are an array of shape (n_playgrounds, n_agents, n_controls),
+    where each row is as in Playground.step and command_space.
+    Observations are a dict of arrays of shape (n_playgrounds, *sensor.shape),
+    one per sensor, named as in ObservationLayout.
+    Arrays returned are views into shared memory,
+    overwritten at the next step or reset.
+
+    Playgrounds are reset automatically when they are done.
+    The observations returned are then the first ones of the new episode.
+
+    With headless, workers set PYGLET_HEADLESS and render without a window,
+    which requires EGL. Without EGL, set headless to False,
+    and run workers where a display is available.
+    """
+
+    def __init__(
+        self,
+        playground_fn: PlaygroundFunction,
+        n_playgrounds: int,
+        n_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        headless: bool = True,
+        start_method: str = "spawn",
+    ):
+
+        if n_playgrounds < 1:
+            raise ValueError("At least one playground is required")
+
+        if not n_workers:
+            n_workers = min(n_playgrounds, os.cpu_count() or 1)
+
+        n_workers = min(n_workers, n_playgrounds)
+
+        self._n_playgrounds = n_playgrounds
+        self._closed = False
+        self._memories: List[SharedMemory] = []
+        self._obs_buffer: Optional[ObservationBuffer] = None
+        self._connections: List[Connection] = []
+        self._processes: List[BaseProcess] = []
+
+        self._seeds = [
+            int(seq.generate_state(1)[0])
+            for seq in np.random.SeedSequence(seed).spawn(n_playgrounds)
+        ]
+
+        self._indices = np.array_split(np.arange(n_playgrounds), n_workers)
+
+        ctx = mp.get_context(start_method)
+
+        # Workers read the headless option when importing pyglet
+        env_headless = os.environ.get("PYGLET_HEADLESS")
+        if headless:
+            os.environ["PYGLET_HEADLESS"] = "1"
+
+        try:
+            for indices in self._indices:
+                parent_conn, child_conn = ctx.Pipe()
+                process = ctx.Process(
+                    target=_worker,
+                    args=(child_conn, playground_fn, [self._seeds[i] for i in indices]),
+                    daemon=True,
+                )
+                process.start()
+                child_conn.close()
+
+                self._connections.append(parent_conn)
+                self._processes.append(process)
+
+        finally:
+            if env_headless is None:
+                os.environ.pop("PYGLET_HEADLESS", None)
+            else:
+                os.environ["PYGLET_HEADLESS"] = env_headless
+
+        specs = self._receive_all()
+
+        self._layout, self._command_space = specs[0]
+        if any(spec != specs[0] for spec in specs):
+            self.close()
+            raise ValueError("All playgrounds must have the same agents and devices")
+
+        self._n_agents, self._n_controls = self._command_space.shape
+
+        self._allocate_buffers()
+
+        for conn, indices in zip(self._connections, self._indices):
+            conn.send(("buffers", (self._buffer_names, n_playgrounds, int(indices[0]))))
+        self._receive_all()
+
+    def _allocate_buffers(self):
+
+        n_pg = self._n_playgrounds
+
+        self._obs_buffer = ObservationBuffer(self._layout, n_pg, shared=True)
+        self._observations = self._obs_buffer.views
+
+        self._commands_memory = SharedMemory(
+            create=True, size=max(1, n_pg * self._n_agents * self._n_controls * 8)
+        )
+        self._rewards_memory = SharedMemory(
+            create=True, size=max(1, n_pg * self._n_agents * 8)
+        )
+        self._dones_memory = SharedMemory(create=True, size=n_pg)
+
+        self._memories = [
+            self._commands_memory,
+            self._rewards_memory,
+            self._dones_memory,
+        ]
+        self._buffer_names = (self._obs_buffer.name,) + tuple(
+            memory.name for memory in self._memories
+        )
+
+        self._commands, self._rewards, self._dones = _buffer_views(
+            n_pg, self._n_agents, self._n_controls, *self._memories
+        )
+
+    ###############
+    # Properties
+    ###############
+
+    @property
+    def n_playgrounds(self):
+        return self._n_playgrounds
+
+    @property
+    def seeds(self):
+        """Seeds used to create each playground."""
+        return self._seeds
+
+    @property
+    def n_agents(self):
+        return self._n_agents
+
+    @property
+    def n_controls(self):
+        return self._n_controls
+
+    @property
+    def observation_layout(self) -> ObservationLayout:
+        return self._layout
+
+    @property
+    def command_space(self) -> CommandSpace:
+        return self._command_space
+
+    ###############
+    # Step
+    ###############
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """Reset all playgrounds, and return their observations."""
+
+        self._send_all("reset")
+        self._receive_all()
+
+        return self._observations
+
+    def step(
+        self, commands: Optional[np.ndarray] = None
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """Step all playgrounds.
+
+        Returns:
+            Observations, rewards of shape (n_playgrounds, n_agents),
+            and dones of shape (n_playgrounds,).
+        """
+
+        if commands is None:
+            self._commands[:] = 0
+
+        else:
+            self._commands[:] = np.broadcast_to(commands, self._commands.shape)
+
+        self._send_all("step")
+        self._receive_all()
+
+        return self._observations, self._rewards, self._dones
+
+    def close(self):
+
+        if self._closed:
+            return
+
+        self._closed = True
+
+        for conn, process in zip(self._connections, self._processes):
+            if process.is_alive():
+                try:
+                    conn.send(("close", None))
+                except (BrokenPipeError, OSError):
+                    pass
+
+        for conn, process in zip(self._connections, self._processes):
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+
+        # Views must be released before the memory is closed
+        self._observations = self._commands = self._rewards = self._dones = None
+
+        for memory in self._memories:
+            try:
+                memory.close()
+            except BufferError:
+                # Observations are still viewed outside, memory is freed with them
+                pass
+            memory.unlink()
+
+        self._memories = []
+
+        if self._obs_buffer:
+            self._obs_buffer.close()
+            self._obs_buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, "_closed"):
+            self.close()
+
+    ###############
+    # Workers
+    ###############
+
+    def _send_all(self, command: str):
+
+        if self._closed:
+            raise ValueError("VecPlayground is closed")
+
+        for conn in self._connections:
+            conn.send((command, None))
+
+    def _receive_all(self):
+
+        results = []
+        errors = []
+
+        for conn in self._connections:
+            try:
+                status, result = conn.recv()
+            except EOFError:
+                status, result = "error", "Worker process terminated unexpectedly"
+
+            if status == "error":
+                errors.append(result)
+            results.append(result)
+
+        if errors:
+            self.close()
+            raise RuntimeError("Error in playground worker:\n" + errors[0])
+
+        return results
+
+
+def _buffer_views(
+    n_playgrounds: int,
+    n_agents: int,
+    n_controls: int,
+    commands_memory: SharedMemory,
+    rewards_memory: SharedMemory,
+    dones_memory: SharedMemory,
+):
+
+    commands = np.ndarray(
+        (n_playgrounds, n_agents, n_controls),
+        dtype=np.float64,
+        buffer=commands_memory.buf,
+    )
+    rewards = np.ndarray(
+        (n_playgrounds, n_agents), dtype=np.float64, buffer=rewards_memory.buf
+    )
+    dones = np.ndarray((n_playgrounds,), dtype=np.bool_, buffer=dones_memory.buf)
+
+    return commands, rewards, dones
+
+
+def _worker(conn, playground_fn: PlaygroundFunction, seeds: List[int]):
+
+    memories: List[SharedMemory] = []
+    obs_buffer: Optional[ObservationBuffer] = None
+    playgrounds: List[Playground] = []
+
+    try:
+        playgrounds = [playground_fn(seed) for seed in seeds]
+        agents = [playground.agents for playground in playgrounds]
+
+        layout = playgrounds[0].observation_layout
+        command_space = playgrounds[0].command_space
+
+        for playground in playgrounds[1:]:
+            if playground.observation_layout != layout:
+                raise ValueError("All playgrounds must have the same sensors")
+            if playground.command_space != command_space:
+                raise ValueError("All playgrounds must have the same controllers")
+
+        n_agents, n_controls = command_space.shape
+        conn.send(("ok", (layout, command_space)))
+
+        _, (names, n_playgrounds, first_index) = conn.recv()
+
+        # Sensors write observations directly in shared memory
+        obs_buffer = ObservationBuffer(layout, n_playgrounds, name=names[0])
+        for index, playground in enumerate(playgrounds):
+            playground.attach_observation_buffer(obs_buffer, row=first_index + index)
+
+        memories = [SharedMemory(name=name) for name in names[1:]]
+        commands, rewards, dones = _buffer_views(
+            n_playgrounds, n_agents, n_controls, *memories
+        )
+        conn.send(("ok", None))
+
+        while True:
+
+            command, _ = conn.recv()
+
+            if command == "close":
+                break
+
+            for index, (playground, pg_agents) in enumerate(zip(playgrounds, agents)):
+
+                row = first_index + index
+
+                if command == "reset":
+                    playground.reset()
+                    dones[row] = False
+
+                elif command == "step":
+                    _, _, rew, done = playground.step(commands=commands[row])
+
+                    rewards[row] = [rew[agent] for agent in pg_agents]
+                    dones[row] = done
+
+                    if done:
+                        playground.reset()
+
+            conn.send(("ok", None))
+
+    except Exception:  # pylint: disable=broad-except
+        conn.send(("error", traceback.format_exc()))
+
+    finally:
+        # Views must be released before the memory is closed
+        commands = rewards = dones = None
+        for playground in playgrounds:
+            playground.detach_observation_buffer()
+        if obs_buffer:
+            obs_buffer.close()
+        for memory in memories:
+            memory.close()
+        conn.close()
@@ -16,7 +16,18 @@ if TYPE_CHECKING:
 Coordinate = Tuple[Tuple[float, float], float]
 
 
+# Coordinates are drawn in batches, growing up to this size
+MAX_SAMPLE_BATCH = 1024
+
+
 class CoordinateSampler(ABC):
+    """Random coordinates within an area, following the pdf of the sampler.
+
+    The area is a disk if radius is set, else a rectangle.
+    Coordinates are drawn lazily, in batches, so that the first ones
+    are available without computing anything over the whole area.
+    """
+
     def __init__(
         self,
         playground: Playground,
@@ -32,6 +43,9 @@ class CoordinateSampler(ABC):
         if (not width) and size:
             width, height = size
 
+        if not height:
+            height = width
+
         self._width = width
         self._height = height
 
@@ -41,29 +55,32 @@ class CoordinateSampler(ABC):
 
         self._playground = playground
 
-    def _get_relative_positions(self):
+        # Cumulative distribution over integer positions of the area,
+        # computed on first use
+        self._positions: Optional[np.ndarray] = None
+        self._cdf: Optional[np.ndarray] = None
+
+    def _get_relative_positions(self) -> np.ndarray:
+        """Integer positions of the area, relative to its center, of shape (2, n)."""
 
         if self._radius:
-            pos = np.indices((self._radius, self._radius))
-            dist = (pos[0, :] - self._radius / 2) ** 2 + (pos[1, :] - self._radius / 2)
-            pos = np.where(dist < (self._radius / 2) ** 2)
-            pos = pos - np.atleast_2d((self._radius / 2, self._radius / 2)).transpose()
+            radius = int(self._radius)
+            pos = np.indices((2 * radius + 1, 2 * radius + 1)).reshape(2, -1) - radius
+            return pos[:, (pos**2).sum(axis=0) <= self._radius**2]
 
-        elif self._width:
+        assert self._width and self._height
 
-            if self._height:
-                pos = np.indices((self._width, self._height)).reshape(2, -1)
-                pos = (
-                    pos - np.atleast_2d((self._width / 2, self._height / 2)).transpose()
-                )
+        pos = np.indices((int(self._width), int(self._height))).reshape(2, -1)
+        return pos - np.atleast_2d((self._width / 2, self._height / 2)).transpose()
 
-            else:
-                pos = np.indices((self._width, self._width)).reshape(2, -1)
-                pos = (
-                    pos - np.atleast_2d((self._width / 2, self._width / 2)).transpose()
-                )
+    @property
+    def _area(self) -> int:
+
+        if self._radius:
+            return max(1, int(math.pi * self._radius**2))
 
-        return pos
+        assert self._width and self._height
+        return max(1, int(self._width * self._height))
 
     @property
     def _rng(self):
@@ -73,40 +90,66 @@ class CoordinateSampler(ABC):
     def _get_position_pdf(self, position_indices):
         ...
 
-    def _get_random_angle(self):
-        return self._rng.uniform(0, 2 * math.pi)
+    def _sample_positions(self, n_samples: int) -> np.ndarray:
+        """Positions relative to the center, of shape (n_samples, 2).
 
-    def sample(self):
+        Positions are drawn by inverting the cumulative distribution
+        of the pdf over integer positions of the area.
         """
-        Sample probabiity for all possible coordinates,
-        then sort them by order of posterior.
+
+        if self._cdf is None:
+            positions = self._get_relative_positions()
+            cdf = np.cumsum(self._get_position_pdf(positions), dtype=np.float64)
+
+            self._positions = positions.transpose()
+            self._cdf = cdf / cdf[-1]
+
+        assert self._positions is not None
+
+        indices = np.searchsorted(self._cdf, self._rng.uniform(size=n_samples))
+        return self._positions[np.minimum(indices, len(self._cdf) - 1)]
+
+    def sample(self, n_samples: Optional[int] = None):
         """
+        Yields random coordinates, drawn with replacement.
 
-        position_indices = self._get_relative_positions()
-        position_pdf = self._get_position_pdf(position_indices)
+        Args:
+            n_samples: Number of coordinates, by default the area in pixels.
+        """
 
-        uniform_sampling = self._rng.uniform(size=position_pdf.size)
-        posterior = uniform_sampling * position_pdf
+        if n_samples is None:
+            n_samples = self._area
 
-        rr, cc = position_indices
+        batch = 1
 
-        stacked = np.stack((rr, cc, posterior), axis=-1).reshape(-1, 3)
-        sorted_coordinates = stacked[stacked[:, 2].argsort()]
-        sorted_coordinates = sorted_coordinates[::-1]
+        while n_samples > 0:
 
-        for rel_x, rel_y, _ in sorted_coordinates:
+            batch = min(2 * batch, MAX_SAMPLE_BATCH, n_samples)
+            n_samples -= batch
 
-            x = self._center[0] + rel_x
-            y = self._center[1] + rel_y
-            angle = self._get_random_angle()
+            positions = self._sample_positions(batch)
+            angles = self._rng.uniform(0, 2 * math.pi, size=batch)
 
-            yield (x, y), angle
+            for (rel_x, rel_y), angle in zip(positions.tolist(), angles.tolist()):
+                yield (self._center[0] + rel_x, self._center[1] + rel_y), angle
 
 
 class UniformCoordinateSampler(CoordinateSampler):
     def _get_position_pdf(self, position_indices):
         return np.ones(position_indices.shape[1])
 
+    def _sample_positions(self, n_samples: int) -> np.ndarray:
+
+        if self._radius:
+            dist = self._radius * np.sqrt(self._rng.uniform(size=n_samples))
+            angle = self._rng.uniform(0, 2 * math.pi, size=n_samples)
+            return np.stack((dist * np.cos(angle), dist * np.sin(angle)), axis=-1)
+
+        assert self._width and self._height
+        half_size = np.array((self._width, self._height)) / 2
+
+        return self._rng.uniform(-half_size, half_size, size=(n_samples, 2))
+
 
 class GaussianCoordinateSampler(CoordinateSampler):
     def __init__(self, playground, sigma, **kwargs):
@@ -0,0 +1,40 @@
+from collections.abc import Sequence
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class ReadOnlyList(Sequence, Generic[T]):
+    """Immutable sequence, equal to lists and tuples with the same items."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Iterable[T] = ()):
+        self._items = tuple(items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __eq__(self, other) -> bool:
+
+        if isinstance(other, ReadOnlyList):
+            return self._items == other._items
+
+        if isinstance(other, (list, tuple)):
+            return self._items == tuple(other)
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._items)})"
@@ -1,12 +1,69 @@
+from typing import Dict, List, Optional, Tuple
+
 import numpy as np
 import pymunk
 from arcade import Texture
 from PIL import Image
 from skimage.draw import disk, polygon
 
+# Process-wide caches, shared by all entities and playgrounds.
+
+# Textures generated from shapes, indexed by name, shape geometry and color
+_SHAPE_TEXTURES: Dict[Tuple, Texture] = {}
+
+# Textures are identified by their name and the identity of their image,
+# as textures with the same name may have different pixels.
+# Caches hold the images, so that their identity is never reused.
+TextureKey = Tuple[str, int]
+
+# Textures colored with uids, indexed by original texture and uid
+_UID_TEXTURES: Dict[Tuple[TextureKey, int], Tuple[Image.Image, Texture]] = {}
+
+# Vertices of the pymunk shapes of entities,
+# indexed by texture, scale and shape approximation
+_SHAPE_VERTICES: Dict[
+    Tuple[TextureKey, float, Optional[str]],
+    Tuple[Image.Image, List[List[Tuple[float, float]]]],
+] = {}
+
+
+def clear_cache():
+    _SHAPE_TEXTURES.clear()
+    _UID_TEXTURES.clear()
+    _SHAPE_VERTICES.clear()
+
+
+def _get_shape_geometry(pm_shape):
+
+    if isinstance(pm_shape, pymunk.Segment):
+        return pm_shape.radius, tuple(pm_shape.a), tuple(pm_shape.b)
+
+    if isinstance(pm_shape, pymunk.Circle):
+        return (pm_shape.radius,)
+
+    if isinstance(pm_shape, pymunk.Poly):
+        return tuple(tuple(vert) for vert in pm_shape.get_vertices())
+
+    raise ValueError
+
 
 def get_texture_from_shape(pm_shape, color, name_texture):
 
+    key = (
+        name_texture,
+        type(pm_shape),
+        _get_shape_geometry(pm_shape),
+        tuple(color) if color else None,
+    )
+
+    if key not in _SHAPE_TEXTURES:
+        _SHAPE_TEXTURES[key] = _create_texture_from_shape(pm_shape, color, name_texture)
+
+    return _SHAPE_TEXTURES[key]
+
+
+def _create_texture_from_shape(pm_shape, color, name_texture):
+
     color_rgba = list(color) + [255]
 
     if isinstance(pm_shape, pymunk.Segment):
@@ -56,3 +113,43 @@ def get_texture_from_shape(pm_shape, color, name_texture):
     )
 
     return texture
+
+
+def texture_key(texture: Texture) -> TextureKey:
+    """Key of caches of textures. Caches must hold the image of the texture."""
+    return texture.name, id(texture.image)
+
+
+def get_uid_texture(texture: Texture, uid: int, color_uid) -> Texture:
+
+    key = texture_key(texture), uid
+
+    if key not in _UID_TEXTURES:
+
+        pixels_texture = np.asarray(texture.image.convert("RGBA"))
+
+        # Pixels that are neither transparent nor black take the uid color
+        mask = (pixels_texture[..., 3] != 0) & pixels_texture[..., :3].any(axis=-1)
+
+        pixels = np.zeros(pixels_texture.shape, dtype=np.uint8)
+        pixels[mask] = color_uid
+
+        _UID_TEXTURES[key] = texture.image, Texture(
+            name=f"{texture.name}_{id(texture.image)}_uid_{uid}",
+            image=Image.fromarray(pixels),
+            hit_box_algorithm="Detailed",
+            hit_box_detail=1,
+        )
+
+    return _UID_TEXTURES[key][1]
+
+
+def get_shape_vertices(texture: Texture, scale, shape_approximation, compute):
+    """Vertices of shapes for a texture, computed once for all entities."""
+
+    key = texture_key(texture), scale, shape_approximation
+
+    if key not in _SHAPE_VERTICES:
+        _SHAPE_VERTICES[key] = texture.image, compute()
+
+    return _SHAPE_VERTICES[key][1]
@@ -1,3 +1,12 @@
+from collections import deque
+from typing import Deque, Iterable
+
+import numpy as np
+
+# Uids are encoded on the three color channels of a pixel
+N_UIDS = 2**24
+
+
 def id_to_pixel(uid):
 
     id_0 = uid & 255
@@ -5,3 +14,46 @@ def id_to_pixel(uid):
     id_2 = (uid >> 16) & 255
 
     return id_0, id_1, id_2
+
+
+class UidAllocator:
+    """Allocates unique uids in constant time.
+
+    Fresh uids follow a permutation of the 24-bit uid space,
+    drawn from the random generator of the playground.
+    Successive uids are therefore well spread over colors,
+    and reproducible for a given seed.
+    Uids of entities removed definitively are released,
+    and reused in the order they were released.
+    """
+
+    def __init__(self, rng: np.random.Generator, reserved: Iterable[int] = ()):
+
+        # Affine permutation of [0, 2**24): odd multiplier, random offset.
+        self._multiplier = 2 * int(rng.integers(0, N_UIDS // 2)) + 1
+        self._offset = int(rng.integers(0, N_UIDS))
+        self._counter = 0
+
+        self._reserved = set(reserved)
+        self._released: Deque[int] = deque()
+
+    def allocate(self) -> int:
+
+        if self._released:
+            return self._released.popleft()
+
+        while self._counter < N_UIDS:
+            uid = (self._multiplier * self._counter + self._offset) % N_UIDS
+            self._counter += 1
+
+            if uid not in self._reserved:
+                return uid
+
+        raise ValueError("No uid available")
+
+    def release(self, uid: int):
+        self._released.append(uid)
+
+    def reclaim(self, uid: int):
+        """Allocate a released uid again, for an entity restored with its uid."""
+        self._released.remove(uid)
@@ -1,4 +1,5 @@
+from .color_uid import ColorUidView
 from .gui import GUI, HeadAgentGUI
 from .view import TopDownView
 
-__all__ = ["GUI", "HeadAgentGUI", "TopDownView"]
+__all__ = ["ColorUidView", "GUI", "HeadAgentGUI", "TopDownView"]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from os import path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+from arcade import SpriteList
+from arcade.gl import Buffer
+from pyglet import gl
+
+from ..entity import InteractiveAnchored, InteractiveZone
+from .view import TopDownView
+
+if TYPE_CHECKING:
+    from ..playground import Playground
+
+
+class ColorUidView(TopDownView):
+    """Top-down view rendering colors and uids of entities in a single pass.
+
+    Sprites are drawn once, into a framebuffer with two color attachments.
+    The first one holds the colors, as in a TopDownView,
+    and the second one holds the uids, as in a TopDownView with display_uid.
+    Interactive entities and zones are never drawn.
+    """
+
+    _n_color_attachments = 2
+
+    def __init__(
+        self,
+        playground: Playground,
+        size: Optional[Tuple[int, int]] = None,
+        center: Tuple[float, float] = (0, 0),
+        zoom: float = 1,
+        draw_transparent: bool = True,
+    ) -> None:
+
+        ctx = playground.window.ctx
+
+        shader_dir = path.abspath(path.join(__file__, "../shaders"))
+        sources = {}
+        for shader in ("vs", "geo", "fs"):
+            with open(
+                shader_dir + f"/sprite_uid_{shader}.glsl", "rt", encoding="utf-8"
+            ) as f_shader:
+                sources[shader] = f_shader.read()
+
+        self._program = ctx.program(
+            vertex_shader=sources["vs"],
+            geometry_shader=sources["geo"],
+            fragment_shader=sources["fs"],
+        )
+        self._program["sprite_texture"] = 0
+        self._program["uv_texture"] = 1
+
+        # Uids of the sprites, indexed by their slot in each sprite list
+        self._uids: Dict[SpriteList, np.ndarray] = {}
+        self._uid_buffers: Dict[SpriteList, Buffer] = {}
+
+        super().__init__(
+            playground,
+            size,
+            center,
+            zoom,
+            display_uid=False,
+            draw_transparent=draw_transparent,
+            draw_interactive=False,
+            draw_zone=False,
+        )
+
+    @property
+    def uid_texture(self):
+        """The OpenGL texture containing the uids"""
+        return self._fbo.color_attachments[1]
+
+    def add(self, entity):
+
+        if isinstance(entity, (InteractiveAnchored, InteractiveZone)):
+            return
+
+        super().add(entity)
+
+        sprite = self._sprites[entity]
+        sprite_list = sprite.sprite_lists[0]
+        slot = sprite_list.sprite_slot[sprite]
+
+        uids = self._uids.get(sprite_list, np.zeros(0, dtype=np.uint32))
+
+        if slot >= len(uids):
+            new_uids = np.zeros(max(2 * len(uids), slot + 1), dtype=np.uint32)
+            new_uids[: len(uids)] = uids
+            uids = self._uids[sprite_list] = new_uids
+
+            # Buffer is reallocated at next update
+            self._uid_buffers.pop(sprite_list, None)
+
+        uids[slot] = entity.uid
+
+        if sprite_list in self._uid_buffers:
+            self._uid_buffers[sprite_list].write(uids[slot : slot + 1], offset=4 * slot)
+
+    def remove(self, entity):
+
+        if isinstance(entity, (InteractiveAnchored, InteractiveZone)):
+            return
+
+        super().remove(entity)
+
+    def _clear(self, fbo):
+
+        fbo.clear(self._background)
+
+        # Uids have no background
+        gl.glClearBufferfv(gl.GL_COLOR, 1, (gl.GLfloat * 4)(0, 0, 0, 0))
+
+    def _draw_sprite_list(self, sprite_list: SpriteList):
+
+        if not sprite_list:
+            return
+
+        if sprite_list not in self._uid_buffers:
+            self._uid_buffers[sprite_list] = self._ctx.buffer(
+                data=self._uids[sprite_list]
+            )
+
+        # Program is reset to the default one when a sprite list is cleared
+        sprite_list.initialize()
+        sprite_list.program = self._program
+
+        self._uid_buffers[sprite_list].bind_to_storage_buffer(binding=7)
+        sprite_list.draw(pixelated=True)
+
+    def get_np_uid_img(self):
+        # Framebuffer.read of arcade ignores the attachment, so the texture is read
+        img = np.frombuffer(self.uid_texture.read(), dtype=np.dtype("B")).reshape(
+            self._height, self._width, 4
+        )
+        return img[..., :3]
+
+    def reset(self):
+
+        super().reset()
+
+        self._uids = {}
+        self._uid_buffers = {}
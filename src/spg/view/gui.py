@@ -118,11 +118,10 @@ class GUI(TopDownView):
 
         # Change projection to match the contents
 
-        self._transparent_sprites.draw(pixelated=True)
-        self._interactive_sprites.draw(pixelated=True)
-        self._zone_sprites.draw(pixelated=True)
-        self._visible_sprites.draw(pixelated=True)
-        self._traversable_sprites.draw(pixelated=True)
+        for static_sprites, sprite_list in self._sprite_layers:
+            if static_sprites:
+                static_sprites.draw(pixelated=True)
+            sprite_list.draw(pixelated=True)
 
     def on_key_press(self, key, modifiers):
         """Called whenever a key is pressed."""
@@ -0,0 +1,27 @@
+#version 330
+
+// Copies the pixels of a layer where sprites were drawn,
+// as the sprites themselves would have written them.
+// Layers are cleared to transparent, and sprites discard transparent pixels.
+
+uniform sampler2D layer_0;
+uniform sampler2D layer_1;
+
+layout(location = 0) out vec4 f_color_0;
+#if N_ATTACHMENTS > 1
+layout(location = 1) out vec4 f_color_1;
+#endif
+
+void main() {
+    ivec2 pixel = ivec2(gl_FragCoord.xy);
+
+    vec4 color = texelFetch(layer_0, pixel, 0);
+    if (color.a == 0.0) {
+        discard;
+    }
+    f_color_0 = color;
+
+#if N_ATTACHMENTS > 1
+    f_color_1 = texelFetch(layer_1, pixel, 0);
+#endif
+}
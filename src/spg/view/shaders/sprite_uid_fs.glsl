@@ -0,0 +1,35 @@
+#version 430
+
+// Writes the color of the sprite in the first attachment,
+// and the color encoding its uid in the second attachment.
+// As in EmbodiedEntity.color_with_id, black pixels of the texture have no uid.
+
+uniform sampler2D sprite_texture;
+uniform vec4 spritelist_color = vec4(1.0);
+
+in vec2 gs_uv;
+in vec4 gs_color;
+flat in uint gs_uid;
+
+layout(location = 0) out vec4 f_color;
+layout(location = 1) out vec4 f_uid;
+
+void main() {
+    vec4 texture_color = texture(sprite_texture, gs_uv);
+    vec4 basecolor = texture_color * gs_color * spritelist_color;
+    if (basecolor.a == 0.0) {
+        discard;
+    }
+    f_color = basecolor;
+
+    // Transparent uid leaves the attachment unchanged when blending
+    f_uid = vec4(0.0);
+    if (texture_color.rgb != vec3(0.0)) {
+        f_uid = vec4(
+            gs_uid & 255u,
+            (gs_uid >> 8) & 255u,
+            (gs_uid >> 16) & 255u,
+            255u
+        ) / 255.0;
+    }
+}
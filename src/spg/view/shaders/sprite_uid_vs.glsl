@@ -0,0 +1,32 @@
+#version 430
+
+// Same as the sprite list vertex shader of arcade,
+// with the uid of the sprite read from its slot in the sprite list.
+
+in vec2 in_pos;
+in float in_angle;
+in vec2 in_size;
+in float in_texture;
+in vec4 in_color;
+
+layout(std430, binding = 7) buffer sprite_uids
+{
+    uint uids[];
+};
+
+out float v_angle;
+out vec4 v_color;
+out vec2 v_size;
+out float v_texture;
+flat out uint v_uid;
+
+void main() {
+    gl_Position = vec4(in_pos, 0.0, 1.0);
+    v_angle = in_angle;
+    v_color = in_color;
+    v_size = in_size;
+    v_texture = in_texture;
+
+    // Sprites are drawn as points indexed by their slot
+    v_uid = uids[gl_VertexID];
+}
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import ctypes
+from os import path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pymunk
 from arcade import SpriteList
+from arcade.gl import Framebuffer, geometry
 from arcade.sprite import Sprite
+from pyglet import gl
 
 from ..entity import InteractiveAnchored, InteractiveZone, PhysicalEntity
 
@@ -13,8 +18,13 @@ if TYPE_CHECKING:
     from ..entity import EmbodiedEntity
     from ..playground import Playground
 
+_PIXEL_FORMATS = {1: gl.GL_RED, 3: gl.GL_RGB, 4: gl.GL_RGBA}
+
 
 class TopDownView:
+
+    _n_color_attachments = 1
+
     def __init__(
         self,
         playground: Playground,
@@ -25,7 +35,17 @@ class TopDownView:
         draw_transparent: bool = True,
         draw_interactive: bool = True,
         draw_zone: bool = True,
+        async_readback: bool = False,
+        components: int = 3,
     ) -> None:
+        """
+        Args:
+            async_readback: If True, pixels are transferred to pixel buffers
+                at the end of each update, without waiting for rendering.
+                get_np_img then returns preallocated arrays, which are reused
+                every other update.
+            components: Number of channels of images, 1 (red), 3 (RGB) or 4 (RGBA).
+        """
 
         self._playground = playground
 
@@ -53,25 +73,66 @@ class TopDownView:
         self._zone_sprites = SpriteList()
         self._traversable_sprites = SpriteList()
 
+        # Physical entities without mass are rendered once in static layers,
+        # one per category of sprites, composited in the view
+        # before drawing the other sprites of the same category.
+        self._static_transparent_sprites = SpriteList()
+        self._static_visible_sprites = SpriteList()
+        self._static_traversable_sprites = SpriteList()
+        self._static_layer_outdated = True
+        self._static_fbos: Dict[SpriteList, Framebuffer] = {}
+
         self._background = playground.background
 
         self._fbo = self._ctx.framebuffer(
             color_attachments=[
-                self._ctx.texture(
-                    (size),
-                    components=4,
-                    wrap_x=self._ctx.CLAMP_TO_BORDER,  # type: ignore
-                    wrap_y=self._ctx.CLAMP_TO_BORDER,  # type: ignore
-                    # type: ignore
-                    filter=(self._ctx.NEAREST, self._ctx.NEAREST),
-                ),
+                self._create_texture() for _ in range(self._n_color_attachments)
             ]
         )
+        self._layer_program = self._create_layer_program()
+        self._layer_quad = geometry.quad_2d_fs()
+
+        if components not in _PIXEL_FORMATS:
+            raise ValueError(f"Number of components must be in {list(_PIXEL_FORMATS)}")
+
+        self._components = components
+        self._img_shape = self._height, self._width, components
+
+        # Double buffered readback: an update can transfer pixels to a buffer
+        # while the image of the previous update is still in use.
+        self._async_readback = async_readback
+        self._readback_index = 0
+        self._readback_pending = False
+
+        if async_readback:
+            nbytes = self._width * self._height * components
+            self._pixel_buffers = [
+                self._ctx.buffer(reserve=nbytes, usage="stream") for _ in range(2)
+            ]
+            self._images = [np.zeros(self._img_shape, dtype=np.uint8) for _ in range(2)]
 
         self._sprites: Dict[EmbodiedEntity, Sprite] = {}
 
+        # Sprites are only updated when the entity carrying them moved.
+        # Entities are indexed by the entity whose body they follow.
+        self._followers: Dict[EmbodiedEntity, List[EmbodiedEntity]] = {}
+        self._dirty: Set[EmbodiedEntity] = set()
+
+        # Last coordinates of dynamic bodies, to detect which ones moved
+        self._dynamic_coordinates: Dict[EmbodiedEntity, Tuple[float, ...]] = {}
+
         self._playground.add_view(self)
 
+    def _create_texture(self):
+        return self._ctx.texture(
+            self._size,
+            components=4,
+            wrap_x=self._ctx.CLAMP_TO_BORDER,  # type: ignore
+            wrap_y=self._ctx.CLAMP_TO_BORDER,  # type: ignore
+            # type: ignore
+            filter=(self._ctx.NEAREST, self._ctx.NEAREST),
+        )
+
     @property
     def texture(self):
         """The OpenGL texture containing the map pixel data"""
@@ -97,6 +158,52 @@ class TopDownView:
     def sprites(self):
         return self._sprites
 
+    @property
+    def _sprite_layers(self) -> List[Tuple[Optional[SpriteList], SpriteList]]:
+        """Static and dynamic sprite lists of each category, in drawing order."""
+
+        layers: List[Tuple[Optional[SpriteList], SpriteList]] = []
+
+        if self._draw_transparent:
+            layers.append((self._static_transparent_sprites, self._transparent_sprites))
+
+        if self._draw_interactive:
+            layers.append((None, self._interactive_sprites))
+
+        if self._draw_zone:
+            layers.append((None, self._zone_sprites))
+
+        layers.append((self._static_visible_sprites, self._visible_sprites))
+        layers.append((self._static_traversable_sprites, self._traversable_sprites))
+
+        return layers
+
+    def _create_layer_program(self):
+        """Program copying static layers in the view."""
+
+        shader_dir = path.abspath(path.join(__file__, "../shaders"))
+        sources = {}
+        for shader in ("vs", "fs"):
+            with open(
+                shader_dir + f"/layer_{shader}.glsl", "rt", encoding="utf-8"
+            ) as f_shader:
+                sources[shader] = f_shader.read()
+
+        program = self._ctx.program(
+            vertex_shader=sources["vs"],
+            fragment_shader=sources["fs"].replace(
+                "N_ATTACHMENTS", str(self._n_color_attachments)
+            ),
+        )
+        for index in range(self._n_color_attachments):
+            program[f"layer_{index}"] = index
+
+        return program
+
+    @staticmethod
+    def _is_static(entity):
+        return isinstance(entity, PhysicalEntity) and not entity.movable
+
     def add(self, entity):
 
         if isinstance(entity, InteractiveAnchored):
@@ -126,16 +233,27 @@ class TopDownView:
         elif isinstance(entity, PhysicalEntity):
 
             sprite = entity.get_sprite(self._zoom, color_uid=self._display_uid)
+            static = self._is_static(entity)
 
             if entity.traversable:
-                self._traversable_sprites.append(sprite)
+                sprite_list = self._traversable_sprites
+                if static:
+                    sprite_list = self._static_traversable_sprites
 
             elif entity.transparent:
-                if self._draw_transparent:
-                    self._transparent_sprites.append(sprite)
+                sprite_list = self._transparent_sprites
+                if static:
+                    sprite_list = self._static_transparent_sprites
 
             else:
-                self._visible_sprites.append(sprite)
+                sprite_list = self._visible_sprites
+                if static:
+                    sprite_list = self._static_visible_sprites
+
+            sprite_list.append(sprite)
+
+            if static:
+                self._static_layer_outdated = True
 
         else:
             raise ValueError("Not implemented")
@@ -143,6 +261,28 @@ class TopDownView:
         entity.update_sprite(self, sprite)
         self._sprites[entity] = sprite
 
+        body_entity = self._get_body_entity(entity)
+        self._followers.setdefault(body_entity, []).append(entity)
+
+        pm_body = body_entity.pm_body
+        if pm_body and pm_body.body_type == pymunk.Body.DYNAMIC:
+            self._dynamic_coordinates[body_entity] = self._get_coordinates(body_entity)
+
+    @staticmethod
+    def _get_body_entity(entity):
+        if isinstance(entity, InteractiveAnchored) and entity.anchor:
+            return entity.anchor
+        return entity
+
+    @staticmethod
+    def _get_coordinates(entity):
+        pm_body = entity.pm_body
+        return pm_body.position.x, pm_body.position.y, pm_body.angle
+
+    def mark_moved(self, entity):
+        """Flags an entity, so that its sprite is updated at next update."""
+        self._dirty.add(entity)
+
     def remove(self, entity):
 
         if isinstance(entity, InteractiveAnchored) and not self._draw_interactive:
@@ -153,60 +293,162 @@ class TopDownView:
 
         sprite = self._sprites.pop(entity)
 
-        if isinstance(entity, InteractiveAnchored):
-            self._interactive_sprites.remove(sprite)
+        body_entity = self._get_body_entity(entity)
+        followers = self._followers[body_entity]
+        followers.remove(entity)
 
-        elif isinstance(entity, InteractiveZone):
-            self._zone_sprites.remove(sprite)
+        if not followers:
+            self._followers.pop(body_entity)
+            self._dynamic_coordinates.pop(body_entity, None)
+            self._dirty.discard(body_entity)
 
-        elif isinstance(entity, PhysicalEntity):
+        for sprite_list in list(sprite.sprite_lists):
+            sprite_list.remove(sprite)
 
-            if entity.traversable:
-                self._traversable_sprites.remove(sprite)
+        if self._is_static(entity):
+            self._static_layer_outdated = True
 
-            elif entity.transparent:
-                self._transparent_sprites.remove(sprite)
+    def update_sprites(self, force=False):
 
-            else:
-                self._visible_sprites.remove(sprite)
+        if force:
+            moved = list(self._followers)
 
-    def update_sprites(self, force=False):
+        else:
+            moved = list(self._dirty)
+
+            for entity, coordinates in self._dynamic_coordinates.items():
+                if self._get_coordinates(entity) != coordinates:
+                    moved.append(entity)
+
+        for entity in moved:
+
+            if entity not in self._followers:
+                continue
+
+            for follower in self._followers[entity]:
+                follower.update_sprite(self, self._sprites[follower])
+
+            if self._is_static(entity):
+                self._static_layer_outdated = True
 
-        # check that
-        for entity, sprite in self._sprites.items():
-            if entity.needs_sprite_update or force:
-                entity.update_sprite(self, sprite)
+            if entity in self._dynamic_coordinates:
+                self._dynamic_coordinates[entity] = self._get_coordinates(entity)
+
+        self._dirty.clear()
 
     def update(self, force=False):
 
         self.update_sprites(force)
 
+        if self._static_layer_outdated or force:
+            self._update_static_layer()
+
         with self._fbo.activate() as fbo:
 
-            if self._display_uid:
-                fbo.clear()
-            else:
-                fbo.clear(self._background)
+            self._clear(fbo)
 
             # Change projection to match the contents
             self._ctx.projection_2d = 0, self._width, 0, self._height
 
-            if self._draw_transparent:
-                self._transparent_sprites.draw(pixelated=True)
+            for static_sprites, sprite_list in self._sprite_layers:
+                if static_sprites:
+                    self._copy_static_layer(static_sprites)
+                self._draw_sprite_list(sprite_list)
+
+        if self._async_readback:
+            self._start_readback()
+
+    def _update_static_layer(self):
+
+        for static_sprites, _ in self._sprite_layers:
+
+            if not static_sprites:
+                continue
 
-            if self._draw_interactive:
-                self._interactive_sprites.draw(pixelated=True)
+            if static_sprites not in self._static_fbos:
+                self._static_fbos[static_sprites] = self._ctx.framebuffer(
+                    color_attachments=[
+                        self._create_texture() for _ in range(self._n_color_attachments)
+                    ]
+                )
+
+            # Layers are transparent where no static sprite is drawn
+            with self._static_fbos[static_sprites].activate() as fbo:
+                fbo.clear()
+                self._ctx.projection_2d = 0, self._width, 0, self._height
+                self._draw_sprite_list(static_sprites)
+
+        self._static_layer_outdated = False
+
+    def _copy_static_layer(self, static_sprites: SpriteList):
 
-            if self._draw_zone:
-                self._zone_sprites.draw(pixelated=True)
+        fbo = self._static_fbos[static_sprites]
+
+        for index, texture in enumerate(fbo.color_attachments):
+            texture.use(index)
+
+        self._layer_quad.render(self._layer_program)
+
+    def _clear(self, fbo):
+
+        if self._display_uid:
+            fbo.clear()
+        else:
+            fbo.clear(self._background)
 
-            self._visible_sprites.draw(pixelated=True)
-            self._traversable_sprites.draw(pixelated=True)
+    def _draw_sprite_list(self, sprite_list: SpriteList):
+        sprite_list.draw(pixelated=True)
+
+    def _read_pixels(self, pointer):
+        """Reads pixels of the view to pointer, or to the bound pixel buffer."""
+
+        with self._fbo.activate():
+            gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+            gl.glReadBuffer(gl.GL_COLOR_ATTACHMENT0)
+            gl.glReadPixels(
+                0,
+                0,
+                self._width,
+                self._height,
+                _PIXEL_FORMATS[self._components],
+                gl.GL_UNSIGNED_BYTE,
+                pointer,
+            )
+            gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 4)
+
+    def _start_readback(self):
+
+        self._readback_index = 1 - self._readback_index
+
+        # Returns immediately, the transfer happens when rendering is done
+        buffer = self._pixel_buffers[self._readback_index]
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, buffer.glo)
+        self._read_pixels(None)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        self._readback_pending = True
 
     def get_np_img(self):
-        img = np.frombuffer(self._fbo.read(), dtype=np.dtype("B")).reshape(
-            self._height, self._width, 3
-        )
+
+        if not self._async_readback:
+            img = np.empty(self._img_shape, dtype=np.uint8)
+            self._read_pixels(img.ctypes.data_as(ctypes.c_void_p))
+            return img
+
+        img = self._images[self._readback_index]
+
+        if self._readback_pending:
+            buffer = self._pixel_buffers[self._readback_index]
+            gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, buffer.glo)
+            gl.glGetBufferSubData(
+                gl.GL_COPY_READ_BUFFER,
+                0,
+                img.nbytes,
+                img.ctypes.data_as(ctypes.c_void_p),
+            )
+            gl.glBindBuffer(gl.GL_COPY_READ_BUFFER, 0)
+            self._readback_pending = False
+
         return img
 
     def draw(self):
@@ -222,3 +464,12 @@ class TopDownView:
         self._zone_sprites.clear()
         self._visible_sprites.clear()
         self._traversable_sprites.clear()
+        self._static_transparent_sprites.clear()
+        self._static_visible_sprites.clear()
+        self._static_traversable_sprites.clear()
+        self._static_layer_outdated = True
+
+        self._sprites = {}
+        self._followers = {}
+        self._dirty = set()
+        self._dynamic_coordinates = {}
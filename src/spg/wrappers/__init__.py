@@ -0,0 +1,8 @@
+from .gym_env import ActionSpace, PlaygroundEnv, VecPlaygroundEnv, observation_space
+
+__all__ = [
+    "ActionSpace",
+    "PlaygroundEnv",
+    "VecPlaygroundEnv",
+    "observation_space",
+]
@@ -0,0 +1,353 @@
+"""
+Gym environments of playgrounds, to train agents with standard RL libraries.
+
+Spaces are computed once, from the sensors and controllers of the agents:
+observations are a Dict of Boxes with the shape and bounds of each sensor,
+and actions follow the bounds and valid values of each controller.
+Sensors write their values directly in preallocated arrays,
+so that stepping an environment needs no conversion of observations.
+
+Requires gymnasium, or gym.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import gymnasium as gym
+    from gymnasium import spaces
+    from gymnasium.vector.utils import batch_space
+
+    _NEW_STEP_API = True
+
+except ImportError:
+    try:
+        import gym  # type: ignore
+        from gym import spaces  # type: ignore
+        from gym.vector.utils import batch_space  # type: ignore
+
+    except ImportError as error:
+        raise ImportError(
+            "Gym environments require gymnasium or gym to be installed"
+        ) from error
+
+    # Since gym 0.26, reset returns infos and step returns truncations
+    _NEW_STEP_API = tuple(int(v) for v in gym.__version__.split(".")[:2]) >= (0, 26)
+
+from ..agent.controller import CommandSpace
+from ..agent.sensor import ObservationLayout
+from ..playground import VecPlayground
+from ..view import TopDownView
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+    from ..playground import Playground
+    from ..playground.vec import PlaygroundFunction
+
+
+def observation_space(layout: ObservationLayout, agent_index: int = 0) -> spaces.Dict:
+    """Space of the observations of an agent, one Box per sensor.
+
+    Boxes are named after the type and index of the sensor,
+    as in ObservationLayout without the agent prefix.
+    """
+
+    prefix = f"agent_{agent_index}/"
+
+    return spaces.Dict(
+        {
+            slot.name[len(prefix) :]: spaces.Box(
+                low=slot.low,
+                high=slot.high,
+                shape=slot.shape,
+                dtype=np.dtype(slot.dtype),
+            )
+            for slot in layout.slots
+            if slot.name.startswith(prefix)
+        }
+    )
+
+
+class ActionSpace:
+    """Space of the actions of an agent, and their conversion to commands.
+
+    Continuous controllers are a Box within their bounds.
+    Discrete controllers are a MultiDiscrete over the indices of their valid values.
+    If an agent has both, actions are a Dict with "continuous" and "discrete" keys.
+    Controls follow the order of agent.controllers within each group.
+    """
+
+    def __init__(self, command_space: CommandSpace, agent_index: int = 0):
+
+        n_controls = len(command_space.names[agent_index])
+
+        continuous = command_space.continuous[agent_index, :n_controls]
+        discrete = command_space.discrete[agent_index, :n_controls]
+
+        self._continuous = np.flatnonzero(continuous)
+        self._discrete = np.flatnonzero(discrete)
+
+        valid_values = command_space.valid_values[agent_index, self._discrete]
+        self._valid_values = valid_values
+        self._discrete_range = np.arange(len(self._discrete))
+
+        continuous_space = spaces.Box(
+            low=command_space.low[agent_index, self._continuous].astype(np.float32),
+            high=command_space.high[agent_index, self._continuous].astype(np.float32),
+            dtype=np.float32,
+        )
+        discrete_space = spaces.MultiDiscrete(
+            (~np.isnan(valid_values)).sum(axis=-1).astype(np.int64)
+        )
+
+        self._mixed = bool(len(self._continuous) and len(self._discrete))
+
+        self.space: spaces.Space
+        if self._mixed:
+            self.space = spaces.Dict(
+                {"continuous": continuous_space, "discrete": discrete_space}
+            )
+        elif len(self._discrete):
+            self.space = discrete_space
+        else:
+            self.space = continuous_space
+
+    def write(self, actions, commands: np.ndarray):
+        """Write actions in the commands of the agent.
+
+        Actions may have leading batch dimensions, matching those of commands.
+        """
+
+        if self._mixed:
+            continuous, discrete = actions["continuous"], actions["discrete"]
+        elif len(self._discrete):
+            continuous, discrete = None, actions
+        else:
+            continuous, discrete = actions, None
+
+        if continuous is not None:
+            commands[..., self._continuous] = continuous
+
+        if discrete is not None:
+            indices = np.asarray(discrete, dtype=np.int64)
+            commands[..., self._discrete] = self._valid_values[
+                self._discrete_range, indices
+            ]
+
+
+class PlaygroundEnv(gym.Env):
+    """Environment where one agent of a playground is controlled.
+
+    Other agents receive their default commands.
+    Observations are views of the observation buffer of the playground,
+    overwritten at the next step or reset, unless copy is True.
+    Agents and sensors must not change after the environment is created.
+
+    The playground is seeded when created: seeds passed to reset
+    only seed the np_random generator of the environment.
+    """
+
+    metadata = {"render_modes": ["rgb_array"], "render.modes": ["rgb_array"]}
+
+    def __init__(
+        self,
+        playground: Playground,
+        agent: Optional[Agent] = None,
+        render_mode: Optional[str] = None,
+        copy: bool = False,
+    ):
+
+        if agent is None:
+            agent = playground.agents[0]
+
+        if agent not in playground.agents:
+            raise ValueError("Agent is not in the playground")
+
+        self._playground = playground
+        self._agent = agent
+        self._copy = copy
+        self.render_mode = render_mode
+        self._view: Optional[TopDownView] = None
+
+        index = playground.agents.index(agent)
+        layout = playground.observation_layout
+        command_space = playground.command_space
+
+        self.observation_space = observation_space(layout, index)
+        self._action_space = ActionSpace(command_space, index)
+        self.action_space = self._action_space.space
+
+        self._commands = command_space.default.copy()
+        self._agent_commands = self._commands[index]
+
+        self._buffer = playground.attach_observation_buffer()
+
+        prefix = f"agent_{index}/"
+        self._observations = {
+            name[len(prefix) :]: view
+            for name, view in self._buffer.row(0).items()
+            if name.startswith(prefix)
+        }
+
+    @property
+    def playground(self):
+        return self._playground
+
+    @property
+    def agent(self):
+        return self._agent
+
+    def _get_observations(self) -> Dict[str, np.ndarray]:
+
+        if self._playground.observation_buffer is not self._buffer:
+            raise ValueError("Agents or sensors changed after creating the environment")
+
+        if self._copy:
+            return {name: obs.copy() for name, obs in self._observations.items()}
+
+        return self._observations
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None):
+
+        if _NEW_STEP_API:
+            super().reset(seed=seed)
+
+        self._playground.reset()
+        observations = self._get_observations()
+
+        if _NEW_STEP_API:
+            return observations, {}
+
+        return observations
+
+    def step(self, action):
+
+        self._action_space.write(action, self._agent_commands)
+        _, _, rewards, done = self._playground.step(commands=self._commands)
+
+        reward = float(rewards[self._agent]) if rewards else 0.0
+        observations = self._get_observations()
+
+        if _NEW_STEP_API:
+            return observations, reward, bool(done), False, {}
+
+        return observations, reward, bool(done), {}
+
+    def render(self, *_, **__):
+
+        if self.render_mode != "rgb_array":
+            return None
+
+        if not self._view:
+            self._view = TopDownView(self._playground)
+
+        self._view.update()
+        return self._view.get_np_img()
+
+    def close(self):
+        if self._playground.observation_buffer is self._buffer:
+            self._playground.detach_observation_buffer()
+
+
+class VecPlaygroundEnv:
+    """Vector environment where one agent of each playground is controlled.
+
+    Playgrounds run in worker processes, as in VecPlayground,
+    and follow the interface of gym vector environments.
+    Observations and actions are batched versions of those of PlaygroundEnv.
+    Playgrounds are reset automatically when they are done,
+    and the observations returned are then the first ones of the new episode.
+    Observations are views of shared memory, overwritten at the next step
+    or reset, unless copy is True.
+    """
+
+    def __init__(
+        self,
+        playground_fn: PlaygroundFunction,
+        num_envs: int,
+        agent_index: int = 0,
+        copy: bool = False,
+        **kwargs,
+    ):
+
+        self._vec = VecPlayground(playground_fn, num_envs, **kwargs)
+
+        if not 0 <= agent_index < self._vec.n_agents:
+            self._vec.close()
+            raise ValueError(f"No agent with index {agent_index}")
+
+        self.num_envs = num_envs
+        self._copy = copy
+        self.closed = False
+
+        layout = self._vec.observation_layout
+        command_space = self._vec.command_space
+
+        self.single_observation_space = observation_space(layout, agent_index)
+        self._action_space = ActionSpace(command_space, agent_index)
+        self.single_action_space = self._action_space.space
+
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self._agent_index = agent_index
+        self._commands = np.repeat(command_space.default[None], num_envs, axis=0)
+        self._agent_commands = self._commands[:, agent_index]
+
+        prefix = f"agent_{agent_index}/"
+        self._names: List[Tuple[str, str]] = [
+            (slot.name[len(prefix) :], slot.name)
+            for slot in layout.slots
+            if slot.name.startswith(prefix)
+        ]
+
+        self._truncations = np.zeros(num_envs, dtype=bool)
+
+    @property
+    def vec_playground(self):
+        return self._vec
+
+    def _get_observations(self, observations) -> Dict[str, np.ndarray]:
+
+        if self._copy:
+            return {name: observations[slot].copy() for name, slot in self._names}
+
+        return {name: observations[slot] for name, slot in self._names}
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[dict] = None):
+        # pylint: disable=unused-argument
+
+        observations = self._get_observations(self._vec.reset())
+
+        if _NEW_STEP_API:
+            return observations, {}
+
+        return observations
+
+    def step(self, actions):
+
+        self._action_space.write(actions, self._agent_commands)
+        observations, rewards, dones = self._vec.step(self._commands)
+
+        observations = self._get_observations(observations)
+        rewards = rewards[:, self._agent_index].copy()
+        dones = dones.copy()
+        infos: Dict[str, Any] = {}
+
+        if _NEW_STEP_API:
+            return observations, rewards, dones, self._truncations.copy(), infos
+
+        return observations, rewards, dones, [infos for _ in range(self.num_envs)]
+
+    def close(self, **_):
+        self._vec.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -1,5 +1,6 @@
 # pylint: disable=protected-access
 
+import numpy as np
 import pytest
 
 from spg.agent.controller import ContinuousController, RangeController
@@ -166,3 +167,57 @@ def test_agent_overlapping():
 
     with pytest.raises(ValueError):
         playground.add(agent, allow_overlapping=False)
+
+
+def test_agent_device_indexes():
+
+    playground = Playground()
+    agent = MockAgentWithArm()
+    playground.add(agent)
+
+    controllers = agent.controllers
+    assert controllers
+    assert agent.controllers is controllers
+
+    commands = agent.get_random_commands()
+    agent.receive_commands(commands)
+
+    for controller in controllers:
+        assert controller.command == commands[controller.name]
+
+    # Attaching a device updates the indexes
+    controller = ContinuousController(name="extra", min_value=-1, max_value=1)
+    agent.base.add(controller)
+
+    assert controller in agent.controllers
+    assert controller not in controllers
+
+
+def test_command_array():
+
+    playground = Playground()
+    agent = MockAgentWithArm()
+    playground.add(agent)
+
+    space = playground.command_space
+    assert space.shape == (1, len(agent.controllers))
+
+    for ind, controller in enumerate(agent.controllers):
+        if isinstance(controller, ContinuousController):
+            assert space.continuous[0, ind]
+            assert space.low[0, ind] == controller.min
+            assert space.high[0, ind] == controller.max
+        else:
+            assert space.discrete[0, ind]
+
+    commands = np.where(space.continuous, space.high + 1, space.high)
+    playground.step(commands=commands)
+
+    # Continuous commands are clipped, discrete ones are valid values
+    for ind, controller in enumerate(agent.controllers):
+        assert controller.command == space.high[0, ind]
+
+    commands = np.where(space.continuous, 0, space.high + 1)
+    if space.discrete.any():
+        with pytest.raises(ValueError):
+            playground.step(commands=commands)
@@ -1,6 +1,13 @@
+# pylint: disable=protected-access
+
+import numpy as np
 import pytest
 
-from spg.agent.communicator import Communicator, LimitedCommunicator
+from spg.agent.communicator import (
+    Communicator,
+    LimitedCommunicator,
+    deliver_messages,
+)
 from spg.playground import Playground
 from tests.mock_agents import MockAgent
 
@@ -155,3 +162,77 @@ def test_capacity():
         (comm_1, "test_1"),
         (comm_4, "test_4"),
     ]
+
+
+def test_comms_in_range_index():
+
+    playground = Playground(seed=0)
+    rng = np.random.default_rng(0)
+
+    comms = []
+    for index in range(30):
+        agent = MockAgent()
+        comm = Communicator(transmission_range=[None, 50, 120][index % 3])
+        agent.base.add(comm)
+        comms.append(comm)
+
+        position = tuple(rng.uniform(-200, 200, size=2))
+        playground.add(agent, (position, 0))
+
+    playground.step()
+    playground.step()
+
+    for comm in comms:
+        expected = [
+            other
+            for other in comms
+            if other is not comm and comm.in_transmission_range(other)
+        ]
+        assert comm.comms_in_range == expected
+
+    # Broadcast reaches the same communicators
+    messages = {comms[2].agent: {comms[2]: (None, "test")}}
+    _, msg, _, _ = playground.step(messages=messages)
+
+    receivers = [comm for agent_msgs in msg.values() for comm in agent_msgs]
+    assert receivers
+    assert receivers == comms[2].comms_in_range
+
+
+def test_batch_delivery_matches_receive():
+
+    playground = Playground(seed=0)
+    rng = np.random.default_rng(1)
+
+    comms = []
+    for index in range(20):
+        agent = MockAgent()
+        if index % 2:
+            comm = LimitedCommunicator(capacity=index % 4, transmission_range=150)
+        else:
+            comm = Communicator(transmission_range=[None, 100][index % 4 // 2])
+        agent.base.add(comm)
+        comms.append(comm)
+
+        # Some communicators share positions, so that distances are equal
+        position = tuple(rng.integers(-100, 100, size=2) // 40 * 40)
+        playground.add(agent, (position, 0))
+
+    playground.step()
+    comms[4].disable()
+    comms[7].disable()
+
+    senders = list(rng.choice(comms, size=200))
+    receivers = list(rng.choice(comms, size=200))
+    msgs = [f"msg_{index}" for index in range(200)]
+
+    expected = []
+    for sender, receiver, msg in zip(senders, receivers, msgs):
+        expected.append(receiver.receive(sender, msg))
+    expected_received = [comm.received_messages for comm in comms]
+
+    for comm in comms:
+        comm._received_messages = []
+
+    assert deliver_messages(senders, msgs, receivers) == expected
+    assert [comm.received_messages for comm in comms] == expected_received
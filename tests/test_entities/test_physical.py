@@ -1,9 +1,16 @@
 # pylint: disable=protected-access
 import math
 
+import numpy as np
+import pymunk
 import pytest
 
 from spg.playground import Playground
+from spg.utils.sprite import (
+    get_shape_vertices,
+    get_texture_from_shape,
+    get_uid_texture,
+)
 from tests.mock_entities import (
     MockPhysicalFromShape,
     MockPhysicalMovable,
@@ -193,3 +200,92 @@ def test_overlapping():
 
     with pytest.raises(ValueError):
         playground.add(MockPhysicalMovable(), coord_center, allow_overlapping=False)
+
+
+def test_overlaps_many():
+
+    playground = Playground()
+    playground.add(MockPhysicalUnmovable(radius=20), coord_center)
+
+    n_shapes = len(playground.space.shapes)
+    ent = MockPhysicalMovable(radius=10)
+
+    coordinates = [((0, 0), 0), ((5, 10), 2), ((100, 0), 0), ((0, -100), 1)]
+    overlapping = playground.overlaps_many(ent, coordinates)
+
+    assert overlapping.tolist() == [True, True, False, False]
+    assert playground.first_free_coordinate(ent, coordinates) == coordinates[2]
+
+    grid = [((x, y), 0.5) for x in range(-40, 41, 8) for y in range(-40, 41, 8)]
+    assert playground.overlaps_many(ent, grid).tolist() == [
+        playground.overlaps(ent, coord) for coord in grid
+    ]
+
+    # Nothing is added to the space, even temporarily
+    assert len(playground.space.shapes) == n_shapes
+    assert ent.pm_body.space is None
+
+
+def test_color_with_id():
+
+    playground = Playground()
+
+    ent_1 = MockPhysicalMovable()
+    playground.add(ent_1, coord_center)
+
+    texture = ent_1.texture
+    texture_uid = ent_1.color_with_id(texture)
+
+    pixels = np.asarray(texture.image.convert("RGBA"))
+    pixels_uid = np.asarray(texture_uid.image)
+
+    colored = (pixels[..., 3] != 0) & (pixels[..., :3].sum(axis=-1) != 0)
+
+    assert np.all(pixels_uid[colored] == ent_1.color_uid)
+    assert np.all(pixels_uid[~colored] == 0)
+
+    # Textures are cached per texture and uid
+    assert ent_1.color_with_id(texture) is texture_uid
+
+    ent_2 = MockPhysicalMovable()
+    playground.add(ent_2, coord_shift)
+    assert ent_2.color_with_id(texture) is not texture_uid
+
+
+def test_textures_and_shapes_are_shared():
+
+    playground = Playground()
+
+    ent_1 = MockPhysicalFromShape(geometry="square", size=20, color=(0, 100, 0))
+    ent_2 = MockPhysicalFromShape(geometry="square", size=20, color=(0, 100, 0))
+
+    playground.add(ent_1, coord_center)
+    playground.add(ent_2, coord_shift)
+
+    assert ent_1.texture is ent_2.texture
+
+    ent_3 = NonConvexPlus(radius=20, width=6)
+    ent_4 = NonConvexPlus(radius=20, width=6)
+
+    # Convex decomposition is computed once for all entities with the same texture
+    vertices_3 = [shape.get_vertices() for shape in ent_3.pm_shapes]
+    vertices_4 = [shape.get_vertices() for shape in ent_4.pm_shapes]
+    assert vertices_3 == vertices_4
+    assert len(vertices_3) > 1
+    assert ent_3.pm_shapes[0] is not ent_4.pm_shapes[0]
+
+
+def test_textures_with_same_name():
+
+    small = get_texture_from_shape(pymunk.Circle(None, 5), (0, 100, 0), "same")
+    large = get_texture_from_shape(pymunk.Circle(None, 10), (0, 100, 0), "same")
+    assert small.name == large.name
+
+    # Cached uid textures and vertices depend on pixels, not only on names
+    uid_small = get_uid_texture(small, 1, (1, 0, 0, 255))
+    uid_large = get_uid_texture(large, 1, (1, 0, 0, 255))
+    assert uid_small.image.size != uid_large.image.size
+
+    vertices_small = get_shape_vertices(small, 1, None, lambda: [[(0, 5)]])
+    vertices_large = get_shape_vertices(large, 1, None, lambda: [[(0, 10)]])
+    assert vertices_small != vertices_large
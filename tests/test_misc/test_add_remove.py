@@ -1,6 +1,10 @@
 # pylint: disable=protected-access
 
+import pytest
+
+from spg.agent import HeadAgent
 from spg.playground import Playground
+from spg.utils.position import UniformCoordinateSampler
 from tests.mock_entities import (
     MockPhysicalInteractive,
     MockPhysicalMovable,
@@ -120,3 +124,109 @@ def test_playground_interface_anchored_interactive_element():
 
     assert not playground.space.shapes
     assert not playground.space.bodies
+
+
+def test_uids_are_reproducible_and_recycled():
+
+    uids = []
+    for _ in range(2):
+        playground = Playground(seed=5)
+        entities = [MockPhysicalMovable() for _ in range(10)]
+        for ent in entities:
+            playground.add(ent, coord_center)
+        uids.append([ent.uid for ent in entities])
+
+    assert uids[0] == uids[1]
+    assert len(set(uids[0])) == 10
+    assert 0 not in uids[0]
+
+    playground.remove(entities[3], definitive=True)
+
+    ent = MockPhysicalMovable()
+    playground.add(ent, coord_center)
+    assert ent.uid == uids[1][3]
+    assert playground.get_entity_from_uid(ent.uid) is ent
+
+
+def test_names_are_unique():
+
+    playground = Playground()
+
+    ent_1 = MockPhysicalMovable(name="ball")
+    playground.add(ent_1, coord_center)
+    assert playground.get_entity_from_name("ball") is ent_1
+
+    with pytest.raises(ValueError):
+        playground.add(MockPhysicalMovable(name="ball"), coord_center)
+
+    playground.remove(ent_1, definitive=True)
+
+    ent_2 = MockPhysicalMovable(name="ball")
+    playground.add(ent_2, coord_center)
+    assert playground.get_entity_from_name("ball") is ent_2
+
+
+def test_active_entities_are_cached():
+
+    playground = Playground()
+
+    ent_1 = MockPhysicalMovable()
+    ent_2 = MockPhysicalMovable()
+    playground.add(ent_1, coord_center)
+    playground.add(ent_2, coord_center)
+
+    elements = playground.elements
+    assert elements == [ent_1, ent_2]
+
+    playground.step()
+    assert playground.elements is elements
+
+    with pytest.raises(TypeError):
+        elements[0] = ent_2  # type: ignore
+
+    playground.remove(ent_1)
+    assert playground.elements == [ent_2]
+    assert elements == [ent_1, ent_2]
+
+    playground.reset()
+    assert playground.elements == [ent_1, ent_2]
+
+
+def test_add_many():
+
+    playground = Playground(size=(300, 300), seed=0)
+    playground.add(MockPhysicalMovable(radius=40), coord_center)
+
+    agents = [HeadAgent() for _ in range(10)]
+    elements = [MockPhysicalMovable(radius=10) for _ in range(20)]
+
+    sampler = UniformCoordinateSampler(
+        playground, center=playground.center, size=playground.size
+    )
+    playground.add_many(agents + elements, sampler, allow_overlapping=False)
+
+    assert set(playground.agents) == set(agents)
+    assert all(elem in playground.elements for elem in elements)
+
+    parts = [part for agent in agents for part in agent.parts] + elements
+    for part in parts:
+        assert not playground.overlaps(part, part.coordinates)
+
+    # Entities are placed again with the sampler when reset
+    coordinates = [elem.coordinates for elem in elements]
+    playground.reset()
+    assert [elem.coordinates for elem in elements] != coordinates
+
+    for part in parts:
+        assert not playground.overlaps(part, part.coordinates)
+
+
+def test_add_many_fails_when_full():
+
+    playground = Playground()
+
+    sampler = UniformCoordinateSampler(playground, center=(0, 0), radius=5)
+    elements = [MockPhysicalMovable(radius=10) for _ in range(2)]
+
+    with pytest.raises(ValueError):
+        playground.add_many(elements, sampler, allow_overlapping=False)
@@ -0,0 +1,76 @@
+# pylint: disable=protected-access
+
+import numpy as np
+
+from spg.agent import HeadAgent
+from spg.element import Ball
+from spg.playground import Room
+
+
+def make_playground():
+    playground = Room(size=(300, 200), seed=0)
+    playground.add(Ball(), ((50, 0), 0))
+    playground.add(HeadAgent(), ((0, 0), 0))
+    return playground
+
+
+def test_clone_is_independent():
+
+    playground = make_playground()
+    playground.step(commands={playground.agents[0]: {"forward": 1}})
+
+    clone = playground.clone()
+
+    ball, clone_ball = playground.elements[-1], clone.elements[-1]
+    agent, clone_agent = playground.agents[0], clone.agents[0]
+
+    assert clone_ball is not ball
+    assert clone_ball.base_sprite is ball.base_sprite
+    assert clone_ball.position == ball.position
+    assert clone_agent.base.velocity == agent.base.velocity
+    assert clone.timestep == playground.timestep
+    assert clone.get_entity_from_name(agent.name) is clone_agent
+
+    # Same commands lead to the same state
+    for _ in range(5):
+        playground.step(commands={agent: {"forward": 1}})
+        clone.step(commands={clone_agent: {"forward": 1}})
+
+    assert np.allclose(agent.position, clone_agent.position)
+    assert np.allclose(agent.distance.sensor_values, clone_agent.distance.sensor_values)
+
+    # Stepping the clone does not move the playground
+    position = tuple(agent.position)
+    clone.step(commands={clone_agent: {"forward": 1}})
+    assert tuple(agent.position) == position
+    assert tuple(clone_agent.position) != position
+
+
+def test_fork_random_streams():
+
+    playground = make_playground()
+    forks = playground.fork(3)
+
+    values = [fork.rng.random() for fork in forks] + [playground.rng.random()]
+    assert len(set(values)) == 4
+
+    for fork in forks:
+        assert len(fork.space.bodies) == len(playground.space.bodies)
+        assert len(fork.space.shapes) == len(playground.space.shapes)
+
+
+def test_clone_grasps():
+
+    playground = Room(size=(300, 200), seed=0)
+    ball = Ball()
+    ball.graspable = True
+    playground.add(ball, ((30, 0), 0))
+    playground.add(HeadAgent(), ((0, 0), 0))
+
+    clone = playground.clone()
+    clone_ball, clone_agent = clone.elements[-1], clone.agents[0]
+
+    clone.step(commands={clone_agent: {"grasper": 1}})
+
+    assert clone_agent.base.grasper._grasped_entities == [clone_ball]
+    assert not playground.agents[0].base.grasper._grasped_entities
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+try:
+    import gymnasium  # noqa: F401
+except ImportError:
+    pytest.importorskip("gym")
+
+# pylint: disable=wrong-import-position
+from spg.agent import HeadAgent  # noqa: E402
+from spg.element import Ball  # noqa: E402
+from spg.playground import Room  # noqa: E402
+from spg.wrappers import PlaygroundEnv, VecPlaygroundEnv  # noqa: E402
+
+
+def make_playground(seed):
+    playground = Room(size=(300, 200), seed=seed)
+    playground.add(Ball(), ((50, 0), 0))
+    playground.add(HeadAgent(), ((0, 0), 0))
+    return playground
+
+
+def _reset(env):
+    result = env.reset()
+    return result[0] if isinstance(result, tuple) else result
+
+
+def test_env_spaces_from_devices():
+
+    playground = make_playground(0)
+    agent = playground.agents[0]
+    env = PlaygroundEnv(playground, agent)
+
+    assert set(env.observation_space.spaces) == {"DistanceSensor_0", "RGBSensor_1"}
+
+    distance_space = env.observation_space["DistanceSensor_0"]
+    assert distance_space.shape == agent.distance.shape
+    assert distance_space.low.min() == 0
+    assert distance_space.high.max() == 1
+
+    # Forward, angular and head controllers are continuous, grasper is discrete
+    command_space = playground.command_space
+    continuous = command_space.continuous[0]
+    continuous_space = env.action_space["continuous"]
+    assert np.allclose(continuous_space.low, command_space.low[0, continuous])
+    assert np.allclose(continuous_space.high, command_space.high[0, continuous])
+    assert env.action_space["discrete"].nvec.tolist() == [2]
+
+    obs = _reset(env)
+    assert env.observation_space.contains(obs)
+
+    for _ in range(5):
+        obs, reward, *_ = env.step(env.action_space.sample())
+        assert env.observation_space.contains(obs)
+        assert isinstance(reward, float)
+
+    assert np.allclose(obs["DistanceSensor_0"][:, 0], agent.distance.sensor_values)
+
+    env.close()
+    assert playground.observation_buffer is None
+
+
+def test_vec_env_matches_env():
+
+    continuous = np.zeros((2, 3), dtype=np.float32)
+    continuous[:, 0] = [0.5, 1]
+    discrete = np.ones((2, 1), dtype=np.int64)
+    actions = {"continuous": continuous, "discrete": discrete}
+
+    with VecPlaygroundEnv(make_playground, 2, n_workers=1, seed=0) as vec_env:
+
+        assert vec_env.single_observation_space["RGBSensor_1"].shape == (64, 3)
+        assert vec_env.observation_space["RGBSensor_1"].shape == (2, 64, 3)
+
+        _reset(vec_env)
+        for _ in range(5):
+            obs, rewards, *_ = vec_env.step(actions)
+
+        assert rewards.shape == (2,)
+
+        for index, seed in enumerate(vec_env.vec_playground.seeds):
+
+            env = PlaygroundEnv(make_playground(seed))
+            _reset(env)
+            for _ in range(5):
+                env_obs, *_ = env.step(
+                    {"continuous": continuous[index], "discrete": discrete[index]}
+                )
+
+            assert np.allclose(
+                obs["DistanceSensor_0"][index], env_obs["DistanceSensor_0"]
+            )
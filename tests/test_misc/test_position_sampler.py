@@ -127,3 +127,21 @@ def test_gaussian_width_height(width, height, center, sigma):
             count_out += 1
 
     assert count_in > count_out
+
+
+def test_sampling_is_lazy():
+    pg = Playground()
+
+    sampler = UniformCoordinateSampler(pg, center=(0, 0), width=10000, height=10000)
+    (x, y), _ = next(sampler.sample())
+
+    assert abs(x) <= 5000 and abs(y) <= 5000
+    assert len(list(sampler.sample(n_samples=10))) == 10
+
+    sampler = GaussianCoordinateSampler(pg, 10, center=(0, 0), width=100)
+    next(sampler.sample())
+    cdf = sampler._cdf  # pylint: disable=protected-access
+
+    # The cumulative distribution of the pdf is computed once per sampler
+    next(sampler.sample())
+    assert sampler._cdf is cdf  # pylint: disable=protected-access
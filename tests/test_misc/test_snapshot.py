@@ -0,0 +1,187 @@
+# pylint: disable=protected-access
+
+import numpy as np
+
+from spg.agent.interactor import GraspHold
+from spg.playground import Playground
+from spg.utils.position import UniformCoordinateSampler
+from tests.mock_agents import MockAgentWithArm
+from tests.mock_entities import MockPhysicalMovable
+
+coord_center = (0, 0), 0
+
+
+def _positions(playground):
+    return np.array(
+        [tuple(elem.position) for elem in playground.elements]
+        + [tuple(part.position) for agent in playground.agents for part in agent.parts]
+    )
+
+
+def test_restore_replays_steps():
+
+    playground = Playground(seed=0)
+    agent = MockAgentWithArm()
+    playground.add(agent, coord_center)
+    playground.add(MockPhysicalMovable(), ((200, 0), 0))
+
+    commands = {agent: {"forward": 1, "angular": 0.2}}
+
+    for _ in range(5):
+        playground.step(commands=commands)
+
+    snapshot = playground.snapshot()
+    random_value = playground.rng.random()
+
+    for _ in range(5):
+        playground.step(commands=commands)
+    positions = _positions(playground)
+
+    playground.restore(snapshot)
+
+    assert playground.timestep == 5
+    assert playground.rng.random() == random_value
+
+    playground.restore(snapshot)
+    for _ in range(5):
+        playground.step(commands=commands)
+
+    assert np.allclose(_positions(playground), positions)
+
+
+def test_restore_entities():
+
+    playground = Playground()
+    elem = MockPhysicalMovable()
+    playground.add(elem, ((50, 0), 0))
+
+    snapshot = playground.snapshot()
+
+    playground.remove(elem)
+    temporary = MockPhysicalMovable(temporary=True)
+    playground.add(temporary, ((-50, 0), 0))
+
+    playground.restore(snapshot)
+
+    assert playground.elements == [elem]
+    assert temporary not in playground._elements
+    assert elem.position == (50, 0)
+
+    playground.remove(elem, definitive=True)
+    playground.restore(snapshot)
+
+    assert playground.elements == [elem]
+    assert elem.pm_body in playground.space.bodies
+
+
+def test_restore_grasps():
+
+    playground = Playground()
+
+    agent = MockAgentWithArm()
+    grasper = GraspHold(agent.left_arm)
+    agent.left_arm.add(grasper)
+    playground.add(agent)
+
+    elem = MockPhysicalMovable()
+    elem.graspable = True
+    playground.add(elem, ((60, 60), 0))
+
+    n_joints = len(playground.space.constraints)
+
+    before_grasp = playground.snapshot()
+    playground.step(commands={agent: {"grasper": 1}})
+    after_grasp = playground.snapshot()
+
+    assert grasper.grasped_entities == [elem]
+
+    playground.restore(before_grasp)
+    assert not grasper.grasped_entities
+    assert not elem.grasped_by
+
+    playground.restore(after_grasp)
+    assert grasper.grasped_entities == [elem]
+    assert elem.grasped_by == [grasper]
+    assert len(playground.space.constraints) == n_joints + 4
+
+
+def test_reset_restores_baseline():
+
+    playground = Playground(size=(400, 400), seed=0)
+    agent = MockAgentWithArm()
+    playground.add(agent, coord_center)
+
+    elem = MockPhysicalMovable()
+    playground.add(elem, ((100, 0), 0))
+
+    sampled = MockPhysicalMovable()
+    sampler = UniformCoordinateSampler(playground, center=(0, 0), size=(400, 400))
+    playground.add(sampled, sampler, allow_overlapping=False)
+
+    playground.reset()
+    baseline = playground._baseline
+    positions = _positions(playground)
+    sampled_position = sampled.position
+
+    commands = {agent: {"forward": 1, "angular": 0.2}}
+    for _ in range(10):
+        playground.step(commands=commands)
+
+    playground.remove(elem)
+    temporary = MockPhysicalMovable(temporary=True)
+    playground.add(temporary, ((-100, 0), 0))
+
+    playground.reset()
+
+    assert playground._baseline is baseline
+    assert playground.timestep == 0
+    assert elem in playground.elements
+    assert temporary not in playground._elements
+
+    # Only entities placed with a sampler are placed again
+    assert sampled.position != sampled_position
+    assert not playground.overlaps(sampled, sampled.coordinates)
+
+    index = playground.elements.index(sampled)
+    assert np.allclose(
+        np.delete(_positions(playground), index, axis=0),
+        np.delete(positions, index, axis=0),
+    )
+
+    # Adding entities captures the baseline again
+    playground.add(MockPhysicalMovable(), ((-100, 100), 0))
+    assert playground._baseline is None
+
+    playground.reset()
+    assert playground._baseline is not None
+
+
+def test_restore_does_not_place_entities():
+
+    playground = Playground(size=(400, 400), seed=0)
+
+    elem = MockPhysicalMovable()
+    sampler = UniformCoordinateSampler(playground, center=(0, 0), size=(400, 400))
+    playground.add(elem, sampler, allow_overlapping=False)
+
+    snapshot = playground.snapshot()
+    uid, position = elem.uid, elem.position
+
+    playground.remove(elem, definitive=True)
+    playground.add(MockPhysicalMovable(), ((100, 100), 0))
+
+    rng_state = playground.rng.bit_generator.state
+    playground._restore_state(snapshot)
+
+    # Restored entities are not sampled again, and keep their uid
+    assert playground.rng.bit_generator.state == rng_state
+    assert elem.uid == uid
+    assert playground.get_entity_from_uid(uid) is elem
+    assert elem.position == position
+
+    playground.remove(elem)
+    playground._restore_state(snapshot)
+
+    assert playground.rng.bit_generator.state == rng_state
+    assert elem in playground.elements
+    assert elem.position == position
@@ -0,0 +1,78 @@
+# pylint: disable=protected-access
+
+import numpy as np
+import pytest
+
+from spg.agent import HeadAgent
+from spg.element import Ball
+from spg.playground import Room, VecPlayground
+
+
+class ShortRoom(Room):
+    def _has_terminated(self):
+        return self._timestep >= 2
+
+
+def make_playground(seed):
+    playground = Room(size=(300, 200), seed=seed)
+    playground.add(Ball(), ((50, 0), 0))
+    playground.add(HeadAgent(), ((0, 0), 0))
+    return playground
+
+
+def make_short_playground(seed):
+    playground = ShortRoom(size=(300, 200), seed=seed)
+    playground.add(HeadAgent(), ((0, 0), 0))
+    return playground
+
+
+def test_vec_playground_matches_playground():
+
+    commands = np.zeros((3, 1, 4))
+    commands[:, 0, 0] = [0.2, 0.5, 1]
+
+    with VecPlayground(make_playground, 3, n_workers=2, seed=0) as vec:
+
+        assert vec.n_agents == 1
+        assert vec.n_controls == 4
+
+        vec.reset()
+        for _ in range(5):
+            obs, rewards, dones = vec.step(commands)
+
+        assert obs["agent_0/DistanceSensor_0"].shape == (3, 36, 1)
+        assert obs["agent_0/RGBSensor_1"].shape == (3, 64, 3)
+        assert rewards.shape == (3, 1)
+        assert not dones.any()
+
+        for index, seed in enumerate(vec.seeds):
+
+            playground = make_playground(seed)
+            agent = playground.agents[0]
+
+            playground.reset()
+            for _ in range(5):
+                playground.step(commands=commands[index])
+
+            assert np.allclose(
+                obs["agent_0/DistanceSensor_0"][index, :, 0], agent.distance._values
+            )
+
+
+def test_vec_playground_auto_reset():
+
+    with VecPlayground(make_short_playground, 2, n_workers=1) as vec:
+        vec.reset()
+        dones = [vec.step()[2].copy() for _ in range(6)]
+
+    assert [bool(done[0]) for done in dones] == [False, False, True] * 2
+    assert all(done[0] == done[1] for done in dones)
+
+
+def test_vec_playground_worker_error():
+
+    commands = np.full((1, 1, 4), 10.0)
+
+    with VecPlayground(make_playground, 1) as vec:
+        with pytest.raises(RuntimeError):
+            vec.step(commands)
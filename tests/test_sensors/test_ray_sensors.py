@@ -0,0 +1,292 @@
+# pylint: disable=protected-access
+
+import numpy as np
+import pytest
+
+from spg.agent import HeadAgent
+from spg.agent.sensor import ObservationBuffer
+from spg.element import Ball
+from spg.playground import Room
+from tests.mock_entities import MockPhysicalFromShape
+
+
+def test_ray_sensor_detects_ball():
+
+    playground = Room(size=(300, 200))
+    playground.add(Ball(), ((50, 0), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    playground.step()
+
+    # Ray 17 of the distance sensor points almost in front of the agent
+    assert agent.distance._values[17] < 0.5
+    assert agent.distance._values[0] == 1
+
+
+def test_ray_buffers_are_persistent():
+
+    playground = Room(size=(300, 200))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    playground.step()
+
+    ray_compute = playground.ray_compute
+    position_buffer = ray_compute._position_buffer
+    output_buffer = ray_compute._output_rays_buffer
+    id_shader = ray_compute._id_shader
+
+    for _ in range(5):
+        playground.step()
+
+    assert ray_compute._position_buffer is position_buffer
+    assert ray_compute._output_rays_buffer is output_buffer
+    assert ray_compute._id_shader is id_shader
+
+
+def test_ray_buffers_grow_with_sensors():
+
+    playground = Room(size=(300, 200))
+
+    agent = HeadAgent()
+    playground.add(agent, ((-50, 0), 0))
+
+    ray_compute = playground.ray_compute
+    assert ray_compute._sensors_capacity == 2
+
+    agent_2 = HeadAgent()
+    playground.add(agent_2, ((50, 0), 0))
+    assert ray_compute._sensors_capacity == 4
+
+    buffer = ray_compute._output_rays_buffer
+
+    agent_3 = HeadAgent()
+    playground.add(agent_3, ((0, 50), 0))
+    assert ray_compute._sensors_capacity == 8
+    assert ray_compute._output_rays_buffer is not buffer
+
+    playground.step()
+
+    # Each capacity change compiled a new pair of shaders, and they are cached
+    assert len(ray_compute._shaders) == 4
+    assert agent_3.distance._values.shape == (36,)
+
+
+def test_ray_buffers_grow_with_invisible():
+
+    playground = Room(size=(300, 200))
+    playground.add(Ball(), ((50, 0), 0))
+
+    balls = [Ball() for _ in range(8)]
+    for ball in balls:
+        playground.add(ball, ((-130, -80), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    playground.step()
+    hitpoints = agent.distance._hitpoints.copy()
+
+    ray_compute = playground.ray_compute
+    param_buffer = ray_compute._param_buffer
+
+    # Invisible ids exceed the capacity, and buffers are reallocated,
+    # as when entities are grasped during a step
+    for ball in balls:
+        agent.distance.add_to_temporary_invisible(ball)
+    ray_compute.update_sensors()
+
+    assert ray_compute._param_buffer is not param_buffer
+    index = ray_compute._sensors.index(agent.distance)
+    assert ray_compute._param_data[index, 0] == agent.distance.max_range
+
+    # Invisible balls are out of range of the distance sensor
+    assert np.allclose(agent.distance._hitpoints, hitpoints)
+
+
+@pytest.mark.parametrize("ray_backend", ["cpu", "march"])
+def test_ray_cpu_matches_shader(ray_backend):
+
+    hitpoints = {}
+
+    for backend in ("shader", ray_backend):
+
+        playground = Room(size=(300, 200), seed=7, ray_backend=backend)
+        playground.add(Ball(), ((50, 0), 0))
+        playground.add(Ball(), ((-40, 60), 0))
+
+        agent = HeadAgent()
+        playground.add(agent, ((0, 0), 0.3))
+
+        agent_2 = HeadAgent()
+        playground.add(agent_2, ((-80, -30), 2))
+
+        playground.step()
+
+        hitpoints[backend] = [
+            sensor._hitpoints.copy()
+            for agent in playground.agents
+            for sensor in agent.external_sensors
+        ]
+
+    for shader_pts, cpu_pts in zip(hitpoints["shader"], hitpoints[ray_backend]):
+        assert np.array_equal(shader_pts[:, 8], cpu_pts[:, 8])
+        assert np.allclose(shader_pts[:, 9], cpu_pts[:, 9], atol=1e-3)
+        assert np.allclose(shader_pts[:, 10:], cpu_pts[:, 10:])
+
+
+def test_ray_march_matches_cpu():
+
+    hitpoints = {}
+
+    for backend in ("cpu", "march"):
+
+        playground = Room(size=(300, 200), seed=3, ray_backend=backend)
+        playground.add(Ball(), ((20, 10), 0))
+
+        for coordinates in [((0, 0), 0), ((-100, 50), 1), ((100, -60), 3)]:
+            playground.add(HeadAgent(), coordinates)
+
+        playground.step()
+
+        hitpoints[backend] = [
+            sensor._hitpoints.copy()
+            for agent in playground.agents
+            for sensor in agent.external_sensors
+        ]
+
+    for cpu_pts, march_pts in zip(hitpoints["cpu"], hitpoints["march"]):
+        assert np.array_equal(cpu_pts, march_pts)
+
+
+def test_ray_backend_unknown():
+
+    playground = Room(size=(300, 200), ray_backend="raytracing")
+
+    with pytest.raises(ValueError):
+        playground.add(HeadAgent())
+
+
+def test_ray_analytic_matches_shader():
+
+    hitpoints = {}
+
+    for backend in ("shader", "analytic"):
+
+        playground = Room(size=(300, 200), seed=7, ray_backend=backend)
+        playground.add(Ball(), ((50, 0), 0))
+        playground.add(Ball(), ((-40, 60), 0))
+
+        agent = HeadAgent()
+        playground.add(agent, ((0, 0), 0.3))
+
+        playground.step()
+
+        hitpoints[backend] = [
+            sensor._hitpoints.copy() for sensor in agent.external_sensors
+        ]
+
+    for shader_pts, analytic_pts in zip(hitpoints["shader"], hitpoints["analytic"]):
+        assert np.array_equal(shader_pts[:, 8], analytic_pts[:, 8])
+
+        # Distances are exact with the analytic backend, instead of sampled on pixels
+        assert np.allclose(shader_pts[:, 9], analytic_pts[:, 9], atol=1.5)
+
+
+def test_ray_analytic_colors_of_textures_with_same_name():
+
+    playground = Room(size=(300, 200), ray_backend="analytic")
+
+    # Both textures are named after the size of the shape
+    red = MockPhysicalFromShape("circle", 20, (255, 0, 0))
+    blue = MockPhysicalFromShape("circle", 20, (0, 0, 255))
+    playground.add(red, ((60, 0), 0))
+    playground.add(blue, ((0, 60), 0))
+
+    agent = HeadAgent()
+    playground.add(agent, ((0, 0), 0))
+
+    playground.step()
+
+    hitpoints = agent.rgb._hitpoints
+    on_red = hitpoints[:, 8] == red.uid
+    on_blue = hitpoints[:, 8] == blue.uid
+
+    assert on_red.any() and on_blue.any()
+    assert (hitpoints[on_red, 10] > hitpoints[on_red, 12]).all()
+    assert (hitpoints[on_blue, 12] > hitpoints[on_blue, 10]).all()
+
+
+def test_ray_analytic_follows_added_entities():
+
+    playground = Room(size=(300, 200), ray_backend="analytic")
+
+    agent = HeadAgent()
+    playground.add(agent)
+    playground.step()
+
+    assert agent.distance._values[17] == 1
+
+    ball = Ball()
+    playground.add(ball, ((50, 0), 0))
+    playground.step()
+
+    assert agent.distance._values[17] < 0.5
+
+    # Shapes are only excluded from queries while rays are cast
+    assert all(shape.filter.group == 0 for shape in playground.space.shapes)
+
+    playground.remove(ball)
+    playground.step()
+
+    assert agent.distance._values[17] == 1
+
+
+def test_ray_analytic_without_window():
+
+    playground = Room(size=(300, 200), ray_backend="analytic")
+    ball = Ball()
+    playground.add(ball, ((50, 0), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+    agent.distance.add_to_temporary_invisible(ball)
+
+    playground.step()
+
+    assert playground._window is None
+    assert agent.distance._values[17] == 1
+    assert agent.rgb._values[17].sum() > 0
+
+
+def test_shared_observation_buffer():
+
+    playground = Room(size=(300, 200))
+    playground.add(Ball(), ((50, 0), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    buffer = playground.attach_observation_buffer(shared=True)
+    obs, _, _, _ = playground.step()
+
+    observation = obs[agent][agent.distance]
+    assert observation.shape == agent.distance.shape
+    assert np.shares_memory(observation, buffer.views["agent_0/DistanceSensor_0"])
+    assert np.allclose(observation[:, 0], agent.distance.sensor_values)
+
+    # Another process would read observations from the name of the buffer
+    reader = ObservationBuffer(playground.observation_layout, name=buffer.name)
+    assert np.array_equal(reader.row(0)["agent_0/RGBSensor_1"], obs[agent][agent.rgb])
+
+    reader.close()
+
+    # Adding agents changes the layout, so the buffer is detached
+    playground.add(HeadAgent(), ((-50, 0), 0))
+    assert playground.observation_buffer is None
+    assert agent.distance.slot is None
+
+    buffer.close()
@@ -4,8 +4,9 @@ import numpy as np
 
 from spg.agent import HeadAgent
 from spg.element import Ball
+from spg.entity import EmbodiedEntity
 from spg.playground import Room
-from spg.view import TopDownView
+from spg.view import ColorUidView, TopDownView
 
 
 def test_move_object():
@@ -104,3 +105,119 @@ def test_delete_agent():
     img_after_reset = view.get_np_img()
 
     assert np.all(img_init == img_after_reset)
+
+
+def test_color_uid_view_matches_views():
+
+    playground = Room(size=(300, 200))
+    ball = Ball()
+    playground.add(ball, ((100, 20), 0))
+    playground.add(Ball(), ((-50, 40), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    view_kwargs = {"draw_transparent": False, "draw_interactive": False}
+    color_view = TopDownView(playground, draw_zone=False, **view_kwargs)
+    uid_view = TopDownView(playground, display_uid=True, draw_zone=False, **view_kwargs)
+    color_uid_view = ColorUidView(playground, draw_transparent=False)
+
+    def assert_same_images():
+        for view in (color_view, uid_view, color_uid_view):
+            view.update(force=True)
+
+        assert np.array_equal(color_view.get_np_img(), color_uid_view.get_np_img())
+        assert np.array_equal(uid_view.get_np_img(), color_uid_view.get_np_uid_img())
+
+    assert_same_images()
+
+    playground.step(commands={agent: {"forward": 1, "angular": 0.5}})
+    playground.remove(ball)
+    assert_same_images()
+
+    playground.reset()
+    assert_same_images()
+
+
+def test_only_moved_sprites_are_updated(monkeypatch):
+
+    playground = Room(size=(300, 200))
+    ball = Ball()
+    playground.add(ball, ((100, 20), 0))
+
+    view = TopDownView(playground)
+
+    updated = []
+    update_sprite = EmbodiedEntity.update_sprite
+
+    def update_sprite_spy(entity, view, sprite):
+        updated.append(entity)
+        update_sprite(entity, view, sprite)
+
+    monkeypatch.setattr(EmbodiedEntity, "update_sprite", update_sprite_spy)
+
+    playground.step()
+    view.update()
+    assert not updated
+
+    # Static entities moved outside of the simulation are updated
+    wall = next(elem for elem in playground.elements if elem is not ball)
+    wall.move_to(((0, 0), 0))
+    view.update()
+    assert updated == [wall]
+    assert view.sprites[wall].position == (150, 100)
+
+    # Dynamic entities are updated when their body moved
+    updated.clear()
+    ball.pm_body.velocity = (10, 0)
+    playground.step()
+    view.update()
+    assert updated == [ball]
+
+    updated.clear()
+    view.update(force=True)
+    assert len(updated) == len(view.sprites)
+
+
+def test_static_layer_is_cached(monkeypatch):
+
+    playground = Room(size=(300, 200))
+    ball = Ball()
+    playground.add(ball, ((100, 20), 0))
+
+    agent = HeadAgent()
+    playground.add(agent)
+
+    view = TopDownView(playground)
+    view.update()
+
+    static_updates = []
+    update_static_layer = TopDownView._update_static_layer
+
+    def update_static_layer_spy(updated_view):
+        if updated_view is view:
+            static_updates.append(updated_view)
+        update_static_layer(updated_view)
+
+    monkeypatch.setattr(TopDownView, "_update_static_layer", update_static_layer_spy)
+
+    for _ in range(5):
+        playground.step(commands={agent: {"forward": 1, "angular": 0.3}})
+        view.update()
+
+    assert not static_updates
+
+    # Moving, adding or removing a static entity invalidates the static layer
+    wall = next(elem for elem in playground.elements if elem is not ball)
+    wall.move_to(((0, 50), 0))
+    view.update()
+    assert len(static_updates) == 1
+
+    playground.remove(wall)
+    view.update()
+    assert len(static_updates) == 2
+
+    # A new view, drawn from scratch, is identical
+    new_view = TopDownView(playground)
+    new_view.update()
+    assert np.array_equal(view.get_np_img(), new_view.get_np_img())
@@ -291,3 +291,61 @@ def test_visual_view(zoom):
     )
 
     view.update()
+
+
+def test_async_readback():
+
+    playground = Playground(background=(10, 20, 30))
+    ent = MockPhysicalMovable()
+    playground.add(ent, ((0, 0), 0))
+
+    view = TopDownView(playground, size=(101, 57))
+    async_view = TopDownView(playground, size=(101, 57), async_readback=True)
+    rgba_view = TopDownView(playground, size=(101, 57), components=4)
+    red_view = TopDownView(playground, size=(101, 57), components=1)
+
+    images = []
+
+    for _ in range(3):
+        ent.move_to(((ent.position.x + 5, 0), 0))
+
+        for v in (view, async_view, rgba_view, red_view):
+            v.update()
+
+        img = view.get_np_img()
+        async_img = async_view.get_np_img()
+
+        assert np.any(img != (10, 20, 30))
+        assert np.array_equal(img, async_img)
+        assert np.array_equal(img, rgba_view.get_np_img()[..., :3])
+        assert np.array_equal(img[..., :1], red_view.get_np_img())
+
+        images.append(async_img)
+
+    # Preallocated images are reused every other update
+    assert images[0] is images[2]
+    assert images[0] is not images[1]
+
+
+def test_static_sprites_keep_drawing_order():
+
+    color_static = (123, 122, 54)
+    color_dynamic = (10, 200, 30)
+
+    playground = Playground()
+
+    # Visible sprites are drawn over zones and transparent sprites,
+    # whether they are static or not
+    wall = MockPhysicalFromShape(geometry="square", size=20, color=color_static)
+    playground.add(wall, ((0, 0), 0))
+
+    ball = MockPhysicalFromShape(
+        geometry="square", size=10, color=color_dynamic, mass=10, transparent=True
+    )
+    playground.add(ball, ((0, 0), 0))
+    playground.add(MockZoneInteractive(radius=10), ((0, 0), 0))
+
+    view = TopDownView(playground, center=center_view, size=(100, 100))
+    view.update()
+
+    assert np.all(view.get_np_img()[50, 50] == color_static)